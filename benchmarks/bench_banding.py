@@ -0,0 +1,76 @@
+"""Micro-benchmark banding skor: .apply per baris vs dtsen.banding.
+
+    python -m benchmarks.bench_banding
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.banding import band_change, band_scores
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def status_risk(score):
+    if score < 0.3:
+        return "Rendah"
+    elif score < 0.6:
+        return "Sedang"
+    else:
+        return "Tinggi"
+
+
+def status_perubahan(x):
+    if x < 0:
+        return "Membaik"
+    elif x > 0:
+        return "Memburuk"
+    else:
+        return "Tetap"
+
+
+def _best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES, seed=42):
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        df = pd.DataFrame({
+            "risk_score": rng.random(n),
+            "delta_risk": rng.normal(0, 0.05, n).round(2),
+            "bulan": rng.integers(1, 13, n),
+            "penerima_bansos": pd.Categorical(rng.choice(["Ya", "Tidak"], n)),
+        })
+        cases = {
+            "status_risk": (
+                lambda: df["risk_score"].apply(status_risk),
+                lambda: band_scores(df["risk_score"]),
+            ),
+            "status_perubahan": (
+                lambda: df["delta_risk"].apply(status_perubahan),
+                lambda: band_change(df["delta_risk"]),
+            ),
+            "bansos_per_bulan": (
+                lambda: df.groupby("bulan")["penerima_bansos"].apply(lambda x: (x == "Ya").sum()),
+                lambda: (df["penerima_bansos"] == "Ya").groupby(df["bulan"]).sum(),
+            ),
+        }
+        for name, (old, new) in cases.items():
+            t_old, t_new = _best_of(old), _best_of(new)
+            results.append({
+                "case": name, "rows": n,
+                "apply_s": t_old, "vectorized_s": t_new, "speedup": t_old / t_new,
+            })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    print(run().to_string(index=False, float_format=lambda v: f"{v:.4f}"))
@@ -0,0 +1,89 @@
+"""Benchmark grafik: pyplot per rerun (pola lama) vs PNG ter-cache.
+
+Mengukur waktu dan pertumbuhan memori (tracemalloc) selama N rerun untuk
+histogram + KDE, serta biaya KDE dari bin vs seaborn di baris mentah.
+Juga memeriksa KDE dari bin terhadap scipy.stats.gaussian_kde untuk
+sampel kecil (n < 100, kernel lebih panjang dari grid KDE).
+
+    python -m benchmarks.bench_charts [ukuran ...]
+"""
+import io
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+from benchmarks.bench_segmentation import upsample  # noqa: E402
+from dtsen.charts import KDE_GRID, binned_hist, clear_cache, hist_png  # noqa: E402
+from dtsen.loader import load_dataset  # noqa: E402
+
+SIZES = [100_000, 1_000_000]
+RERUNS = 20
+SMALL_SIZES = [2, 3, 10, 50, 99]
+
+
+def _old(values):
+    # Pola lama di app.py: figure pyplot baru setiap rerun, tidak pernah ditutup
+    fig, ax = plt.subplots()
+    sns.histplot(values, kde=True, bins=20, ax=ax)
+    fig.savefig(io.BytesIO(), format="png")
+
+
+def _measure(fn, reruns):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current / 1e6
+
+
+def run(sizes=SIZES, reruns=RERUNS):
+    base = load_dataset("dtsen_with_scores.csv")
+    results = []
+    for n in sizes:
+        values = upsample(base, n)["pendapatan_per_bulan"]
+        t_old, mem_old = _measure(lambda: _old(values), reruns)
+        plt.close("all")
+        clear_cache()
+        t_new, mem_new = _measure(lambda: hist_png(values, ("bench", n)), reruns)
+        results.append({
+            "rows": n,
+            "reruns": reruns,
+            "pyplot_seaborn_s": t_old,
+            "pyplot_mem_mb": mem_old,
+            "cached_png_s": t_new,
+            "cached_mem_mb": mem_new,
+        })
+    return pd.DataFrame(results)
+
+
+def kde_check(sizes=SMALL_SIZES, seed=0):
+    """Galat relatif maksimum KDE dari bin vs gaussian_kde untuk sampel kecil."""
+    from scipy.stats import gaussian_kde
+
+    rows = []
+    for n in sizes:
+        values = np.random.default_rng(seed + n).random(n)
+        h = binned_hist(values)
+        if len(h["kde_y"]) != KDE_GRID:
+            raise AssertionError(f"n={n}: panjang KDE {len(h['kde_y'])} != grid {KDE_GRID}")
+        ref = gaussian_kde(values)(h["kde_x"]) * n * (h["edges"][1] - h["edges"][0])
+        rows.append({"n": n, "max_rel_error": float(np.abs(h["kde_y"] - ref).max() / ref.max())})
+        hist_png(values, ("kde_check", n))  # panjang x/y harus cocok saat digambar
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print(kde_check().to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print(run(sizes).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
@@ -0,0 +1,63 @@
+"""Perbandingan akurasi & latensi: backend forecast "fast" vs Prophet.
+
+Acuan Prophet adalah forecast_penduduk_prophet_5y.csv yang sudah ada di
+repo. Jika paket prophet terpasang, waktu fit Prophet juga diukur ulang.
+
+    python -m benchmarks.bench_forecast
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.forecasting import FORECAST_KEL_FILE, TS_FILE, forecast_all, forecast_fast
+from dtsen.loader import DATA_DIR
+
+
+def _mape(a, b):
+    return float(np.mean(np.abs(a - b) / np.abs(b)) * 100)
+
+
+def run(repeat=5):
+    ts = pd.read_csv(os.path.join(DATA_DIR, TS_FILE))
+    ref = pd.read_csv(os.path.join(DATA_DIR, FORECAST_KEL_FILE), parse_dates=["ds"])
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fast = forecast_fast(ts, horizon_months=60)
+        best = min(best, time.perf_counter() - start)
+
+    cmp = ref.merge(fast, on=["ds", "kelurahan"], suffixes=("_prophet", "_fast"))
+    hist = ts.assign(ds=pd.to_datetime(ts["date"]))[["ds", "kelurahan", "population"]]
+    cmp = cmp.merge(hist, on=["ds", "kelurahan"], how="left")
+    in_sample = cmp["population"].notna()
+    future = ~in_sample
+
+    result = {
+        "kelurahan": int(cmp["kelurahan"].nunique()),
+        "rows": len(cmp),
+        "fast_fit_s": best,
+        "mape_fast_vs_actual_%": _mape(cmp.loc[in_sample, "yhat_fast"], cmp.loc[in_sample, "population"]),
+        "mape_prophet_vs_actual_%": _mape(cmp.loc[in_sample, "yhat_prophet"], cmp.loc[in_sample, "population"]),
+        "mape_fast_vs_prophet_horizon_%": _mape(cmp.loc[future, "yhat_fast"], cmp.loc[future, "yhat_prophet"]),
+        "coverage_fast_%": float(
+            cmp.loc[in_sample, "population"].between(
+                cmp.loc[in_sample, "yhat_lower_fast"], cmp.loc[in_sample, "yhat_upper_fast"]
+            ).mean() * 100
+        ),
+    }
+    try:
+        import prophet  # noqa: F401
+    except ImportError:
+        result["prophet_fit_s"] = None
+    else:
+        _, report = forecast_all(ts, 60, workers=1, cache_dir=None, backend="prophet")
+        result["prophet_fit_s"] = report["fit_seconds"]
+    return result
+
+
+if __name__ == "__main__":
+    for k, v in run().items():
+        print(f"{k:32s} {v:.4f}" if isinstance(v, float) else f"{k:32s} {v}")
@@ -0,0 +1,94 @@
+"""Benchmark monitoring dampak: merge dua snapshot penuh (pola lama) vs
+delta store dtsen.impact.
+
+Snapshot tahunan sintetis: setiap tahun ~20% rumah tangga berubah skor,
+sebagian kecil keluar dari register. Diukur ukuran memori (semua snapshot
+penuh vs delta) dan latensi query ringkasan per kelurahan + top movers
+untuk pasangan tahun pertama → terakhir (query pertama dan ulangan yang
+memakai memo pasangan tahun).
+
+    python -m benchmarks.bench_impact [ukuran ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.banding import band_change
+from dtsen.impact import DeltaStore
+
+SIZES = [100_000, 1_000_000]
+YEARS = list(range(2025, 2030))
+CHANGE_RATE = 0.2
+
+
+def make_snapshots(n, years=YEARS, seed=0):
+    rng = np.random.default_rng(seed)
+    kel = pd.Categorical.from_codes(rng.integers(0, 16, n), [f"Kel {k:02d}" for k in range(16)])
+    cur = pd.DataFrame({"nik_kepala_keluarga": np.arange(n, dtype=np.int64) + 3_201_000_000_000_000,
+                        "kelurahan": kel, "risk_score": rng.random(n), "stunting_risk_score": rng.random(n)})
+    snaps = {years[0]: cur}
+    for year in years[1:]:
+        cur = cur.copy()
+        for c in ("risk_score", "stunting_risk_score"):
+            ch = rng.random(len(cur)) < CHANGE_RATE
+            cur.loc[ch, c] = np.clip(cur.loc[ch, c] + rng.normal(-0.03, 0.05, ch.sum()), 0, 1)
+        cur = cur[rng.random(len(cur)) > 0.005]
+        snaps[year] = cur
+    return snaps
+
+
+def _merge_query(snaps, y0, y1):
+    # Pola lama: gabungkan dua register penuh per NIK lalu groupby
+    m = snaps[y0].merge(snaps[y1][["nik_kepala_keluarga", "risk_score"]],
+                        on="nik_kepala_keluarga", suffixes=("", "_after"))
+    m["delta_risk"] = m["risk_score_after"] - m["risk_score"]
+    m["status"] = band_change(m["delta_risk"])
+    per_kel = m.groupby("kelurahan", observed=True)["status"].value_counts().unstack()
+    return per_kel, m.nsmallest(20, "delta_risk")
+
+
+def _store_query(store, y0, y1):
+    return (store.kelurahan_summary("risk_score", y0, y1),
+            store.top_movers("risk_score", y0, y1, 20))
+
+
+def _best(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=SIZES):
+    rows = []
+    for n in sizes:
+        snaps = make_snapshots(n)
+        start = time.perf_counter()
+        store = DeltaStore()
+        for year, frame in snaps.items():
+            store.append(year, frame)
+        build_s = time.perf_counter() - start
+        y0, y1 = YEARS[0], YEARS[-1]
+        start = time.perf_counter()
+        _store_query(store, y0, y1)  # pertama: tanpa memo pasangan tahun
+        cold_s = time.perf_counter() - start
+        rows.append({
+            "rows": n,
+            "tahun": len(YEARS),
+            "snapshot_penuh_mb": sum(f.memory_usage(deep=True).sum() for f in snaps.values()) / 2**20,
+            "delta_store_mb": sum(store.memory_usage().values()) / 2**20,
+            "build_s": build_s,
+            "merge_query_s": _best(lambda: _merge_query(snaps, y0, y1)),
+            "delta_query_s": cold_s,
+            "delta_query_memo_s": _best(lambda: _store_query(store, y0, y1)),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    print(run(sizes).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
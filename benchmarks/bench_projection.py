@@ -0,0 +1,83 @@
+"""Benchmark proyeksi layanan publik: loop pandas per skenario × kelurahan
+(pola lama halaman Layanan) vs engine broadcast dtsen.projection.
+
+Kelurahan sintetis dibuat dengan dtsen.synthetic + forecast_fast, jadi
+ukuran grid bisa diperbesar jauh di atas 16 kelurahan Padang Panjang.
+
+    python -m benchmarks.bench_projection [jumlah_kelurahan ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen import synthetic
+from dtsen.forecasting import forecast_fast
+from dtsen.projection import BANDS, ProjectionEngine, scenario_grid
+
+SIZES = [16, 160, 1600]
+GRID = {
+    "band": list(BANDS.values()),
+    "penduduk_per_puskesmas": [100, 200, 500, 1000, 10000],
+    "anak_per_sekolah": [50, 100, 250, 500, 1000],
+    "skala_proporsi_anak": [0.9, 1.0, 1.1],
+}
+LOOP_SCENARIOS = 5  # loop lama diukur pada beberapa skenario lalu diekstrapolasi
+
+
+def _loop(fcst, share, grid, existing):
+    # Pola lama: kolom kebutuhan dihitung ulang per skenario, lalu per kelurahan
+    rows = []
+    col = {"Bawah": "yhat_lower", "Tengah": "yhat", "Atas": "yhat_upper"}
+    for sc in grid.itertuples():
+        band = col[{-1.0: "Bawah", 0.0: "Tengah", 1.0: "Atas"}[sc.band]]
+        for kel, part in fcst.groupby("kelurahan", sort=False):
+            pop = part[band]
+            need = np.ceil(pop * share[kel] * sc.skala_proporsi_anak / sc.anak_per_sekolah)
+            rows.append((sc.Index, kel, float((need - existing[kel]).clip(lower=0).max())))
+    return pd.DataFrame(rows, columns=["skenario", "kelurahan", "kekurangan"]).sort_values(
+        "kekurangan", ascending=False)
+
+
+def run(sizes=SIZES, repeat=3):
+    profile = synthetic.fit_profile()
+    grid = scenario_grid(**GRID)
+    rows = []
+    for n_kel in sizes:
+        n_kota = -(-n_kel // len(profile["kelurahan"]))
+        kel = synthetic.region_categories(profile, n_kota)[0][:n_kel]
+        ts = synthetic.generate_timeseries(kel, profile=profile)
+        fcst = forecast_fast(ts, horizon_months=60)
+        start = pd.Timestamp(ts["date"].max()) + pd.offsets.MonthBegin(1)
+        rng = np.random.default_rng(0)
+        share = pd.Series(rng.uniform(0.3, 0.5, n_kel), index=[str(k) for k in kel])
+        engine = ProjectionEngine.from_forecast(fcst, share, start=start)
+
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            engine.run(grid).shortfall_table("sekolah", top=50)
+            best = min(best, time.perf_counter() - t0)
+
+        future = fcst[fcst["ds"] >= start]
+        existing = dict(zip(engine.kelurahan, engine.existing["sekolah"]))
+        t0 = time.perf_counter()
+        _loop(future, share, grid.head(LOOP_SCENARIOS), existing)
+        loop_s = (time.perf_counter() - t0) / LOOP_SCENARIOS * len(grid)
+
+        n_kel_actual, n_month = engine.shape
+        rows.append({
+            "kelurahan": n_kel_actual,
+            "skenario": len(grid),
+            "sel": len(grid) * n_kel_actual * n_month,
+            "loop_pandas_s (ekstrapolasi)": loop_s,
+            "broadcast_s": best,
+            "speedup": loop_s / best,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    print(run(sizes).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
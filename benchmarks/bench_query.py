@@ -0,0 +1,66 @@
+"""Benchmark lapisan query: satu halaman via TableIndex vs filter+sort pandas.
+
+    python -m benchmarks.bench_query [ukuran ...]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.bench_segmentation import upsample
+from dtsen.loader import load_dataset
+from dtsen.query import TableIndex
+
+SIZES = [100_000, 1_000_000]
+
+QUERIES = {
+    "sort_saja": ({}, {}, "risk_score"),
+    "kelurahan+sort": ({"kelurahan": "Ngalau"}, {}, "risk_score"),
+    "kelurahan+rentang+sort": (
+        {"kelurahan": ["Ngalau", "Pasar Baru"]},
+        {"pendapatan_per_bulan": (1_000_000, 1_200_000)},
+        "risk_score",
+    ),
+}
+
+
+def _pandas(df, where, between, sort, page, page_size):
+    mask = pd.Series(True, index=df.index)
+    for c, v in where.items():
+        mask &= df[c].isin([v] if isinstance(v, str) else v)
+    for c, (lo, hi) in between.items():
+        mask &= df[c].between(lo, hi)
+    out = df[mask].sort_values(sort, ascending=False, kind="stable")
+    return out.iloc[page * page_size:(page + 1) * page_size], int(mask.sum())
+
+
+def _time(func, repeat=5):
+    func()  # pemanasan (indeks lazy dibangun di sini)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(sizes=SIZES, page=3, page_size=20):
+    base = load_dataset("dtsen_with_scores.csv")
+    results = []
+    for n in sizes:
+        df = upsample(base, n)
+        index = TableIndex(len(df))
+        for name, (where, between, sort) in QUERIES.items():
+            t_index = _time(lambda: index.query(df, where, between, sort, False, page, page_size))
+            t_pandas = _time(lambda: _pandas(df, where, between, sort, page, page_size))
+            results.append({
+                "rows": n,
+                "query": name,
+                "pandas_ms": t_pandas * 1000,
+                "index_ms": t_index * 1000,
+                "speedup": t_pandas / t_index,
+            })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print(run(sizes).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
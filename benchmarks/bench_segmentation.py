@@ -0,0 +1,65 @@
+"""Benchmark segmentasi: KMeans penuh (seperti notebook) vs mini-batch.
+
+Data diperbesar dengan resampling register bawaan + noise kecil pada
+kolom numerik.
+
+    python -m benchmarks.bench_segmentation [ukuran ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+from dtsen.loader import load_dataset
+from dtsen.segmentation import SPECS, SegmentationModel
+
+SIZES = [100_000, 1_000_000]
+FULL_KMEANS_MAX = 1_000_000  # KMeans n_init=10 di atas ini terlalu lama
+
+
+def upsample(df, n, seed=42):
+    rng = np.random.default_rng(seed)
+    out = df.iloc[rng.integers(0, len(df), n)].reset_index(drop=True)
+    for c in ["pendapatan_per_bulan", "pengeluaran_per_bulan"]:
+        out[c] = (out[c] * rng.normal(1, 0.05, n)).round()
+    return out
+
+
+def run(sizes=SIZES):
+    base = load_dataset("dtsen_with_scores.csv")
+    spec = SPECS["segmen"]
+    results = []
+    for n in sizes:
+        df = upsample(base, n)
+        model = SegmentationModel(spec)
+
+        start = time.perf_counter()
+        model.fit(df, epochs=1)
+        t_fit = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model.assign_codes(df)
+        t_assign = time.perf_counter() - start
+
+        t_full = None
+        if n <= FULL_KMEANS_MAX:
+            Xs = model.scaler.transform(model.features(df))
+            start = time.perf_counter()
+            KMeans(n_clusters=3, random_state=42, n_init=10).fit(Xs)
+            t_full = time.perf_counter() - start
+
+        results.append({
+            "rows": n,
+            "kmeans_full_fit_s": t_full,
+            "minibatch_fit_s": t_fit,
+            "assign_s": t_assign,
+            "assign_rows_per_s": n / t_assign,
+        })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print(run(sizes).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
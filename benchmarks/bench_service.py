@@ -0,0 +1,77 @@
+"""Benchmark layanan scoring: latensi satu NIK dan micro-batch bersamaan.
+
+Dibandingkan dengan cara lama (baca CSV lalu predict_proba per permintaan).
+Model harus sudah dilatih (dtsen.models, dtsen.segmentation, dtsen.anomaly).
+
+    python -m benchmarks.bench_service [jumlah_permintaan] [concurrency]
+"""
+import asyncio
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import NIK_COL, load_dataset
+from dtsen.models import load_bundle, predict_scores
+from dtsen.service import ScoringService
+
+
+def _percentiles(seconds):
+    p50, p99 = np.percentile(np.asarray(seconds) * 1000, [50, 99])
+    return {"p50_ms": p50, "p99_ms": p99}
+
+
+def run(n_requests=1000, concurrency=32):
+    niks = load_dataset("dtsen_with_scores.csv")[NIK_COL].to_numpy()
+    niks = niks[np.random.default_rng(42).integers(0, len(niks), n_requests)]
+    results = []
+
+    # Cara lama: setiap permintaan membaca CSV & memanggil predict_proba
+    bundle = load_bundle("kemiskinan")
+    lat = []
+    for nik in niks[:50]:
+        start = time.perf_counter()
+        df = pd.read_csv("dtsen_clean_padangpanjang.csv")
+        predict_scores(df[df[NIK_COL] == nik], bundle)
+        lat.append(time.perf_counter() - start)
+    results.append({"mode": "csv_per_permintaan", "requests": len(lat), **_percentiles(lat)})
+
+    start = time.perf_counter()
+    service = ScoringService()
+    service.lookup(niks[0])
+    t_load = time.perf_counter() - start
+
+    lat = []
+    for nik in niks:
+        start = time.perf_counter()
+        service.score_nik(nik)
+        lat.append(time.perf_counter() - start)
+    results.append({"mode": "layanan_sinkron", "requests": len(lat), **_percentiles(lat)})
+
+    records = [service.lookup(nik) for nik in niks]
+
+    async def _client(chunk, out):
+        for record in chunk:
+            start = time.perf_counter()
+            await service.score(record)
+            out.append(time.perf_counter() - start)
+
+    async def _load():
+        out = []
+        await asyncio.gather(*(_client(records[i::concurrency], out) for i in range(concurrency)))
+        return out
+
+    start = time.perf_counter()
+    lat = asyncio.run(_load())
+    total = time.perf_counter() - start
+    results.append({
+        "mode": f"micro_batch_x{concurrency}", "requests": len(lat), **_percentiles(lat),
+        "rps": len(lat) / total, "mean_batch": service.stats.summary().get("mean_batch"),
+    })
+    return pd.DataFrame(results).assign(warm_load_s=t_load)
+
+
+if __name__ == "__main__":
+    args = [int(x) for x in sys.argv[1:]]
+    print(run(*args).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
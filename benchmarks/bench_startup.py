@@ -0,0 +1,105 @@
+"""Benchmark cold start dashboard: waktu impor per modul & time to first render.
+
+Setiap pengukuran dijalankan di proses Python baru supaya tidak ada modul
+yang sudah ter-cache:
+
+- impor: `python -X importtime -c "import <modul>"`, diambil waktu kumulatif
+  modul itu (termasuk semua dependensinya),
+- render: app.py dijalankan sekali lewat AppTest dengan halaman tertentu
+  sudah terpilih, diukur dari awal run sampai render selesai.
+
+    python -m benchmarks.bench_startup [--json hasil.json] [--baseline lama.json]
+
+Dengan --baseline, baris yang lebih lambat >25% (dan >50 ms) ditandai
+REGRESI dan proses keluar dengan kode 1.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from views import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["streamlit", "dtsen.startup", "views", "views.common",
+           *(f"views.{m}" for m in PAGES.values())]
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_S = 0.05
+
+_RENDER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.session_state["menu"] = sys.argv[2]
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+from dtsen.startup import startup_stats
+page = startup_stats()["pages"].get(sys.argv[3], {})
+print(json.dumps({"seconds": elapsed, "import_s": page.get("import_s"),
+                  "errors": [e.message for e in at.exception]}))
+"""
+
+
+def _run(args):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def import_time(module):
+    """Waktu impor kumulatif `module` (detik) di proses baru."""
+    err = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    for line in reversed(err.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"modul {module} tidak ada di keluaran importtime")
+
+
+def first_render(label):
+    out = json.loads(_run(["-c", _RENDER, os.path.join(ROOT, "app.py"), label, PAGES[label]]).stdout)
+    if out["errors"]:
+        raise RuntimeError(f"{label}: {out['errors']}")
+    return out
+
+
+def run():
+    results = [{"jenis": "impor", "nama": m, "detik": import_time(m)} for m in MODULES]
+    for label, name in PAGES.items():
+        out = first_render(label)
+        results.append({"jenis": "render_pertama", "nama": name, "detik": out["seconds"],
+                        "impor_halaman_s": out["import_s"]})
+    return pd.DataFrame(results)
+
+
+def compare(current, baseline):
+    base = baseline.set_index(["jenis", "nama"])["detik"].rename("baseline")
+    out = current.join(base, on=["jenis", "nama"])
+    slower = out["detik"] - out["baseline"]
+    out["regresi"] = (out["detik"] > out["baseline"] * REGRESSION_RATIO) & (slower > REGRESSION_MIN_S)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold start dashboard")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    parser.add_argument("--baseline", help="JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    results = run()
+    if args.json:
+        results.to_json(args.json, orient="records", indent=2)
+    if args.baseline:
+        results = compare(results, pd.read_json(args.baseline))
+    print(results.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    if args.baseline and results["regresi"].any():
+        print("⚠️ REGRESI:", ", ".join(results.loc[results["regresi"], "nama"]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
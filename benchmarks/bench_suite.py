@@ -0,0 +1,220 @@
+"""Benchmark suite end-to-end di atas register sintetis (dtsen.synthetic).
+
+Untuk setiap ukuran register, tahap yang diukur: generate, load (CSV &
+Parquet), banding, halaman peringkat (TableIndex), ringkasan group-by (cube), scoring LightGBM,
+clustering mini-batch, deteksi anomali (IsolationForest + blocking
+duplikat), dan forecast per kelurahan. Model dilatih sekali dari data repo
+ke --model-dir (default: direktori sementara) jika belum ada.
+
+Hasil ditulis sebagai JSON (metadata commit & lingkungan + satu record
+per tahap × ukuran) supaya bisa dibandingkan antar commit:
+
+    python -m benchmarks.bench_suite 100000 1000000 --json hasil.json
+    python -m benchmarks.bench_suite --baseline hasil_lama.json
+
+Dengan --baseline, tahap yang lebih lambat >25% (dan >50 ms) ditandai
+REGRESI dan proses keluar dengan kode 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from dtsen import anomaly, models, scoring, synthetic
+from dtsen.banding import band_change, band_scores
+from dtsen.cube import build_cube
+from dtsen.encoding import get_encoder
+from dtsen.forecasting import forecast_fast
+from dtsen.loader import read_csv_typed
+from dtsen.segmentation import SPECS, SegmentationModel
+from dtsen.query import TableIndex
+from dtsen.snapshot import read_snapshot
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [100_000, 1_000_000]
+CSV_MAX_ROWS = 1_000_000  # di atas ini CSV terlalu besar; hanya Parquet
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_S = 0.05
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import lightgbm
+    import sklearn
+
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "lightgbm": lightgbm.__version__,
+    }
+
+
+def ensure_models(model_dir):
+    """Latih encoder, model LightGBM & IsolationForest dari data repo jika belum ada."""
+    encoder = get_encoder(model_dir)
+    for name in models.FEATURES:
+        if not os.path.exists(models.bundle_path(name, model_dir)):
+            models.save_bundle(models.train_model(name, encoder=encoder), model_dir)
+    anomaly.get_anomaly_model(model_dir)
+    return encoder
+
+
+class Recorder:
+    def __init__(self):
+        self.records = []
+
+    def time(self, stage, rows, fn, **extra):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - start
+        self.records.append({
+            "stage": stage,
+            "rows": rows,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed else None,
+            "max_rss_mb": _max_rss_mb(),
+            **extra,
+        })
+        print(f"  {stage:22s} {elapsed:9.3f}s", file=sys.stderr)
+        return out
+
+
+def run_size(n, workdir, model_dir, encoder, rec, workers=1, seed=42):
+    profile = synthetic.fit_profile()
+    pq_path = os.path.join(workdir, f"register_{n}.parquet")
+    rec.time("generate_parquet", n, lambda: synthetic.write_register(pq_path, n, seed, profile=profile))
+    if n <= CSV_MAX_ROWS:
+        csv_path = os.path.join(workdir, f"register_{n}.csv")
+        rec.time("generate_csv", n, lambda: synthetic.write_register(csv_path, n, seed, profile=profile))
+        rec.time("load_csv", n, lambda: read_csv_typed(csv_path))
+        os.remove(csv_path)
+    df = rec.time("load_parquet", n, lambda: read_snapshot(pq_path))
+
+    delta = df["risk_score"].to_numpy() - np.roll(df["risk_score"].to_numpy(), 1)
+    rec.time("banding", n, lambda: (band_scores(df["risk_score"]),
+                                    band_scores(df["stunting_risk_score"]),
+                                    band_change(delta)))
+
+    kel = df["kelurahan"].cat.categories[0]
+    # Halaman peringkat seperti di dashboard: query pertama membangun urutan
+    # risk_score & posting list kelurahan, query berikutnya memakai indeks
+    index = TableIndex(len(df))
+    page = dict(where={"kelurahan": kel}, sort="risk_score", ascending=False)
+    rec.time("query_build", n, lambda: index.query(df, **page))
+    rec.time("query_page", n, lambda: [index.query(df, **page) for _ in range(100)],
+             queries=100)
+
+    cube = rec.time("groupby_cube", n, lambda: build_cube(df))
+    rec.time("groupby_summary", n, lambda: (cube.summary("kelurahan", ["risk_score"]),
+                                            cube.pivot("kelurahan", "status_kemiskinan")),
+             cells=len(cube))
+
+    out_path = os.path.join(workdir, f"skor_{n}.parquet")
+    rec.time("scoring", n, lambda: scoring.score_file(pq_path, out_path, workers=workers,
+                                                      model_dir=model_dir), workers=workers)
+
+    seg = SegmentationModel(SPECS["segmen"], encoder=encoder)
+    rec.time("clustering_fit", n, lambda: seg.fit(df, epochs=1))
+    rec.time("clustering_assign", n, lambda: seg.assign_codes(df))
+    del df
+
+    scored, report = rec.time("anomaly_score", n, lambda: anomaly.score_file(
+        pq_path, workers=workers, model_dir=model_dir), workers=workers)
+    pairs = rec.time("anomaly_blocking", n,
+                     lambda: anomaly.duplicate_candidates(scored, scored[anomaly.NIK_COL]))
+    rec.records[-1]["pairs"] = len(pairs)
+    del scored
+
+    kelurahan = synthetic.region_categories(profile, synthetic.n_kota_for(n))[0]
+    ts = synthetic.generate_timeseries(kelurahan, seed=seed, profile=profile)
+    rec.time("forecast_fast", len(ts), lambda: forecast_fast(ts, horizon_months=60),
+             kelurahan=len(kelurahan), register_rows=n)
+
+    for path in (pq_path, out_path):
+        os.remove(path)
+
+
+def run(sizes=SIZES, workers=1, model_dir=None, seed=42):
+    rec = Recorder()
+    with tempfile.TemporaryDirectory(prefix="dtsen_bench_") as workdir:
+        model_dir = model_dir or os.path.join(workdir, "models")
+        encoder = ensure_models(model_dir)
+        for n in sizes:
+            print(f"[{n:,} rumah tangga]", file=sys.stderr)
+            run_size(n, workdir, model_dir, encoder, rec, workers, seed)
+    return {"environment": environment(), "sizes": list(sizes), "workers": workers,
+            "seed": seed, "results": rec.records}
+
+
+def compare(results, baseline):
+    cur = pd.DataFrame(results["results"])
+    base = pd.DataFrame(baseline["results"]).set_index(["stage", "rows"])["seconds"].rename("baseline_s")
+    out = cur.join(base, on=["stage", "rows"])
+    out["ratio"] = out["seconds"] / out["baseline_s"]
+    out["regresi"] = (out["ratio"] > REGRESSION_RATIO) & (out["seconds"] - out["baseline_s"] > REGRESSION_MIN_S)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite DTSEN (register sintetis)")
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--model-dir", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    parser.add_argument("--baseline", help="JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.workers, args.model_dir, args.seed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+    table = pd.DataFrame(results["results"])
+    columns = ["stage", "rows", "seconds", "rows_per_sec", "max_rss_mb"]
+    if args.baseline:
+        with open(args.baseline) as f:
+            table = compare(results, json.load(f))
+        columns += ["baseline_s", "ratio", "regresi"]
+    print(table[columns].to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    if args.baseline and table["regresi"].any():
+        print("⚠️ REGRESI:", ", ".join(f"{s} ({r:,})" for s, r in
+                                       table.loc[table["regresi"], ["stage", "rows"]].itertuples(index=False)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
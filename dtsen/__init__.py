@@ -0,0 +1 @@
+"""Modul pendukung Dashboard DTSEN Padang Panjang."""
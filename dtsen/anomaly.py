@@ -0,0 +1,513 @@
+"""Model anomali bansos (IsolationForest) yang disimpan sebagai artefak.
+
+Mengikuti Deteksi_Anomali_Data_Penduduk_(Fraud_Bansos).ipynb: enam fitur
+(pendapatan, pengeluaran, kepemilikan aset, status penerima bansos),
+StandardScaler, lalu IsolationForest(contamination=0.05). Hasil fit
+disimpan dengan joblib agar bisa dipakai ulang untuk scoring.
+
+Untuk scoring, seluruh pohon IsolationForest diratakan ke array NumPy
+(`CompiledForest`) sehingga semua pohon ditelusuri sekaligus per level,
+tanpa overhead joblib per pohon seperti `score_samples` bawaan sklearn.
+
+Selain outlier, modul ini mencari kandidat duplikat (nama & alamat sama
+atau mirip dengan NIK berbeda) lewat blocking: baris hanya dibandingkan
+dengan baris lain yang berbagi kunci blok (nama/alamat ternormalisasi +
+kelurahan + RT/RW), bukan dengan seluruh register. Scoring dan normalisasi kunci
+berjalan per chunk di process pool; hasil akhirnya tabel peringkat
+kecurigaan per NIK.
+
+    python -m dtsen.anomaly                                  # latih & simpan ke models/
+    python -m dtsen.anomaly rank dtsen_with_anomalies.csv ranking.parquet
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dtsen.encoding import get_encoder
+from dtsen.loader import DATA_DIR, DEFAULT_CHUNKSIZE, NIK_COL, dataset_version, iter_chunks, load_dataset
+
+FEATURES = [
+    "pendapatan_per_bulan",
+    "pengeluaran_per_bulan",
+    "kepemilikan_lahan",
+    "kepemilikan_kendaraan",
+    "kepemilikan_tabungan",
+    "penerima_bansos",
+]
+
+
+def _average_path_length(n):
+    """Rata-rata panjang jalur pencarian gagal di BST dengan n sampel."""
+    n = np.asarray(n, dtype=float)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+
+class CompiledForest:
+    """IsolationForest terlatih dalam bentuk array datar (skor identik sklearn)."""
+
+    def __init__(self, forest):
+        n_features = forest.n_features_in_
+        subsample = forest._max_features != n_features
+        left, right, feature, threshold, depth_score, roots = [], [], [], [], [], []
+        offset = 0
+        for tree, feats in zip(forest.estimators_, forest.estimators_features_):
+            t = tree.tree_
+            leaf = t.children_left == -1
+            idx = np.arange(t.node_count)
+            # Daun menunjuk ke dirinya sendiri agar penelusuran bisa terus diulang
+            left.append(np.where(leaf, idx, t.children_left) + offset)
+            right.append(np.where(leaf, idx, t.children_right) + offset)
+            f = np.where(leaf, 0, t.feature)
+            feature.append(np.asarray(feats)[f] if subsample else f)
+            threshold.append(np.where(leaf, np.inf, t.threshold))
+            depth = np.zeros(t.node_count)
+            for node in range(t.node_count):  # anak selalu bernomor > induk
+                if not leaf[node]:
+                    depth[t.children_left[node]] = depth[t.children_right[node]] = depth[node] + 1
+            depth_score.append(depth + _average_path_length(t.n_node_samples))
+            roots.append(offset)
+            offset += t.node_count
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.feature = np.concatenate(feature)
+        self.threshold = np.concatenate(threshold)
+        self.depth_score = np.concatenate(depth_score)
+        self.roots = np.asarray(roots)
+        self.max_depth = max(e.tree_.max_depth for e in forest.estimators_)
+        self.norm = _average_path_length([forest._max_samples])[0]
+        self.offset = forest.offset_
+
+    def score_samples(self, X):
+        """Sama dengan IsolationForest.score_samples (makin kecil makin janggal)."""
+        X = np.asarray(X, dtype=np.float32)  # pohon sklearn membandingkan dalam float32
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        depth = self.depth_score[node].mean(axis=1)
+        return -(2.0 ** (-depth / self.norm))
+
+    def predict(self, X, scores=None):
+        """-1 untuk anomali, 1 untuk normal (seperti IsolationForest.predict)."""
+        scores = self.score_samples(X) if scores is None else scores
+        return np.where(scores - self.offset < 0, -1, 1)
+
+
+def anomaly_path(model_dir=None):
+    from dtsen.models import MODEL_DIR
+
+    return os.path.join(model_dir or MODEL_DIR, "anomali_iforest.joblib")
+
+
+def feature_matrix(df, encoder):
+    cols = []
+    for c in FEATURES:
+        if c in encoder.columns:
+            cols.append(encoder.transform_column(c, df[c]).astype(float))
+        else:
+            cols.append(df[c].to_numpy(dtype=float))
+    return np.column_stack(cols)
+
+
+def train_isolation_forest(df=None, encoder=None, contamination=0.05):
+    # sklearn hanya dibutuhkan saat training; halaman dashboard cukup joblib.load
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    df = load_dataset("dtsen_with_segments.csv") if df is None else df
+    encoder = encoder or get_encoder()
+    X = feature_matrix(df, encoder)
+    scaler = StandardScaler().fit(X)
+    model = IsolationForest(contamination=contamination, random_state=42)
+    model.fit(scaler.transform(X))
+    return {
+        "scaler": scaler,
+        "model": model,
+        "features": FEATURES,
+        "encoder_version": encoder.version,
+    }
+
+
+def save_anomaly_model(bundle, model_dir=None):
+    path = anomaly_path(model_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(bundle, path)
+    return path
+
+
+def load_anomaly_model(model_dir=None):
+    return joblib.load(anomaly_path(model_dir))
+
+
+def get_anomaly_model(model_dir=None):
+    """Model tersimpan; dilatih ulang jika belum ada atau encoder berubah."""
+    encoder = get_encoder(model_dir)
+    if os.path.exists(anomaly_path(model_dir)):
+        bundle = load_anomaly_model(model_dir)
+        if bundle["encoder_version"] == encoder.version:
+            return bundle
+    bundle = train_isolation_forest(encoder=encoder)
+    save_anomaly_model(bundle, model_dir)
+    return bundle
+
+
+# --------------------------------------------------------------- blocking
+BLOCK_COLS = ["nama_kepala_keluarga", "alamat", "rt", "rw", "kelurahan"]
+
+NAME_TITLES = {"h", "hj", "dr", "drs", "ir", "st", "s", "pd", "se", "sh", "bapak", "ibu"}
+
+# Pass blocking: (jenis, kolom kunci). Pasangan dari beberapa pass digabung.
+# Nomor RT/RW berulang di setiap kelurahan, jadi kelurahan selalu ikut kunci.
+BLOCK_PASSES = [
+    ("identik", ["nama_norm", "alamat_norm", "kelurahan", "rt", "rw"]),
+    ("nama", ["nama_kunci", "kelurahan", "rt", "rw"]),
+    ("alamat", ["alamat_norm", "kelurahan", "rt", "rw"]),
+]
+
+
+def _map_unique(values, func):
+    """Terapkan func hanya sekali per nilai unik (nama/alamat banyak berulang)."""
+    codes, uniques = pd.factorize(pd.Series(values).astype(str))
+    return np.array([func(u) for u in uniques], dtype=object)[codes]
+
+
+def _clean(text):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def normalize_name(text):
+    """Huruf kecil, tanpa tanda baca & gelar, token diurutkan."""
+    tokens = [t for t in _clean(text).split() if t not in NAME_TITLES]
+    return " ".join(sorted(tokens))
+
+
+def _skeleton(token):
+    # Kunci fonetik sederhana: ejaan lama → baru, huruf pertama + konsonan
+    for old, new in (("dj", "j"), ("tj", "c"), ("oe", "u"), ("ch", "k"), ("sj", "sy")):
+        token = token.replace(old, new)
+    rest = re.sub(r"[aeiouy]", "", token[1:])
+    rest = re.sub(r"(.)\1+", r"\1", rest)
+    return token[:1] + rest
+
+
+def name_key(normalized):
+    return " ".join(_skeleton(t) for t in normalized.split())
+
+
+def normalize_address(text):
+    """(alamat ternormalisasi, nama jalan, nomor rumah)."""
+    text = _clean(text)
+    text = re.sub(r"\b(jl|jln)\b", "jalan", text)
+    text = re.sub(r"\b(no|nomor|nmr)\b", " ", text)
+    text = " ".join(text.split())
+    match = re.search(r"(\d+)\s*$", text)
+    number = match.group(1).lstrip("0") if match else ""
+    street = text[:match.start()].strip() if match else text
+    return f"{street} {number}".strip(), street, number
+
+
+def blocking_keys(df):
+    """Kolom kunci blocking untuk setiap baris df (vektor per nilai unik)."""
+    nama = _map_unique(df["nama_kepala_keluarga"], normalize_name)
+    alamat = _map_unique(df["alamat"], normalize_address)
+    return pd.DataFrame({
+        "nama_norm": nama,
+        "nama_kunci": _map_unique(nama, name_key),
+        "alamat_norm": [a[0] for a in alamat],
+        "alamat_jalan": [a[1] for a in alamat],
+        "alamat_no": [a[2] for a in alamat],
+        "kelurahan": df["kelurahan"].astype(str).to_numpy(),
+        "rt": df["rt"].to_numpy(),
+        "rw": df["rw"].to_numpy(),
+    }, index=df.index)
+
+
+def _group_codes(keys, cols):
+    """Kode grup int64 untuk kombinasi kolom (difaktorkan bertahap, tanpa overflow)."""
+    codes = np.zeros(len(keys), dtype=np.int64)
+    for c in cols:
+        f, uniques = pd.factorize(keys[c])
+        codes = pd.factorize(codes * len(uniques) + f)[0].astype(np.int64)
+    return codes
+
+
+def _pass_pairs(codes, other, max_block, window):
+    """Semua pasangan (i, j) dalam blok; blok besar memakai sorted-neighborhood.
+
+    Blok dengan ukuran sama diproses sekaligus, jadi loop Python hanya per
+    ukuran blok, bukan per blok.
+    """
+    other_rank = pd.factorize(other, sort=True)[0]
+    order = np.lexsort((other_rank, codes))
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(codes)])
+    out_i, out_j = [], []
+    for size in np.unique(sizes[sizes >= 2]):
+        block_starts = starts[sizes == size]
+        if size <= max_block:
+            a, b = np.triu_indices(size, k=1)
+        else:
+            a = np.repeat(np.arange(size), window)
+            b = a + np.tile(np.arange(1, window + 1), size)
+            a, b = a[b < size], b[b < size]
+        out_i.append(order[(block_starts[:, None] + a).ravel()])
+        out_j.append(order[(block_starts[:, None] + b).ravel()])
+    if not out_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    i, j = np.concatenate(out_i), np.concatenate(out_j)
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _ratios(values, i, j):
+    """SequenceMatcher.ratio per pasangan, dihitung sekali per pasangan string unik."""
+    codes, uniques = pd.factorize(values)
+    a, b = codes[i].astype(np.int64), codes[j].astype(np.int64)
+    pair_keys, inverse = np.unique(np.minimum(a, b) * len(uniques) + np.maximum(a, b),
+                                   return_inverse=True)
+    ratios = np.array([
+        SequenceMatcher(None, uniques[k // len(uniques)], uniques[k % len(uniques)]).ratio()
+        for k in pair_keys
+    ])
+    return ratios[inverse] if len(ratios) else np.zeros(0)
+
+
+def pair_similarity(keys, i, j):
+    """Kemiripan 0–1 baris i vs j: separuh nama, separuh alamat.
+
+    Nomor rumah berbeda memotong skor alamat setengah; nama & alamat
+    ternormalisasi yang sama persis selalu bernilai 1.
+    """
+    nama = keys["nama_norm"].to_numpy()
+    alamat = keys["alamat_norm"].to_numpy()
+    number = keys["alamat_no"].to_numpy()
+    identical = (nama[i] == nama[j]) & (alamat[i] == alamat[j])
+    street = _ratios(keys["alamat_jalan"].to_numpy(), i, j)
+    score = 0.5 * _ratios(nama, i, j) + 0.5 * street * np.where(number[i] == number[j], 1.0, 0.5)
+    return np.where(identical, 1.0, score)
+
+
+def duplicate_candidates(keys, niks, threshold=0.85, max_block=200, window=20):
+    """Pasangan kandidat duplikat (NIK berbeda) dari blocking multi-pass."""
+    keys = keys.reset_index(drop=True)
+    niks = np.asarray(niks)
+    n = len(keys)
+    found_i, found_j, found_pass = [], [], []
+    for p, (_, cols) in enumerate(BLOCK_PASSES):
+        # Kolom "lawan" dipakai untuk mengurutkan blok besar
+        other = keys["alamat_norm" if "nama_kunci" in cols else "nama_norm"].to_numpy()
+        i, j = _pass_pairs(_group_codes(keys, cols), other, max_block, window)
+        found_i.append(i)
+        found_j.append(j)
+        found_pass.append(np.full(len(i), p, dtype=np.int8))
+
+    i, j, passes = np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_pass)
+    # Pasangan sama dari beberapa pass → simpan yang pertama ditemukan
+    _, first = np.unique(i * n + j, return_index=True)
+    i, j, passes = i[first], j[first], passes[first]
+    keep = niks[i] != niks[j]
+    if threshold > 0.75:
+        # Nomor rumah beda → kemiripan maksimal 0.75, tidak perlu dihitung
+        number = keys["alamat_no"].to_numpy()
+        keep &= number[i] == number[j]
+    i, j, passes = i[keep], j[keep], passes[keep]
+
+    scores = pair_similarity(keys, i, j)
+    hit = scores >= threshold
+    names = np.array([f"mirip ({name})" for name, _ in BLOCK_PASSES])
+    pairs = pd.DataFrame({
+        "nik_a": niks[i[hit]],
+        "nik_b": niks[j[hit]],
+        "kemiripan": scores[hit],
+        "jenis": np.where(scores[hit] == 1.0, "identik", names[passes[hit]]),
+    })
+    return pairs.sort_values("kemiripan", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# ------------------------------------------------------- scoring per chunk
+_worker = None
+
+
+def _init_worker(model_dir):
+    global _worker
+    encoder = get_encoder(model_dir)
+    bundle = load_anomaly_model(model_dir)
+    _worker = (encoder, bundle["scaler"], CompiledForest(bundle["model"]))
+
+
+def _score_chunk(chunk):
+    encoder, scaler, forest = _worker
+    X = scaler.transform(feature_matrix(chunk, encoder))
+    raw = forest.score_samples(X)
+    out = pd.DataFrame({
+        NIK_COL: chunk[NIK_COL].to_numpy(),
+        "nama_kepala_keluarga": chunk["nama_kepala_keluarga"].to_numpy(),
+        "anomaly_score": -raw,  # tinggi = makin janggal
+        "anomaly": forest.predict(X, raw),
+    })
+    return pd.concat([out, blocking_keys(chunk).reset_index(drop=True)], axis=1)
+
+
+def score_file(src, chunksize=DEFAULT_CHUNKSIZE, workers=None, model_dir=None):
+    """Skor outlier + kunci blocking per chunk; kembalikan (frame, ringkasan).
+
+    workers=None → jumlah CPU; workers<=1 → tanpa process pool.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    get_anomaly_model(model_dir)  # pastikan artefak ada sebelum worker memuatnya
+    columns = sorted({NIK_COL, *FEATURES, *BLOCK_COLS})
+    src = os.path.join(DATA_DIR, src)
+
+    start = time.perf_counter()
+    parts = []
+    if workers <= 1:
+        _init_worker(model_dir)
+        parts = [_score_chunk(chunk) for chunk in iter_chunks(src, chunksize, columns)]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(model_dir,)) as pool:
+            pending = deque()
+            for chunk in iter_chunks(src, chunksize, columns):
+                pending.append(pool.submit(_score_chunk, chunk))
+                # Batasi chunk yang sedang diproses → memori terbatas
+                while len(pending) >= 2 * workers:
+                    parts.append(pending.popleft().result())
+            parts.extend(f.result() for f in pending)
+    scored = pd.concat(parts, ignore_index=True)
+
+    elapsed = time.perf_counter() - start
+    return scored, {
+        "rows": len(scored),
+        "chunks": len(parts),
+        "workers": max(workers, 1),
+        "seconds": elapsed,
+        "rows_per_sec": len(scored) / elapsed if elapsed else float("nan"),
+    }
+
+
+def suspicion_table(scored, pairs):
+    """Satu baris per NIK, diurutkan dari skor kecurigaan tertinggi.
+
+    skor_kecurigaan = 0.6 × kemiripan duplikat terbaik + 0.4 × persentil
+    skor outlier, sehingga duplikat nyata selalu di atas outlier murni.
+    """
+    both = pd.concat([
+        pairs.rename(columns={"nik_a": NIK_COL, "nik_b": "nik_duplikat"}),
+        pairs.rename(columns={"nik_b": NIK_COL, "nik_a": "nik_duplikat"}),
+    ], ignore_index=True)
+    best = both.sort_values("kemiripan", ascending=False, kind="stable")
+    dup = best.groupby(NIK_COL, sort=False).agg(
+        n_duplikat=("nik_duplikat", "size"),
+        nik_duplikat=("nik_duplikat", "first"),
+        kemiripan=("kemiripan", "first"),
+    )
+
+    table = scored[[NIK_COL, "nama_kepala_keluarga", "kelurahan", "anomaly_score", "anomaly"]]
+    table = table.join(dup, on=NIK_COL)
+    table["n_duplikat"] = table["n_duplikat"].fillna(0).astype(int)
+    table["nik_duplikat"] = table["nik_duplikat"].astype("Int64")
+    table["kemiripan"] = table["kemiripan"].fillna(0.0)
+    table["persentil_outlier"] = table["anomaly_score"].rank(pct=True)
+    table["skor_kecurigaan"] = 0.6 * table["kemiripan"] + 0.4 * table["persentil_outlier"]
+
+    alasan = np.where(table["n_duplikat"] > 0, "Kandidat duplikat", "")
+    outlier = table["anomaly"].to_numpy() == -1
+    alasan = np.where(outlier & (alasan != ""), alasan + " + Outlier",
+                      np.where(outlier, "Outlier", alasan))
+    table["alasan"] = pd.Categorical(alasan)
+    table["kelurahan"] = table["kelurahan"].astype("category")
+    return table.sort_values("skor_kecurigaan", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def rank_file(src, chunksize=DEFAULT_CHUNKSIZE, workers=None, model_dir=None, threshold=0.85):
+    """Pipeline lengkap: (tabel kecurigaan, pasangan duplikat, ringkasan)."""
+    scored, report = score_file(src, chunksize, workers, model_dir)
+    start = time.perf_counter()
+    pairs = duplicate_candidates(scored, scored[NIK_COL], threshold)
+    report["blocking_seconds"] = time.perf_counter() - start
+    report["pairs"] = len(pairs)
+    return suspicion_table(scored, pairs), pairs, report
+
+
+_rankings = {}
+_rankings_lock = threading.Lock()
+
+
+def suspicion_version(src="dtsen_with_anomalies.csv", model_dir=None):
+    """Versi tabel kecurigaan: versi file sumber + mtime model anomali."""
+    bundle_file = anomaly_path(model_dir)
+    return (dataset_version(src),
+            os.stat(bundle_file).st_mtime_ns if os.path.exists(bundle_file) else None)
+
+
+def get_suspicion_ranking(src="dtsen_with_anomalies.csv", workers=1):
+    """Tabel kecurigaan & pasangan duplikat, dihitung ulang jika file/model berubah.
+
+    Tidak melatih model: FileNotFoundError jika model belum ada, ValueError
+    jika model tidak cocok dengan encoder aktif.
+    """
+    version = suspicion_version(src)
+    with _rankings_lock:
+        cached = _rankings.get(src)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    if version[1] is None:
+        raise FileNotFoundError("Model anomali belum dilatih; jalankan `python -m dtsen.anomaly`")
+    if load_anomaly_model()["encoder_version"] != get_encoder().version:
+        raise ValueError("Model anomali tidak cocok dengan encoder aktif; latih ulang dengan `python -m dtsen.anomaly`")
+    table, pairs, _ = rank_file(src, workers=workers)
+    with _rankings_lock:
+        _rankings[src] = (suspicion_version(src), (table, pairs))
+    return table, pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Model & peringkat anomali bansos DTSEN")
+    sub = parser.add_subparsers(dest="cmd")
+    train = sub.add_parser("train", help="latih & simpan IsolationForest (bawaan)")
+    train.add_argument("model_dir", nargs="?", default=None)
+    rank = sub.add_parser("rank", help="tabel peringkat kecurigaan per NIK")
+    rank.add_argument("src")
+    rank.add_argument("dst", help="keluaran .csv atau .parquet")
+    rank.add_argument("--pairs", help="simpan pasangan duplikat ke file ini")
+    rank.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    rank.add_argument("--workers", type=int, default=None)
+    rank.add_argument("--model-dir", default=None)
+    rank.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "rank":
+        table, pairs, report = rank_file(args.src, args.chunksize, args.workers,
+                                         args.model_dir, args.threshold)
+        for frame, path in ((table, args.dst), (pairs, args.pairs)):
+            if path:
+                frame.to_parquet(path, index=False) if path.endswith(".parquet") \
+                    else frame.to_csv(path, index=False)
+        print(
+            f"✅ {report['rows']:,} baris di-score dalam {report['seconds']:.2f}s "
+            f"({report['rows_per_sec']:,.0f} baris/detik, {report['workers']} worker), "
+            f"{report['pairs']:,} kandidat duplikat dalam {report['blocking_seconds']:.2f}s → {args.dst}"
+        )
+        return
+
+    model_dir = getattr(args, "model_dir", None)
+    bundle = train_isolation_forest(encoder=get_encoder(model_dir))
+    print(f"✅ Model anomali disimpan: {save_anomaly_model(bundle, model_dir)}")
+
+
+if __name__ == "__main__":
+    main()
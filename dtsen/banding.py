@@ -0,0 +1,45 @@
+"""Banding skor dan status secara vektor (tanpa .apply per baris).
+
+Hasilnya berupa pd.Categorical terurut, sehingga value_counts/groupby
+mengikuti urutan band (Rendah → Sedang → Tinggi) dan hemat memori.
+"""
+import numpy as np
+import pandas as pd
+
+RISK_THRESHOLDS = (0.3, 0.6)
+RISK_LABELS = ("Rendah", "Sedang", "Tinggi")
+
+CHANGE_LABELS = ("Membaik", "Tetap", "Memburuk")
+
+
+def band_scores(values, thresholds=RISK_THRESHOLDS, labels=RISK_LABELS):
+    """Band skor ke label; batas bawah inklusif, sama dengan if/elif lama.
+
+    Dengan ambang (0.3, 0.6): skor < 0.3 → Rendah, < 0.6 → Sedang,
+    selainnya Tinggi. NaN menjadi kategori kosong (NaN).
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    if len(labels) != len(thresholds) + 1:
+        raise ValueError("Jumlah label harus = jumlah ambang + 1")
+    if np.any(np.diff(thresholds) <= 0):
+        raise ValueError("Ambang harus naik secara ketat")
+
+    arr = np.asarray(values, dtype=float)
+    # Setara pd.cut(..., right=False) tanpa membangun IntervalIndex
+    codes = np.searchsorted(thresholds, arr, side="right")
+    codes[np.isnan(arr)] = -1
+    cat = pd.Categorical.from_codes(codes, categories=list(labels), ordered=True)
+    if isinstance(values, pd.Series):
+        return pd.Series(cat, index=values.index, name=values.name)
+    return cat
+
+
+def band_change(delta, labels=CHANGE_LABELS):
+    """Status perubahan skor: < 0 Membaik, = 0 Tetap, > 0 Memburuk."""
+    arr = np.asarray(delta, dtype=float)
+    codes = np.sign(arr)
+    codes = np.where(np.isnan(codes), -1, codes + 1).astype(np.int8)
+    cat = pd.Categorical.from_codes(codes, categories=list(labels), ordered=True)
+    if isinstance(delta, pd.Series):
+        return pd.Series(cat, index=delta.index, name=delta.name)
+    return cat
@@ -0,0 +1,165 @@
+"""Grafik matplotlib/seaborn yang di-cache sebagai PNG.
+
+Grafik digambar pada `matplotlib.figure.Figure` biasa (bukan pyplot), jadi
+tidak pernah didaftarkan ke figure manager global dan langsung dibebaskan
+setelah dirender. Hasilnya disimpan sebagai byte PNG di cache LRU berbatas
+dengan kunci (nama grafik, versi dataset, parameter): rerun Streamlit
+berikutnya cukup mengirim ulang byte yang sama, dan memori proses tetap
+datar berapa pun jumlah sesi.
+
+Histogram dan KDE dihitung dari hitungan bin NumPy (np.histogram sekali,
+KDE = konvolusi kernel Gaussian pada grid bin halus), bukan dari baris
+mentah untuk setiap titik evaluasi.
+"""
+import io
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from dtsen.instrument import span
+
+MAX_ENTRIES = 64
+DPI = 150
+KDE_GRID = 512
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "render_seconds": 0.0}
+
+
+def render_png(key, draw, figsize=(6.4, 4.8)):
+    """Byte PNG untuk `key`; `draw(fig, ax)` hanya dipanggil saat cache miss."""
+    with _lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return png
+
+    start = time.perf_counter()
+    with span("chart_render"):
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
+        draw(fig, ax)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=DPI, bbox_inches="tight")
+        fig.clear()
+        png = buf.getvalue()
+
+    with _lock:
+        _stats["misses"] += 1
+        _stats["render_seconds"] += time.perf_counter() - start
+        _cache[key] = png
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+            _stats["evictions"] += 1
+    return png
+
+
+def cache_stats():
+    with _lock:
+        return {**_stats, "entries": len(_cache), "bytes": sum(len(v) for v in _cache.values())}
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+# ------------------------------------------------------------ histogram & KDE
+def binned_hist(values, bins=20, kde=True, grid=KDE_GRID):
+    """Hitungan histogram + KDE (skala jumlah) dari data yang sudah di-bin.
+
+    Bandwidth mengikuti aturan Scott seperti seaborn; KDE dievaluasi pada
+    rentang data (cut=0, sama dengan default histplot).
+    """
+    v = np.asarray(values, dtype=float)
+    v = v[np.isfinite(v)]
+    counts, edges = np.histogram(v, bins=bins)
+    out = {"counts": counts, "edges": edges, "n": len(v)}
+    if not kde or len(v) < 2 or v.std() == 0:
+        return out
+
+    bw = v.std(ddof=1) * len(v) ** (-1 / 5)
+    fine, fine_edges = np.histogram(v, bins=grid, range=(edges[0], edges[-1]))
+    dx = fine_edges[1] - fine_edges[0]
+    # Kernel ±4 bandwidth. Tidak ada data di luar rentang bin, jadi konvolusi
+    # penuh yang dipotong ke grid setara KDE yang dievaluasi di dalam rentang
+    # (cut=0). Sampel kecil → bandwidth lebar → kernel bisa lebih panjang dari
+    # grid; mode "same" akan mengembalikan panjang kernel, bukan panjang grid
+    half = int(np.ceil(4 * bw / dx))
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    kernel /= kernel.sum()
+    density = np.convolve(fine, kernel)[half:half + len(fine)] / (len(v) * dx)
+    out["kde_x"] = (fine_edges[:-1] + fine_edges[1:]) / 2
+    # Skala ke jumlah per bin histogram (seperti kde=True di histplot)
+    out["kde_y"] = density * len(v) * (edges[1] - edges[0])
+    return out
+
+
+def hist_png(values, key, bins=20, kde=True, title=None, xlabel=None):
+    """Histogram (+ KDE) ter-cache; `key` harus memuat versi dataset."""
+    def draw(fig, ax):
+        h = binned_hist(values, bins, kde)
+        edges = h["edges"]
+        ax.bar(edges[:-1], h["counts"], width=np.diff(edges), align="edge",
+               color="C0", alpha=0.6, edgecolor="white")
+        if "kde_x" in h:
+            ax.plot(h["kde_x"], h["kde_y"], color="C0")
+        ax.set_ylabel("Count")
+        if xlabel:
+            ax.set_xlabel(xlabel)
+        if title:
+            ax.set_title(title)
+
+    return render_png(("hist", key, bins, kde, title, xlabel), draw)
+
+
+def count_png(counts, key, colors=None, xlabel=None):
+    """Bar jumlah per kategori dari value_counts yang sudah jadi."""
+    def draw(fig, ax):
+        ax.bar(counts.index.astype(str), counts.to_numpy(), color=colors)
+        ax.set_ylabel("count")
+        if xlabel:
+            ax.set_xlabel(xlabel)
+
+    return render_png(("count", key, tuple(colors or ()), xlabel), draw)
+
+
+def heatmap_png(table, key, title=None, cmap="YlGnBu"):
+    def draw(fig, ax):
+        import seaborn as sns
+
+        sns.heatmap(table, annot=True, fmt=".0f", cmap=cmap, ax=ax)
+        if title:
+            ax.set_title(title)
+
+    return render_png(("heatmap", key, title, cmap), draw, figsize=(10, 6))
+
+
+def stacked_bar_png(table, key, colors, title=None, xlabel=None, ylabel=None):
+    def draw(fig, ax):
+        table.plot(kind="bar", stacked=True, color=colors, ax=ax)
+        ax.set_title(title or "")
+        ax.set_xlabel(xlabel or "")
+        ax.set_ylabel(ylabel or "")
+
+    return render_png(("stacked", key, tuple(colors), title, xlabel, ylabel), draw, figsize=(10, 6))
+
+
+def lines_png(frame, x, series, key, title=None):
+    """Beberapa garis dari kolom `frame`; `series` = {label: kolom}."""
+    def draw(fig, ax):
+        for label, col in series.items():
+            ax.plot(frame[x], frame[col], label=label)
+        ax.set_xlabel(x)
+        ax.legend()
+        if title:
+            ax.set_title(title)
+        fig.autofmt_xdate()
+
+    return render_png(("lines", key, x, tuple(series.items()), title), draw, figsize=(10, 6))
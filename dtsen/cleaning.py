@@ -0,0 +1,232 @@
+"""Pipeline cleaning DTSEN berbasis chunk (versi streaming Fase_1.ipynb).
+
+Register dibaca per chunk dan dilewatkan ke rangkaian stage; setiap stage
+menerima satu chunk DataFrame dan mengembalikan chunk hasilnya. Memori
+yang dipakai sebanding dengan ukuran chunk, ditambah himpunan NIK yang
+sudah terlihat (array int64 terurut, 8 byte per NIK) untuk deduplikasi
+antar chunk.
+
+    python -m dtsen.cleaning                          # dummy → clean bawaan
+    python -m dtsen.cleaning input.csv output.parquet --chunksize 100000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import DATA_DIR, DEFAULT_CHUNKSIZE, NIK_COL, iter_chunks
+from dtsen.snapshot import ChunkWriter
+
+RAW_FILE = "dtsen_dummy_padangpanjang_1000.csv"
+CLEAN_FILE = "dtsen_clean_padangpanjang.csv"
+
+
+class SortedIntSet:
+    """Himpunan int64 ringkas: kumpulan run terurut yang digabung bertahap.
+
+    Run baru digabung dengan run sebelumnya selama ukurannya sebanding
+    (seperti LSM tree), sehingga biaya sisip teramortisasi O(log n) per
+    elemen dan pencarian cukup searchsorted di beberapa run.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(r) for r in self._runs)
+
+    @property
+    def nbytes(self):
+        return sum(r.nbytes for r in self._runs)
+
+    def contains(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        found = np.zeros(len(values), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, values), len(run) - 1)
+            found |= run[pos] == values
+        return found
+
+    def add(self, values):
+        """Tambahkan nilai (diasumsikan belum ada di himpunan)."""
+        run = np.sort(np.asarray(values, dtype=np.int64))
+        if not len(run):
+            return
+        while self._runs and len(self._runs[-1]) <= 2 * len(run):
+            run = np.concatenate([self._runs.pop(), run])
+            run.sort(kind="mergesort")
+        self._runs.append(run)
+
+
+class Stage:
+    """Satu langkah pipeline; turunan mengisi `process(chunk)`."""
+
+    name = "stage"
+
+    def process(self, chunk):
+        raise NotImplementedError
+
+    def finish(self):
+        """Dipanggil sekali setelah chunk terakhir."""
+
+
+class DropDuplicateNIK(Stage):
+    name = "drop_duplicates_nik"
+
+    def __init__(self, key=NIK_COL):
+        self.key = key
+        self.seen = SortedIntSet()
+        self.dropped = 0
+
+    def process(self, chunk):
+        niks = chunk[self.key].to_numpy(dtype=np.int64)
+        # Duplikat di dalam chunk (pertahankan kemunculan pertama) + chunk lama
+        keep = ~pd.Series(niks).duplicated().to_numpy() & ~self.seen.contains(niks)
+        self.seen.add(niks[keep])
+        self.dropped += int((~keep).sum())
+        return chunk[keep]
+
+
+def _map_strings(s, fn):
+    """Terapkan fungsi string; untuk kolom kategori cukup pada kategorinya."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = fn(pd.Series(s.cat.categories, dtype=object)).to_numpy(dtype=object)
+        codes = s.cat.codes.to_numpy()
+        values = np.where(codes >= 0, cats[codes], None)
+        return pd.Series(values, index=s.index, name=s.name).astype("category")
+    return fn(s)
+
+
+class NormalizeStrings(Stage):
+    name = "normalize_strings"
+
+    def __init__(self, title_cols=("status_kepemilikan_rumah",),
+                 upper_cols=("pendidikan_kepala_keluarga",)):
+        self.title_cols = title_cols
+        self.upper_cols = upper_cols
+
+    def process(self, chunk):
+        chunk = chunk.copy(deep=False)
+        for c in self.title_cols:
+            chunk[c] = _map_strings(chunk[c], lambda s: s.str.strip().str.title())
+        for c in self.upper_cols:
+            chunk[c] = _map_strings(chunk[c], lambda s: s.str.strip().str.upper())
+        return chunk
+
+
+class ParseDates(Stage):
+    name = "parse_dates"
+
+    def __init__(self, cols=("tanggal_update",)):
+        self.cols = cols
+
+    def process(self, chunk):
+        chunk = chunk.copy(deep=False)
+        for c in self.cols:
+            chunk[c] = pd.to_datetime(chunk[c], errors="coerce")
+        return chunk
+
+
+class ClipRanges(Stage):
+    name = "clip_ranges"
+
+    def __init__(self, lower=None):
+        self.lower = lower or {"jumlah_anggota_keluarga": 1, "luas_lantai": 10}
+
+    def process(self, chunk):
+        chunk = chunk.copy(deep=False)
+        for c, low in self.lower.items():
+            chunk[c] = chunk[c].clip(lower=low)
+        return chunk
+
+
+def safe_ratio(num, den):
+    """num / den; pembagi 0, negatif, atau kosong → NaN (bukan inf)."""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(len(num), np.nan)
+    ok = den > 0
+    np.divide(num, den, out=out, where=ok)
+    return out
+
+
+class DeriveFeatures(Stage):
+    name = "derive_features"
+
+    def process(self, chunk):
+        chunk = chunk.copy(deep=False)
+        chunk["rasio_pengeluaran_pendapatan"] = safe_ratio(
+            chunk["pengeluaran_per_bulan"], chunk["pendapatan_per_bulan"]
+        )
+        chunk["kepadatan_rumah"] = safe_ratio(
+            chunk["jumlah_anggota_keluarga"], chunk["luas_lantai"]
+        )
+        return chunk
+
+
+def default_stages():
+    """Urutan langkah yang sama dengan Fase_1.ipynb."""
+    return [DropDuplicateNIK(), NormalizeStrings(), ParseDates(), ClipRanges(), DeriveFeatures()]
+
+
+class CleaningPipeline:
+    def __init__(self, stages=None):
+        self.stages = stages if stages is not None else default_stages()
+
+    def run(self, src, dst, chunksize=DEFAULT_CHUNKSIZE):
+        """Bersihkan `src` ke `dst` (CSV/Parquet); kembalikan laporan per stage."""
+        stats = {name: {"seconds": 0.0, "rows_in": 0, "rows_out": 0}
+                 for name in ["read"] + [s.name for s in self.stages] + ["write"]}
+        writer = ChunkWriter(dst)
+        chunks = iter(iter_chunks(src, chunksize))
+        try:
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                stats["read"]["seconds"] += time.perf_counter() - start
+                if chunk is None:
+                    break
+                stats["read"]["rows_in"] += len(chunk)
+                stats["read"]["rows_out"] += len(chunk)
+
+                for stage in self.stages:
+                    rows_in = len(chunk)
+                    start = time.perf_counter()
+                    chunk = stage.process(chunk)
+                    st = stats[stage.name]
+                    st["seconds"] += time.perf_counter() - start
+                    st["rows_in"] += rows_in
+                    st["rows_out"] += len(chunk)
+
+                start = time.perf_counter()
+                writer.write(chunk)
+                stats["write"]["seconds"] += time.perf_counter() - start
+                stats["write"]["rows_in"] += len(chunk)
+                stats["write"]["rows_out"] += len(chunk)
+        finally:
+            writer.close()
+        for stage in self.stages:
+            stage.finish()
+
+        report = pd.DataFrame.from_dict(stats, orient="index")
+        report["rows_per_sec"] = report["rows_in"] / report["seconds"].where(report["seconds"] > 0)
+        report.index.name = "stage"
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cleaning register DTSEN per chunk")
+    parser.add_argument("src", nargs="?", default=os.path.join(DATA_DIR, RAW_FILE))
+    parser.add_argument("dst", nargs="?", default=os.path.join(DATA_DIR, CLEAN_FILE))
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    report = CleaningPipeline().run(args.src, args.dst, args.chunksize)
+    print(report.to_string(float_format=lambda v: f"{v:,.3f}"))
+    print(f"✅ Dataset bersih disimpan: {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
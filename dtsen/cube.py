@@ -0,0 +1,112 @@
+"""Cube agregat per kelurahan untuk ringkasan dashboard.
+
+Register di-agregasi sekali per versi dataset ke sel-sel kecil
+(kelurahan × kecamatan × segmen × cluster × anomali × band status), masing-
+masing menyimpan jumlah keluarga, total kolom numerik, dan jumlah nilai
+non-null per kolom (penyebut rata-rata, jadi NaN tidak ikut). Ringkasan di
+dashboard (distribusi segmen, rata-rata dampak program, total anak
+sekolah) diambil dari sel-sel ini, jadi biaya per render bergantung pada
+jumlah sel, bukan jumlah rumah tangga.
+"""
+import threading
+
+from dtsen.banding import band_change, band_scores
+from dtsen.feature_store import feature_store_version, get_feature_store
+from dtsen.instrument import span
+
+DIMENSIONS = [
+    "kelurahan", "kecamatan", "socio_segment_label", "cluster", "anomaly_label",
+    "status_kemiskinan", "status_stunting", "status_perubahan",
+]
+MEASURES = [
+    "jumlah_anggota_keluarga", "jumlah_anak_sekolah", "jumlah_anak_balita",
+    "pendapatan_per_bulan", "pengeluaran_per_bulan",
+    "risk_score", "stunting_risk_score", "delta_risk", "delta_stunting",
+]
+
+
+class AggregateCube:
+    def __init__(self, cells, dimensions, measures):
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS, measures=MEASURES):
+        dims = [d for d in dimensions if d in df.columns]
+        meas = [m for m in measures if m in df.columns]
+        grouped = df.groupby(dims, observed=True, dropna=False, sort=False)
+        cells = grouped[meas].sum(min_count=1)
+        cells.insert(0, "count", grouped.size())
+        for m in meas:
+            cells[f"{m}_count"] = grouped[m].count()
+        return cls(cells.reset_index(), dims, meas)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def summary(self, by=(), values=(), **filters):
+        """Jumlah keluarga + total & rata-rata `values` per kombinasi `by`.
+
+        `filters` membatasi sel, mis. summary(["kelurahan"], kecamatan="...").
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        values = [values] if isinstance(values, str) else list(values)
+        unknown = [c for c in by + list(filters) if c not in self.dimensions]
+        if unknown:
+            raise KeyError(f"Dimensi tidak ada di cube: {unknown}")
+
+        cells = self.cells
+        for dim, value in filters.items():
+            cells = cells[cells[dim] == value]
+        cols = ["count"] + values + [f"{v}_count" for v in values]
+        # min_count=1: grup yang semua nilainya NaN tetap NaN, bukan 0.0
+        if by:
+            out = cells.groupby(by, observed=True, sort=True)[cols].sum(min_count=1)
+        else:
+            out = cells[cols].sum(min_count=1).to_frame().T
+        for v in values:
+            out = out.rename(columns={v: f"{v}_sum"})
+            out[f"{v}_mean"] = out[f"{v}_sum"] / out.pop(f"{v}_count")
+        return out
+
+    def total(self, value, **filters):
+        return float(self.summary((), [value], **filters)[f"{value}_sum"].iloc[0])
+
+    def pivot(self, index, columns, **filters):
+        """Tabel silang jumlah keluarga (index × columns), sel kosong = 0."""
+        counts = self.summary([index, columns], **filters)["count"]
+        return counts.unstack(columns, fill_value=0)
+
+
+def build_cube(df):
+    """Tambahkan kolom turunan (band & delta) lalu bangun cube."""
+    df = df.copy(deep=False)
+    if "risk_score_after" in df.columns:
+        df["delta_risk"] = df["risk_score_after"] - df["risk_score"]
+        df["delta_stunting"] = df["stunting_risk_score_after"] - df["stunting_risk_score"]
+        df["status_perubahan"] = band_change(df["delta_risk"])
+    df["status_kemiskinan"] = band_scores(df["risk_score"])
+    df["status_stunting"] = band_scores(df["stunting_risk_score"])
+    return AggregateCube.from_frame(df)
+
+
+_cube_cache = {}
+_cube_lock = threading.Lock()
+
+
+def get_cube():
+    """Cube untuk versi feature store saat ini (dibangun sekali per versi)."""
+    version = feature_store_version()
+    with _cube_lock:
+        cached = _cube_cache.get("default")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    store = get_feature_store()
+    needed = [c for c in store.columns if c in DIMENSIONS or c in MEASURES
+              or c in ("risk_score_after", "stunting_risk_score_after")]
+    with span("cube_build"):
+        cube = build_cube(store.read(needed))
+    with _cube_lock:
+        _cube_cache["default"] = (version, cube)
+    return cube
@@ -0,0 +1,180 @@
+"""Agregat bulanan & deteksi perubahan untuk Early Warning Krisis Ekonomi.
+
+Alih-alih mengelompokkan seluruh register per bulan di setiap render,
+agregat (jumlah keluarga, total pendapatan, jumlah keluarga yang
+pendapatannya terisi, jumlah penerima bansos) per bulan × kelurahan
+disimpan sekali. Rumah tangga baru atau yang berubah
+cukup ditambahkan/dikurangkan dari agregat (`add`, `remove`,
+`apply_update`). Deteksi perubahan (CUSUM) berjalan di atas deret agregat,
+jadi biayanya O(jumlah bulan), bukan O(jumlah rumah tangga).
+"""
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import DATA_DIR, dataset_version, load_dataset
+
+DATE_COL = "tanggal_update"
+STORE_PATH = os.path.join(DATA_DIR, "models", "early_warning.joblib")
+AGG_COLS = ["n_keluarga", "pendapatan_sum", "n_pendapatan", "penerima_bansos"]
+
+
+def _month(dates):
+    return pd.to_datetime(dates, errors="coerce").dt.to_period("M").dt.to_timestamp()
+
+
+class MonthlyAggregates:
+    def __init__(self, frame=None):
+        index = pd.MultiIndex.from_arrays([[], []], names=["bulan", "kelurahan"])
+        self.frame = frame if frame is not None else pd.DataFrame(
+            {c: pd.Series(dtype="int64") for c in AGG_COLS}, index=index
+        )
+
+    @classmethod
+    def from_frame(cls, df):
+        store = cls()
+        store.add(df)
+        return store
+
+    @staticmethod
+    def _delta(df):
+        # Pendapatan kosong tidak ikut jumlah maupun penyebut rata-rata
+        income = df["pendapatan_per_bulan"]
+        rows = pd.DataFrame({
+            "bulan": _month(df[DATE_COL]),
+            "kelurahan": df["kelurahan"].astype(str).to_numpy(),
+            "n_keluarga": 1,
+            "pendapatan_sum": income.fillna(0).to_numpy(dtype="int64"),
+            "n_pendapatan": income.notna().to_numpy(dtype="int64"),
+            "penerima_bansos": (df["penerima_bansos"] == "Ya").to_numpy(dtype="int64"),
+        }).dropna(subset=["bulan"])
+        return rows.groupby(["bulan", "kelurahan"], sort=False)[AGG_COLS].sum()
+
+    def add(self, df, sign=1):
+        """Tambahkan (sign=1) atau kurangkan (sign=-1) record rumah tangga."""
+        delta = self._delta(df) * sign
+        merged = self.frame.add(delta, fill_value=0).astype("int64")
+        self.frame = merged[merged["n_keluarga"] != 0].sort_index()
+
+    def remove(self, df):
+        self.add(df, sign=-1)
+
+    def apply_update(self, old, new):
+        """Ganti record lama dengan versi barunya (mis. pendapatan berubah)."""
+        self.remove(old)
+        self.add(new)
+
+    def monthly(self, by_kelurahan=False):
+        """Deret bulanan: rata-rata pendapatan & jumlah penerima bansos."""
+        agg = self.frame if by_kelurahan else self.frame.groupby(level="bulan").sum()
+        out = agg.copy()
+        out["pendapatan_mean"] = out["pendapatan_sum"] / out["n_pendapatan"].where(out["n_pendapatan"] > 0)
+        return out
+
+    def save(self, path=STORE_PATH, version=None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({"version": version, "frame": self.frame}, path)
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        data = joblib.load(path)
+        return cls(data["frame"]), data["version"]
+
+
+class CusumDetector:
+    """CUSUM satu sisi per deret, diperbarui satu bulan setiap kali.
+
+    Rata-rata dan simpangan baku acuan diambil dari `warmup` bulan pertama.
+    direction=-1 mendeteksi penurunan (pendapatan), +1 kenaikan (bansos).
+    `k` adalah slack dan `h` ambang alarm, keduanya dalam satuan sigma.
+    Setelah alarm, akumulator di-reset.
+    """
+
+    def __init__(self, direction=-1, k=0.5, h=4.0, warmup=3, min_sigma_ratio=0.01):
+        self.direction = direction
+        self.k, self.h, self.warmup = k, h, warmup
+        self.min_sigma_ratio = min_sigma_ratio
+        self._baseline = []
+        self.mu = self.sigma = None
+        self.s = 0.0
+
+    def update(self, x):
+        """Masukkan satu nilai; kembalikan True jika alarm (NaN dilewati)."""
+        if np.isnan(x):
+            return False
+        if self.mu is None:
+            self._baseline.append(float(x))
+            if len(self._baseline) >= self.warmup:
+                self.mu = float(np.mean(self._baseline))
+                sd = float(np.std(self._baseline, ddof=1)) if len(self._baseline) > 1 else 0.0
+                self.sigma = max(sd, abs(self.mu) * self.min_sigma_ratio, 1e-12)
+            return False
+        z = self.direction * (x - self.mu) / self.sigma
+        self.s = max(0.0, self.s + z - self.k)
+        if self.s > self.h:
+            self.s = 0.0
+            return True
+        return False
+
+
+def cusum_alarms(values, **kwargs):
+    """Jalankan CusumDetector di sepanjang deret; kembalikan array bool alarm."""
+    det = CusumDetector(**kwargs)
+    return np.array([det.update(v) for v in values], dtype=bool)
+
+
+def detect(store, by_kelurahan=False, **kwargs):
+    """Tabel alarm: penurunan pendapatan & kenaikan penerima bansos per bulan."""
+    monthly = store.monthly(by_kelurahan)
+    groups = monthly.groupby(level="kelurahan") if by_kelurahan else [(None, monthly)]
+    rows = []
+    for kel, g in groups:
+        income = cusum_alarms(g["pendapatan_mean"].to_numpy(), direction=-1, **kwargs)
+        bansos = cusum_alarms(g["penerima_bansos"].to_numpy(), direction=1, **kwargs)
+        bulan = g.index.get_level_values("bulan")
+        for i in np.flatnonzero(income | bansos):
+            rows.append({
+                "bulan": bulan[i],
+                "kelurahan": kel,
+                "pendapatan_turun": bool(income[i]),
+                "bansos_naik": bool(bansos[i]),
+            })
+    return pd.DataFrame(rows, columns=["bulan", "kelurahan", "pendapatan_turun", "bansos_naik"])
+
+
+_store_cache = {}
+_store_lock = threading.Lock()
+
+
+def get_monthly_store(path="dtsen_with_scores.csv", store_path=STORE_PATH):
+    """Agregat untuk versi dataset saat ini.
+
+    Urutan: cache proses → file agregat di disk (jika versinya cocok) →
+    dibangun dari dataset lalu disimpan.
+    """
+    version = dataset_version(path)
+    with _store_lock:
+        cached = _store_cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    store = None
+    if os.path.exists(store_path):
+        loaded, saved_version = MonthlyAggregates.load(store_path)
+        # File agregat lama (tanpa n_pendapatan) dibangun ulang
+        if saved_version == (path, version) and set(AGG_COLS) <= set(loaded.frame.columns):
+            store = loaded
+    if store is None:
+        df = load_dataset(path, columns=[DATE_COL, "kelurahan", "pendapatan_per_bulan", "penerima_bansos"])
+        store = MonthlyAggregates.from_frame(df)
+        try:
+            store.save(store_path, (path, version))
+        except OSError:
+            pass  # direktori read-only: cukup pakai cache proses
+
+    with _store_lock:
+        _store_cache[path] = (version, store)
+    return store
@@ -0,0 +1,123 @@
+"""Encoder kategori bersama untuk training, scoring, segmentasi & anomali.
+
+Encoder di-fit sekali dari dataset bersih (dtsen_clean_padangpanjang.csv)
+dan disimpan dengan joblib, lalu dimuat oleh semua pipeline. Kode kategori
+memakai urutan terurut yang sama seperti LabelEncoder, jadi model lama
+tetap kompatibel. Nilai yang tidak dikenal mendapat UNKNOWN_CODE, bukan
+error.
+
+    python -m dtsen.encoding        # fit ulang & simpan models/encoders.joblib
+"""
+import hashlib
+import os
+import sys
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import CATEGORY_COLS, load_dataset
+
+UNKNOWN_CODE = -1
+
+# Label keluaran model bukan fitur, jadi tidak ikut di-encode
+ENCODED_COLS = [c for c in CATEGORY_COLS if c not in ("socio_segment_label", "anomaly_label")]
+
+
+class CategoryEncoder:
+    def __init__(self, categories):
+        self.categories = {c: list(v) for c, v in categories.items()}
+        self._dtypes = {c: pd.CategoricalDtype(v) for c, v in self.categories.items()}
+
+    @classmethod
+    def fit(cls, df, columns=ENCODED_COLS):
+        categories = {}
+        for c in columns:
+            if c in df.columns:
+                values = df[c].dropna().astype(str).unique()
+                categories[c] = sorted(values)
+        return cls(categories)
+
+    @property
+    def columns(self):
+        return list(self.categories)
+
+    @property
+    def version(self):
+        """Hash kategori; dipakai untuk memastikan model & encoder cocok."""
+        h = hashlib.sha1()
+        for c in sorted(self.categories):
+            h.update(c.encode())
+            h.update("\x1f".join(self.categories[c]).encode())
+        return h.hexdigest()[:12]
+
+    def transform_column(self, column, values):
+        """Kode int32 untuk satu kolom; nilai asing/kosong → UNKNOWN_CODE."""
+        dtype = self._dtypes[column]
+        values = pd.Series(values)
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(str)
+        codes = pd.Categorical(values, dtype=dtype).codes
+        return codes.astype(np.int32)
+
+    def transform(self, df, columns=None):
+        """Salinan df dengan kolom kategori diganti kodenya."""
+        out = df.copy(deep=False)
+        for c in columns or [c for c in self.columns if c in df.columns]:
+            out[c] = self.transform_column(c, df[c])
+        return out
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({"categories": self.categories}, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        return cls(joblib.load(path)["categories"])
+
+
+def encoder_path(model_dir=None):
+    from dtsen.models import MODEL_DIR
+
+    return os.path.join(model_dir or MODEL_DIR, "encoders.joblib")
+
+
+def build_encoder(model_dir=None):
+    encoder = CategoryEncoder.fit(load_dataset("dtsen_clean_padangpanjang.csv"))
+    encoder.save(encoder_path(model_dir))
+    return encoder
+
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_dir=None):
+    """Encoder tersimpan (dimuat sekali per proses); dibangun jika belum ada."""
+    path = encoder_path(model_dir)
+    if not os.path.exists(path):
+        build_encoder(model_dir)
+    mtime = os.stat(path).st_mtime_ns
+    with _encoders_lock:
+        cached = _encoders.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    encoder = CategoryEncoder.load(path)
+    with _encoders_lock:
+        _encoders[path] = (mtime, encoder)
+    return encoder
+
+
+def main(argv=None):
+    model_dir = argv[0] if argv else None
+    encoder = build_encoder(model_dir)
+    print(
+        f"✅ Encoder disimpan: {encoder_path(model_dir)} "
+        f"({len(encoder.columns)} kolom, versi {encoder.version})"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,158 @@
+"""Feature store rumah tangga DTSEN dengan kunci nik_kepala_keluarga.
+
+Satu tabel dasar (register hasil cleaning) diurutkan berdasarkan NIK, lalu
+setiap keluaran model (skor, segmen, anomali, update tahunan) ditambahkan
+sebagai "family" kolom yang sejajar dengan tabel dasar. Family bersifat
+append-only: kolom yang sudah ada tidak bisa ditimpa. Pembacaan langsung
+merangkai array yang sudah sejajar, tanpa merge, sehingga memori bertambah
+per kolom skor, bukan per salinan register.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dtsen.instrument import span
+from dtsen.loader import NIK_COL, dataset_columns, dataset_version, load_dataset
+
+# Family bawaan: file sumber → kolom yang disimpan
+DEFAULT_FAMILIES = {
+    "scores": ("dtsen_with_scores.csv", ["risk_score", "stunting_risk_score", "cluster"]),
+    "segments": ("dtsen_with_segments.csv", ["socio_segment", "socio_segment_label"]),
+    "anomalies": ("dtsen_with_anomalies.csv", ["anomaly", "anomaly_label"]),
+    "update_2026": ("dtsen_update_2026.csv", ["risk_score_after", "stunting_risk_score_after"]),
+}
+BASE_FILE = "dtsen_with_scores.csv"
+
+
+def _empty_like(values, n):
+    """Array kosong sepanjang n untuk NIK yang tidak punya nilai."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.full(n, -1), dtype=values.dtype)
+    if values.dtype.kind in "iub":
+        return np.full(n, np.nan)  # int/bool dengan nilai kosong → float
+    if values.dtype.kind == "f":
+        return np.full(n, np.nan, dtype=values.dtype)
+    return np.full(n, None, dtype=object)
+
+
+class FeatureStore:
+    def __init__(self, base, key=NIK_COL):
+        if base[key].duplicated().any():
+            raise ValueError(f"Tabel dasar memiliki {key} duplikat")
+        self.key = key
+        self._base = base.sort_values(key, kind="stable").reset_index(drop=True)
+        self._keys = self._base[key].to_numpy()
+        self._columns = {}   # kolom → array sejajar dengan _base
+        self._families = {}  # nama family → daftar kolom
+
+    def __len__(self):
+        return len(self._base)
+
+    @property
+    def families(self):
+        return {k: list(v) for k, v in self._families.items()}
+
+    @property
+    def columns(self):
+        return list(self._base.columns) + list(self._columns)
+
+    def positions(self, niks):
+        """Posisi baris untuk daftar NIK (binary search di indeks terurut)."""
+        niks = np.asarray(niks)
+        pos = np.searchsorted(self._keys, niks)
+        pos_clip = np.minimum(pos, len(self._keys) - 1)
+        found = (pos < len(self._keys)) & (self._keys[pos_clip] == niks)
+        return pos_clip, found
+
+    def add_family(self, name, frame, columns=None):
+        """Tambahkan family kolom dari frame yang berisi kolom NIK."""
+        if name in self._families:
+            raise ValueError(f"Family '{name}' sudah ada")
+        columns = columns or [c for c in frame.columns if c != self.key]
+        clash = [c for c in columns if c in self._columns or c in self._base.columns]
+        if clash:
+            raise ValueError(f"Kolom sudah ada di feature store: {clash}")
+
+        dup = frame[self.key].duplicated()
+        if dup.any():
+            raise ValueError(f"{int(dup.sum())} {self.key} duplikat di family '{name}'")
+
+        pos, found = self.positions(frame[self.key].to_numpy())
+        if not found.all():
+            raise ValueError(
+                f"{int((~found).sum())} NIK di family '{name}' tidak ada di tabel dasar"
+            )
+
+        n = len(self._keys)
+        aligned = np.arange(len(pos))
+        # Jalur cepat: urutan NIK sama persis dengan tabel dasar
+        same_order = len(pos) == n and np.array_equal(pos, np.arange(n))
+        for c in columns:
+            values = frame[c].array if isinstance(frame[c].dtype, pd.CategoricalDtype) \
+                else frame[c].to_numpy()
+            if same_order:
+                self._columns[c] = values
+                continue
+            out = _empty_like(values, n) if len(pos) < n else None
+            if out is None:
+                order = np.empty(n, dtype=np.int64)
+                order[pos] = aligned
+                self._columns[c] = values[order]
+            else:
+                out[pos] = values
+                self._columns[c] = out
+        self._families[name] = list(columns)
+
+    def read(self, columns=None):
+        """Satu frame sejajar (urut NIK) berisi kolom dasar + family."""
+        columns = columns or self.columns
+        data = {}
+        for c in columns:
+            if c in self._columns:
+                data[c] = self._columns[c]
+            elif c in self._base.columns:
+                data[c] = self._base[c]
+            else:
+                raise KeyError(c)
+        return pd.DataFrame(data, copy=False)
+
+    def memory_usage(self):
+        """Byte per bagian: tabel dasar dan tiap family."""
+        usage = {"base": int(self._base.memory_usage(deep=True).sum())}
+        for name, cols in self._families.items():
+            usage[name] = int(sum(pd.Series(self._columns[c]).memory_usage(deep=True) for c in cols))
+        return usage
+
+
+_store_cache = {}
+_store_lock = threading.Lock()
+
+
+def build_default_store():
+    """Bangun feature store dari keluaran notebook yang ada di repo."""
+    family_cols = {c for _, cols in DEFAULT_FAMILIES.values() for c in cols}
+    base_cols = [c for c in dataset_columns(BASE_FILE) if c not in family_cols]
+    store = FeatureStore(load_dataset(BASE_FILE, columns=base_cols))
+    for name, (path, cols) in DEFAULT_FAMILIES.items():
+        store.add_family(name, load_dataset(path, columns=[NIK_COL] + cols), cols)
+    return store
+
+
+def feature_store_version():
+    """Versi gabungan semua file sumber feature store bawaan."""
+    return tuple(dataset_version(p) for p, _ in DEFAULT_FAMILIES.values())
+
+
+def get_feature_store():
+    """Feature store bawaan, dibangun ulang hanya jika file sumber berubah."""
+    version = feature_store_version()
+    with _store_lock:
+        cached = _store_cache.get("default")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    with span("feature_store_build"):
+        store = build_default_store()
+    with _store_lock:
+        _store_cache["default"] = (version, store)
+    return store
@@ -0,0 +1,256 @@
+"""Runner forecast penduduk per kelurahan (Prophet) dengan cache fit.
+
+Versi skrip dari sel Prophet di Forecast_Migrasi_&_Pertumbuhan_Penduduk_Kota.ipynb:
+setiap kelurahan di-fit di process pool, dan hasil fit disimpan di cache
+dengan kunci hash deret waktunya. Kelurahan yang datanya tidak berubah
+dilewati pada run berikutnya. Keluaran per kelurahan dan agregat kota
+ditulis dalam satu kali jalan, dengan format yang sama seperti file CSV
+yang dipakai app.py.
+
+    python -m dtsen.forecasting                       # pakai file bawaan repo
+    python -m dtsen.forecasting --backend fast        # tanpa Prophet
+
+Backend "prophet" membutuhkan paket `prophet` (tidak dipakai oleh
+dashboard). Backend "fast" adalah regresi tren linear + musiman tahunan
+(deret Fourier) yang di-fit untuk semua kelurahan sekaligus sebagai satu
+matriks NumPy; cocok untuk deret bulanan yang halus seperti data kita.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import DATA_DIR
+
+TS_FILE = "ts_penduduk_kelurahan_2019_2025.csv"
+FORECAST_KEL_FILE = "forecast_penduduk_prophet_5y.csv"
+FORECAST_CITY_FILE = "forecast_penduduk_kota_5y.csv"
+HIST_CITY_FILE = "hist_penduduk_kota.csv"
+
+CACHE_DIR = os.environ.get(
+    "DTSEN_FORECAST_CACHE", os.path.join(DATA_DIR, "models", "prophet_cache")
+)
+
+# Parameter Prophet, sama dengan notebook
+PROPHET_PARAMS = {
+    "yearly_seasonality": True,
+    "weekly_seasonality": False,
+    "daily_seasonality": False,
+    "seasonality_mode": "additive",
+    "interval_width": 0.9,
+}
+
+OUTPUT_COLS = ["ds", "kelurahan", "yhat", "yhat_lower", "yhat_upper"]
+
+
+def series_hash(df_k, horizon_months, params=PROPHET_PARAMS):
+    """Hash isi deret (ds, y) + parameter; berubah jika data/setting berubah."""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df_k[["ds", "y"]], index=False).to_numpy().tobytes())
+    h.update(json.dumps({"horizon": horizon_months, **params}, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def _cache_file(cache_dir, kelurahan, key):
+    safe = "".join(ch if ch.isalnum() else "_" for ch in kelurahan)
+    return os.path.join(cache_dir, f"{safe}_{key}.joblib")
+
+
+def fit_prophet(df_k, kelurahan, horizon_months=60, params=PROPHET_PARAMS):
+    """Fit satu kelurahan; kembalikan (forecast, model dalam JSON)."""
+    import logging
+
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    m = Prophet(**params)
+    m.fit(df_k)
+    future = m.make_future_dataframe(periods=horizon_months, freq="MS")
+    fcst = m.predict(future)
+    fcst["kelurahan"] = kelurahan
+    return fcst[OUTPUT_COLS], model_to_json(m)
+
+
+def _fit_and_cache(df_k, kelurahan, horizon_months, cache_path):
+    fcst, model_json = fit_prophet(df_k, kelurahan, horizon_months)
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        joblib.dump({"forecast": fcst, "model_json": model_json}, cache_path)
+    return fcst
+
+
+def split_series(ts):
+    """Pecah data panjang (date, kelurahan, population) → {kelurahan: df(ds, y)}."""
+    ts = ts[["date", "kelurahan", "population"]].rename(columns={"date": "ds", "population": "y"})
+    ts["ds"] = pd.to_datetime(ts["ds"])
+    return {
+        str(kel): g[["ds", "y"]].sort_values("ds").reset_index(drop=True)
+        for kel, g in ts.groupby("kelurahan", observed=True, sort=True)
+    }
+
+
+def _fourier_design(dates, start, fourier_order):
+    """Matriks desain: intercept, tren (tahun sejak awal), sin/cos tahunan."""
+    dates = pd.DatetimeIndex(dates)
+    t = ((dates.year - start.year) * 12 + (dates.month - start.month)) / 12.0
+    phase = 2 * np.pi * (dates.dayofyear.to_numpy() - 1) / 365.25
+    cols = [np.ones(len(dates)), np.asarray(t, dtype=float)]
+    for k in range(1, fourier_order + 1):
+        cols += [np.sin(k * phase), np.cos(k * phase)]
+    return np.column_stack(cols)
+
+
+def forecast_fast(ts, horizon_months=60, interval_width=0.9, fourier_order=3):
+    """Forecast semua kelurahan dengan satu least squares matriks.
+
+    Skema keluaran sama dengan Prophet: baris historis + horizon untuk
+    setiap kelurahan, kolom ds, kelurahan, yhat, yhat_lower, yhat_upper.
+    Interval prediksi memakai sigma residual per kelurahan dan leverage
+    titik (melebar untuk horizon yang lebih jauh).
+    """
+    series = split_series(ts)
+    names = list(series)
+    wide = pd.concat({k: v.set_index("ds")["y"] for k, v in series.items()}, axis=1).sort_index()
+    hist_dates = wide.index
+    future_dates = pd.date_range(hist_dates[-1], periods=horizon_months + 1, freq="MS")[1:]
+    all_dates = hist_dates.append(future_dates)
+
+    X = _fourier_design(hist_dates, hist_dates[0], fourier_order)
+    X_all = _fourier_design(all_dates, hist_dates[0], fourier_order)
+    Y = wide.to_numpy(dtype=float)
+    n_obs, n_par = X.shape
+
+    coef = np.empty((n_par, len(names)))
+    sigma = np.empty(len(names))
+    complete = ~np.isnan(Y).any(axis=0)
+    # Deret lengkap: satu lstsq untuk semua kolom sekaligus
+    if complete.any():
+        coef[:, complete] = np.linalg.lstsq(X, Y[:, complete], rcond=None)[0]
+        resid = Y[:, complete] - X @ coef[:, complete]
+        sigma[complete] = np.sqrt((resid ** 2).sum(axis=0) / max(n_obs - n_par, 1))
+    # Deret dengan bulan kosong (jarang): fit per kolom pada baris yang ada
+    for j in np.flatnonzero(~complete):
+        ok = ~np.isnan(Y[:, j])
+        coef[:, j] = np.linalg.lstsq(X[ok], Y[ok, j], rcond=None)[0]
+        resid = Y[ok, j] - X[ok] @ coef[:, j]
+        sigma[j] = np.sqrt((resid ** 2).sum() / max(ok.sum() - n_par, 1))
+
+    yhat = X_all @ coef
+    xtx_inv = np.linalg.pinv(X.T @ X)
+    leverage = np.einsum("ij,jk,ik->i", X_all, xtx_inv, X_all)
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2)
+    band = z * np.sqrt(1 + leverage)[:, None] * sigma[None, :]
+
+    n_dates = len(all_dates)
+    return pd.DataFrame({
+        "ds": np.tile(all_dates.to_numpy(), len(names)),
+        "kelurahan": np.repeat(names, n_dates),
+        "yhat": yhat.T.ravel(),
+        "yhat_lower": (yhat - band).T.ravel(),
+        "yhat_upper": (yhat + band).T.ravel(),
+    })
+
+
+def forecast_all(ts, horizon_months=60, workers=None, cache_dir=CACHE_DIR, backend="prophet"):
+    """Forecast semua kelurahan; kembalikan (forecast gabungan, ringkasan run)."""
+    if backend == "fast":
+        start = time.perf_counter()
+        fcst = forecast_fast(ts, horizon_months)
+        report = {
+            "kelurahan": fcst["kelurahan"].nunique(),
+            "fitted": fcst["kelurahan"].nunique(),
+            "cached": 0,
+            "fit_seconds": time.perf_counter() - start,
+        }
+        return fcst, report
+    if backend != "prophet":
+        raise ValueError(f"Backend tidak dikenal: {backend!r}")
+
+    series = split_series(ts)
+    results, todo = {}, []
+    for kel, df_k in series.items():
+        path = _cache_file(cache_dir, kel, series_hash(df_k, horizon_months)) if cache_dir else None
+        if path and os.path.exists(path):
+            results[kel] = joblib.load(path)["forecast"]
+        else:
+            todo.append((kel, df_k, path))
+
+    start = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if todo and workers > 1:
+        with ProcessPoolExecutor(min(workers, len(todo))) as pool:
+            futures = {kel: pool.submit(_fit_and_cache, df_k, kel, horizon_months, path)
+                       for kel, df_k, path in todo}
+            for kel, fut in futures.items():
+                results[kel] = fut.result()
+    else:
+        for kel, df_k, path in todo:
+            results[kel] = _fit_and_cache(df_k, kel, horizon_months, path)
+
+    fcst = pd.concat([results[k] for k in series], ignore_index=True)
+    report = {
+        "kelurahan": len(series),
+        "fitted": len(todo),
+        "cached": len(series) - len(todo),
+        "fit_seconds": time.perf_counter() - start,
+    }
+    return fcst, report
+
+
+def city_aggregates(ts, fcst):
+    """Agregat kota: historis (period, population) & forecast (period, yhat)."""
+    hist_city = ts.groupby("date")["population"].sum().reset_index(name="population")
+    fcst_city = fcst.groupby("ds")["yhat"].sum().reset_index(name="yhat")
+    hist_city = hist_city.rename(columns={"date": "period"})
+    fcst_city = fcst_city.rename(columns={"ds": "period"})
+    return hist_city, fcst_city
+
+
+def _date_str(df, col):
+    df = df.copy()
+    df[col] = pd.to_datetime(df[col]).dt.strftime("%Y-%m-%d")
+    return df
+
+
+def run(ts_path=None, out_dir=None, horizon_months=60, workers=None, cache_dir=CACHE_DIR,
+        backend="prophet"):
+    """Forecast + tulis ketiga file keluaran sekaligus."""
+    out_dir = out_dir or DATA_DIR
+    ts = pd.read_csv(ts_path or os.path.join(DATA_DIR, TS_FILE))
+    fcst, report = forecast_all(ts, horizon_months, workers, cache_dir, backend)
+    hist_city, fcst_city = city_aggregates(ts, fcst)
+
+    _date_str(fcst, "ds").to_csv(os.path.join(out_dir, FORECAST_KEL_FILE), index=False)
+    _date_str(fcst_city, "period").to_csv(os.path.join(out_dir, FORECAST_CITY_FILE), index=False)
+    hist_city.to_csv(os.path.join(out_dir, HIST_CITY_FILE), index=False)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Forecast penduduk per kelurahan")
+    parser.add_argument("--ts", default=None, help=f"default: {TS_FILE}")
+    parser.add_argument("--out-dir", default=None)
+    parser.add_argument("--horizon", type=int, default=60, help="bulan ke depan")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--backend", choices=["prophet", "fast"], default="prophet")
+    args = parser.parse_args(argv)
+
+    report = run(args.ts, args.out_dir, args.horizon, args.workers,
+                 None if args.no_cache else CACHE_DIR, args.backend)
+    print(
+        f"✅ Forecast {report['kelurahan']} kelurahan: {report['fitted']} di-fit, "
+        f"{report['cached']} dari cache ({report['fit_seconds']:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
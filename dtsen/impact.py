@@ -0,0 +1,501 @@
+"""Snapshot skor multi-tahun sebagai delta kolumnar per NIK (monitoring dampak).
+
+Tahun pertama disimpan utuh (satu array per kolom skor). Setiap tahun
+berikutnya hanya menyimpan rumah tangga yang skornya berubah dibanding
+tahun sebelumnya: posisi baris (terurut) + nilai baru, per kolom skor.
+Rumah tangga yang hilang dari snapshot tercatat sebagai NaN; NIK baru
+ditambahkan ke ujung indeks.
+
+Query dampak antara dua tahun mana pun hanya menyentuh baris yang berubah
+di antara kedua tahun itu. Nilai tahun y untuk baris tersebut diperoleh
+dengan menerapkan delta berurutan. Rumah tangga yang tidak berubah cukup
+dihitung dari jumlah per kelurahan per tahun. Tidak ada merge dua register
+dan tidak ada salinan register penuh. Kelurahan rumah tangga mengikuti
+snapshot terakhirnya.
+
+Di disk store berupa dua file Parquet (zstd) di IMPACT_DIR: base.parquet
+(NIK, kelurahan, nilai tahun dasar) dan deltas.parquet (tahun, kolom, NIK,
+nilai). Snapshot tahun tambahan didaftarkan di snapshots.json di direktori
+yang sama, sehingga CLI dan dashboard membaca registry yang sama.
+
+    python -m dtsen.impact                      # bangun dari registry
+    python -m dtsen.impact 2027=dtsen_2027.csv  # daftarkan + bangun ulang
+"""
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dtsen.banding import CHANGE_LABELS, band_change
+from dtsen.loader import DATA_DIR, NIK_COL, dataset_version, load_dataset
+
+SCORE_COLS = ["risk_score", "stunting_risk_score"]
+# Snapshot bawaan: tahun → (file, {kolom di file: kolom skor})
+SNAPSHOTS = {
+    2025: ("dtsen_with_scores.csv", {"risk_score": "risk_score",
+                                     "stunting_risk_score": "stunting_risk_score"}),
+    2026: ("dtsen_update_2026.csv", {"risk_score_after": "risk_score",
+                                     "stunting_risk_score_after": "stunting_risk_score"}),
+}
+IMPACT_DIR = os.path.join(DATA_DIR, "models", "impact")
+REGISTRY_FILE = "snapshots.json"
+_META_KEY = b"dtsen_impact"
+DENSE_FRACTION = 8  # > 1/8 baris diminta → rekonstruksi kolom penuh
+
+
+class DeltaStore:
+    def __init__(self, columns=SCORE_COLS, key=NIK_COL):
+        self.key = key
+        self.columns = list(columns)
+        self.years = []
+        self._keys = np.empty(0, dtype=np.int64)   # NIK per posisi (urutan masuk)
+        self._order = np.empty(0, dtype=np.int64)  # argsort _keys untuk lookup
+        self._kel = np.empty(0, dtype=np.int32)    # kode kelurahan terakhir
+        self._kel_names = []
+        self._base = {c: np.empty(0) for c in self.columns}
+        self._deltas = {}   # tahun → {kolom: (posisi int32 terurut, nilai)}
+        self._present = {}  # tahun → {kolom: jumlah non-NaN per kelurahan}
+        self._pairs = {}    # memo _pair per (kolom, y0, y1), dikosongkan saat append
+
+    def __len__(self):
+        return len(self._keys)
+
+    # --------------------------------------------------------------- tulis
+    def positions(self, niks):
+        """Posisi baris untuk NIK (-1 jika belum ada)."""
+        niks = np.asarray(niks, dtype=np.int64)
+        if not len(self._keys):
+            return np.full(len(niks), -1, dtype=np.int64)
+        sorted_keys = self._keys[self._order]
+        idx = np.minimum(np.searchsorted(sorted_keys, niks), len(sorted_keys) - 1)
+        return np.where(sorted_keys[idx] == niks, self._order[idx], -1)
+
+    def _kel_codes(self, kelurahan):
+        """Kode kelurahan store (kategori baru ditambahkan), -1 untuk kosong."""
+        cat = pd.Categorical(kelurahan)
+        names = [str(v) for v in cat.categories]
+        known = set(self._kel_names)
+        self._kel_names.extend(v for v in names if v not in known)
+        lookup = np.append(pd.Index(self._kel_names).get_indexer(names), -1).astype(np.int32)
+        return lookup[np.asarray(cat.codes)]  # kode -1 → elemen terakhir (-1)
+
+    def append(self, year, frame, columns=None):
+        """Tambahkan snapshot satu tahun (frame berisi NIK, kelurahan, kolom skor).
+
+        `columns` memetakan kolom di frame → kolom skor (default: nama sama).
+        """
+        if self.years and year <= self.years[-1]:
+            raise ValueError(f"Tahun harus naik: {year} ≤ {self.years[-1]}")
+        columns = columns or {c: c for c in self.columns}
+        niks = frame[self.key].to_numpy(dtype=np.int64)
+        if (np.diff(np.sort(niks)) == 0).any():
+            raise ValueError(f"Snapshot {year} memiliki {self.key} duplikat")
+
+        pos = self.positions(niks)
+        fresh = pos < 0
+        if fresh.any():
+            n_old, n_new = len(self._keys), int(fresh.sum())
+            pos[fresh] = np.arange(n_old, n_old + n_new)
+            self._keys = np.concatenate([self._keys, niks[fresh]])
+            self._order = np.argsort(self._keys, kind="stable")
+            self._kel = np.concatenate([self._kel, np.full(n_new, -1, dtype=np.int32)])
+            for c in self.columns:
+                self._base[c] = np.concatenate([self._base[c], np.full(n_new, np.nan)])
+        kel = self._kel_codes(frame["kelurahan"])
+        moved = (self._kel[pos] != kel) & (self._kel[pos] >= 0)
+        self._kel[pos] = kel
+
+        n = len(self._keys)
+        first = not self.years
+        present = {}
+        for src, c in columns.items():
+            new = np.full(n, np.nan)
+            new[pos] = frame[src].to_numpy(dtype=float)
+            if first:
+                self._base[c] = new
+            else:
+                cur = self._column_at(c, self.years[-1])
+                changed = ~((new == cur) | (np.isnan(new) & np.isnan(cur)))
+                rows = np.flatnonzero(changed).astype(np.int32)
+                self._deltas.setdefault(year, {})[c] = (rows, new[rows])
+            present[c] = self._count(new)
+        self._deltas.setdefault(year, {})
+        self.years.append(year)
+        self._pairs.clear()
+        if moved.any():
+            self._recount()  # jumlah per kelurahan mengikuti kelurahan terakhir
+        else:
+            self._present[year] = present
+
+    def _count(self, values):
+        ok = ~np.isnan(values) & (self._kel >= 0)
+        return np.bincount(self._kel[ok], minlength=len(self._kel_names))
+
+    def _column_at(self, column, year):
+        """Satu kolom penuh pada tahun `year` (tahun dasar + delta berurutan)."""
+        values = self._base[column].copy()
+        for y in self.years[1:self.years.index(year) + 1]:
+            if column in self._deltas[y]:
+                d_rows, d_vals = self._deltas[y][column]
+                values[d_rows] = d_vals
+        return values
+
+    def _recount(self):
+        """Hitung ulang jumlah per kelurahan semua tahun dengan memutar ulang delta."""
+        values = {c: self._base[c].copy() for c in self.columns}
+        for year in self.years:
+            for c, (rows, new) in self._deltas[year].items():
+                values[c][rows] = new
+            self._present[year] = {c: self._count(values[c]) for c in self.columns}
+
+    # -------------------------------------------------------------- query
+    def _check(self, column, *years):
+        if column not in self.columns:
+            raise KeyError(column)
+        for y in years:
+            if y not in self._deltas:
+                raise KeyError(f"Tahun {y} tidak ada di store ({self.years})")
+
+    def values_at(self, column, year, rows):
+        """Nilai `column` pada tahun `year` untuk posisi `rows` (terurut)."""
+        self._check(column, year)
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) * DENSE_FRACTION > len(self._keys):
+            # Sebagian besar baris diminta: satu kolom penuh + scatter delta lebih murah
+            return self._column_at(column, year)[rows]
+        out = self._base[column][rows]
+        for y in self.years[1:self.years.index(year) + 1]:
+            d_rows, d_vals = self._deltas[y].get(column, (np.empty(0, np.int32), np.empty(0)))
+            idx = np.searchsorted(d_rows, rows)
+            hit = idx < len(d_rows)
+            hit[hit] = d_rows[idx[hit]] == rows[hit]
+            out[hit] = d_vals[idx[hit]]
+        return out
+
+    def _changed_rows(self, column, y0, y1):
+        i0, i1 = self.years.index(y0), self.years.index(y1)
+        mask = np.zeros(len(self._keys), dtype=bool)
+        for y in self.years[i0 + 1:i1 + 1]:
+            if column in self._deltas[y]:
+                mask[self._deltas[y][column][0]] = True
+        return np.flatnonzero(mask)
+
+    def _pair(self, column, y0, y1):
+        """(baris berubah, nilai y0, nilai y1, jumlah tetap per kelurahan di luar baris itu)."""
+        self._check(column, y0, y1)
+        if y1 < y0:
+            raise ValueError("y1 harus ≥ y0")
+        memo = self._pairs.get((column, y0, y1))
+        if memo is not None:
+            return memo
+        rows = self._changed_rows(column, y0, y1)
+        v0 = self.values_at(column, y0, rows)
+        v1 = self.values_at(column, y1, rows)
+        # Baris di luar `rows` punya nilai & keberadaan yang sama di y0 dan y1
+        present0 = np.zeros(len(self._kel_names), dtype=np.int64)
+        base_count = self._present[y0][column]
+        present0[:len(base_count)] = base_count
+        ok0 = ~np.isnan(v0) & (self._kel[rows] >= 0)
+        outside = present0 - np.bincount(self._kel[rows][ok0], minlength=len(self._kel_names))
+        both = ~np.isnan(v0) & ~np.isnan(v1)
+        memo = self._pairs[(column, y0, y1)] = (rows[both], v0[both], v1[both], outside)
+        return memo
+
+    def changes(self, column, y0, y1, include_unchanged=False):
+        """Frame rumah tangga yang nilainya berubah antara y0 dan y1 (NIK, kelurahan, sebelum, sesudah, delta).
+
+        include_unchanged=True juga menyertakan baris yang berubah lalu kembali
+        ke nilai semula (delta 0) di antara kedua tahun.
+        """
+        rows, v0, v1, _ = self._pair(column, y0, y1)
+        delta = v1 - v0
+        if not include_unchanged:
+            keep = delta != 0
+            rows, v0, v1, delta = rows[keep], v0[keep], v1[keep], delta[keep]
+        kel = pd.Categorical.from_codes(self._kel[rows], categories=self._kel_names)
+        return pd.DataFrame({
+            self.key: self._keys[rows],
+            "kelurahan": kel,
+            f"{column}_{y0}": v0,
+            f"{column}_{y1}": v1,
+            "delta": delta,
+        })
+
+    def delta_distribution(self, column, y0, y1, bins=20):
+        """Ringkasan delta: jumlah per status, statistik, dan histogram delta ≠ 0."""
+        rows, v0, v1, outside = self._pair(column, y0, y1)
+        delta = v1 - v0
+        n_zero = int(outside.sum()) + int((delta == 0).sum())
+        n = n_zero + int((delta != 0).sum())
+        nonzero = delta[delta != 0]
+        counts, edges = np.histogram(nonzero, bins=bins) if len(nonzero) else (np.zeros(0, int), np.zeros(1))
+        return {
+            "n": n,
+            "status": dict(zip(CHANGE_LABELS, [int((nonzero < 0).sum()), n_zero, int((nonzero > 0).sum())])),
+            "mean": float(delta.sum() / n) if n else float("nan"),
+            "min": float(delta.min()) if len(delta) else 0.0,
+            "max": float(delta.max()) if len(delta) else 0.0,
+            "hist_counts": counts,
+            "hist_edges": edges,
+        }
+
+    def delta_values(self, column, y0, y1):
+        """Array delta semua rumah tangga yang ada di kedua tahun (nol untuk yang tetap)."""
+        rows, v0, v1, outside = self._pair(column, y0, y1)
+        return np.concatenate([v1 - v0, np.zeros(int(outside.sum()))])
+
+    def kelurahan_summary(self, column, y0, y1):
+        """Per kelurahan: jumlah Membaik/Tetap/Memburuk dan rata-rata delta."""
+        rows, v0, v1, outside = self._pair(column, y0, y1)
+        delta = v1 - v0
+        kel = self._kel[rows]
+        ok = kel >= 0
+        size = len(self._kel_names)
+        status = np.asarray(band_change(delta[ok]).codes)
+        counts = np.zeros((size, len(CHANGE_LABELS)), dtype=np.int64)
+        np.add.at(counts, (kel[ok], status), 1)
+        counts[:, CHANGE_LABELS.index("Tetap")] += outside
+        total = counts.sum(axis=1)
+        out = pd.DataFrame(counts, columns=list(CHANGE_LABELS), index=pd.Index(self._kel_names, name="kelurahan"))
+        out["jumlah"] = total
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["delta_mean"] = np.bincount(kel[ok], weights=delta[ok], minlength=size) / total
+        return out[total > 0].sort_index()
+
+    def top_movers(self, column, y0, y1, n=20, direction="membaik"):
+        """n rumah tangga dengan perubahan terbesar (membaik = delta paling negatif)."""
+        frame = self.changes(column, y0, y1)
+        delta = frame["delta"].to_numpy()
+        sign = 1 if direction == "membaik" else -1
+        keep = sign * delta < 0
+        idx = np.flatnonzero(keep)
+        if n < len(idx):
+            idx = idx[np.argpartition(sign * delta[idx], n - 1)[:n]]
+        idx = idx[np.argsort(sign * delta[idx], kind="stable")]
+        return frame.iloc[idx].reset_index(drop=True)
+
+    def yearly_summary(self, column):
+        """Deret tahunan: jumlah rumah tangga, rata-rata skor, dan perubahan dari tahun sebelumnya."""
+        self._check(column)
+        values = self._base[column]
+        total, count = float(np.nansum(values)), int((~np.isnan(values)).sum())
+        rows = []
+        for i, year in enumerate(self.years):
+            status = dict.fromkeys(CHANGE_LABELS, None)
+            if i:
+                prev = self.years[i - 1]
+                r, v_prev = self._deltas[year].get(column, (np.empty(0, np.int32), np.empty(0)))
+                old = self.values_at(column, prev, r)
+                # Jumlah & total diperbarui dari delta saja
+                total += float(np.nansum(v_prev) - np.nansum(old))
+                count += int((~np.isnan(v_prev)).sum() - (~np.isnan(old)).sum())
+                dist = self.delta_distribution(column, prev, year)
+                status = dist["status"]
+            rows.append({"tahun": year, "jumlah": count, f"{column}_mean": total / count if count else np.nan,
+                         **status})
+        out = pd.DataFrame(rows)
+        out[list(CHANGE_LABELS)] = out[list(CHANGE_LABELS)].astype("Int64")
+        return out
+
+    def memory_usage(self):
+        """Byte: indeks (NIK + kelurahan), tahun dasar, dan delta per tahun."""
+        usage = {"indeks": int(self._keys.nbytes + self._order.nbytes + self._kel.nbytes),
+                 "dasar": int(sum(v.nbytes for v in self._base.values()))}
+        for year in self.years[1:]:
+            usage[str(year)] = int(sum(r.nbytes + v.nbytes for r, v in self._deltas[year].values()))
+        return usage
+
+    # -------------------------------------------------------------- disk
+    def save(self, directory=IMPACT_DIR, version=None):
+        os.makedirs(directory, exist_ok=True)
+        meta = json.dumps({"columns": self.columns, "years": self.years, "key": self.key,
+                           "version": version}, default=str)
+        base = pa.table({
+            self.key: self._keys,
+            "kelurahan": pa.DictionaryArray.from_arrays(
+                pa.array(self._kel, mask=self._kel < 0), pa.array(self._kel_names, pa.string())),
+            **{c: self._base[c] for c in self.columns},
+        }).replace_schema_metadata({_META_KEY: meta})
+        pq.write_table(base, os.path.join(directory, "base.parquet"), compression="zstd")
+
+        parts = [(y, c, r, v) for y in self.years[1:] for c, (r, v) in self._deltas[y].items()]
+        deltas = pa.table({
+            "tahun": pa.array(np.concatenate([np.full(len(r), y, np.int16) for y, _, r, _ in parts])
+                              if parts else np.empty(0, np.int16)),
+            "kolom": pa.array([c for _, c, r, _ in parts for _ in range(len(r))], pa.string()).dictionary_encode(),
+            self.key: pa.array(np.concatenate([self._keys[r] for _, _, r, _ in parts])
+                               if parts else np.empty(0, np.int64)),
+            "nilai": pa.array(np.concatenate([v for *_, v in parts]) if parts else np.empty(0)),
+        })
+        pq.write_table(deltas, os.path.join(directory, "deltas.parquet"), compression="zstd")
+
+    @classmethod
+    def load(cls, directory=IMPACT_DIR):
+        """Baca store dari disk; kembalikan (store, versi sumber yang tersimpan)."""
+        base = pq.read_table(os.path.join(directory, "base.parquet"))
+        meta = json.loads(base.schema.metadata[_META_KEY])
+        store = cls(meta["columns"], meta["key"])
+        frame = base.to_pandas()
+        store._keys = frame[store.key].to_numpy(dtype=np.int64)
+        store._order = np.argsort(store._keys, kind="stable")
+        kel = frame["kelurahan"].astype("category")
+        store._kel_names = [str(v) for v in kel.cat.categories]
+        store._kel = kel.cat.codes.to_numpy().astype(np.int32)
+        store._base = {c: frame[c].to_numpy(dtype=float) for c in store.columns}
+        store.years = list(meta["years"])
+
+        deltas = pq.read_table(os.path.join(directory, "deltas.parquet")).to_pandas()
+        store._deltas = {year: {} for year in store.years}
+        for (year, c), g in deltas.groupby(["tahun", "kolom"], observed=True, sort=False):
+            rows = store.positions(g[store.key].to_numpy())
+            order = np.argsort(rows, kind="stable")
+            store._deltas[int(year)][str(c)] = (rows[order].astype(np.int32),
+                                                g["nilai"].to_numpy(dtype=float)[order])
+        store._recount()
+        return store, meta["version"]
+
+
+def _snapshot_frame(path, mapping):
+    return load_dataset(path, columns=[NIK_COL, "kelurahan", *mapping])
+
+
+def build_store(snapshots=SNAPSHOTS):
+    store = DeltaStore()
+    for year in sorted(snapshots):
+        path, mapping = snapshots[year]
+        store.append(year, _snapshot_frame(path, mapping), mapping)
+    return store
+
+
+def load_registry(directory=IMPACT_DIR):
+    """Snapshot bawaan + snapshot yang didaftarkan lewat CLI (snapshots.json)."""
+    snapshots = dict(SNAPSHOTS)
+    path = os.path.join(directory, REGISTRY_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            for year, (src, mapping) in json.load(f).items():
+                snapshots[int(year)] = (src, mapping)
+    return snapshots
+
+
+def register_snapshots(extra, directory=IMPACT_DIR):
+    """Tambahkan {tahun: (file, {kolom file: kolom skor})} ke registry di disk."""
+    path = os.path.join(directory, REGISTRY_FILE)
+    registry = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            registry = json.load(f)
+    registry.update({str(year): [src, mapping] for year, (src, mapping) in extra.items()})
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(registry, f, indent=2, sort_keys=True)
+
+
+def _source_version(path):
+    try:
+        return dataset_version(path)
+    except FileNotFoundError:
+        return None
+
+
+def impact_version(snapshots=SNAPSHOTS):
+    """Versi per snapshot; None untuk file sumber yang sudah tidak ada."""
+    return tuple((year, path, _source_version(path)) for year, (path, _) in sorted(snapshots.items()))
+
+
+_store_cache = {}
+_store_lock = threading.Lock()
+
+
+def get_impact_store(directory=IMPACT_DIR):
+    """Delta store untuk semua snapshot di registry (bawaan + yang didaftarkan).
+
+    Urutan: cache proses → store di disk (jika versinya cocok) → dibangun
+    dari file snapshot lalu disimpan. Store di disk tidak pernah ditimpa
+    jika berisi tahun di luar registry atau jika ada file snapshot yang
+    sudah tidak tersedia (store itu satu-satunya salinan tahun tersebut).
+    """
+    snapshots = load_registry(directory)
+    version = impact_version(snapshots)
+    with _store_lock:
+        cached = _store_cache.get(directory)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    loaded = store = None
+    if os.path.exists(os.path.join(directory, "deltas.parquet")):
+        loaded, saved_version = DeltaStore.load(directory)
+        if saved_version == json.loads(json.dumps(version, default=str)):
+            store = loaded
+    if store is None:
+        missing = [path for _, path, v in version if v is None]
+        extra_years = loaded is not None and set(loaded.years) - set(snapshots)
+        if loaded is not None and (missing or extra_years):
+            store = loaded  # tidak bisa dibangun ulang utuh: pakai yang tersimpan
+        elif missing:
+            raise FileNotFoundError(f"Snapshot tidak ditemukan: {missing}")
+        else:
+            store = build_store(snapshots)
+            try:
+                store.save(directory, version)
+            except OSError:
+                pass  # direktori read-only: cukup pakai cache proses
+
+    with _store_lock:
+        _store_cache[directory] = (version, store)
+    return store
+
+
+_names_cache = {}
+_names_lock = threading.Lock()
+
+
+def household_names(niks, path="dtsen_with_scores.csv"):
+    """Nama kepala keluarga per NIK (None jika tidak terdaftar).
+
+    Hanya kolom NIK & nama yang dibaca dari register; NIK terurut di-cache
+    per versi file, jadi satu halaman cukup satu searchsorted.
+    """
+    version = dataset_version(path)
+    with _names_lock:
+        cached = _names_cache.get(path)
+    if cached is None or cached[0] != version:
+        df = load_dataset(path, columns=[NIK_COL, "nama_kepala_keluarga"])
+        keys = df[NIK_COL].to_numpy()
+        order = np.argsort(keys, kind="stable")
+        cached = (version, keys[order], df["nama_kepala_keluarga"].to_numpy(dtype=object)[order])
+        with _names_lock:
+            _names_cache[path] = cached
+    _, keys, names = cached
+    niks = np.asarray(niks, dtype=np.int64)
+    if not len(keys):
+        return np.full(len(niks), None, dtype=object)
+    pos = np.minimum(np.searchsorted(keys, niks), len(keys) - 1)
+    return np.where(keys[pos] == niks, names[pos], None)
+
+
+def main(argv=None, directory=IMPACT_DIR):
+    extra = {}
+    for arg in argv or []:
+        year, _, path = arg.partition("=")
+        extra[int(year)] = (os.path.abspath(path), {c: c for c in SCORE_COLS})
+    if extra:
+        register_snapshots(extra, directory)
+    snapshots = load_registry(directory)
+    store = build_store(snapshots)
+    store.save(directory, impact_version(snapshots))
+    size = sum(os.path.getsize(os.path.join(directory, f)) for f in ("base.parquet", "deltas.parquet"))
+    changed = {y: {c: len(r) for c, (r, _) in store._deltas[y].items()} for y in store.years[1:]}
+    print(f"✅ Delta store {store.years[0]}–{store.years[-1]}: {len(store):,} rumah tangga, "
+          f"{size / 1024:.0f} KB di {directory}")
+    for year, counts in changed.items():
+        print(f"   {year}: " + ", ".join(f"{c} {n:,} berubah" for c, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,306 @@
+"""Instrumentasi hot path dashboard: span waktu, snapshot memori, cProfile.
+
+`span(nama)` mencatat durasi satu tahap. Span boleh bersarang; jalurnya
+(mis. "monitoring/tabel:monitoring/serialize") diambil dari tumpukan span
+per thread, jadi tahap yang sama di halaman berbeda tercatat terpisah.
+Setiap span menyimpan jumlah, total, maksimum, jendela durasi terakhir
+(untuk p50/p95), bucket histogram, dan selisih RSS proses.
+
+Snapshot memori selalu berisi RSS proses; jika tracemalloc aktif
+(`start_tracemalloc`), juga alokasi teratas per baris kode. cProfile
+bersifat opt-in (`profile(...)`, env DTSEN_PROFILE=1 atau panel admin) dan
+hanya satu profil yang berjalan dalam satu waktu.
+
+Semua data bisa diekspor sebagai JSON (`to_json`) atau teks eksposisi
+Prometheus (`to_prometheus`). Modul ini hanya memakai pustaka standar,
+jadi aman diimpor dari modul mana pun.
+"""
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WINDOW = 256
+PROFILE_ENV = "DTSEN_PROFILE"
+PROFILE_TOP = 40
+
+_lock = threading.Lock()
+_local = threading.local()
+_spans = {}
+_memory = deque(maxlen=64)
+_profiles = {}
+_profile_lock = threading.Lock()
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# ----------------------------------------------------------------- memori
+def rss_bytes():
+    """RSS proses saat ini (Linux: /proc/self/statm), None jika tidak tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def max_rss_bytes():
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # Linux melaporkan KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def start_tracemalloc(frames=1):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracemalloc():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def memory_snapshot(label, top=10):
+    """Catat RSS (+ alokasi teratas jika tracemalloc aktif) dengan label."""
+    snap = {
+        "label": label,
+        "timestamp": time.time(),
+        "rss_bytes": rss_bytes(),
+        "max_rss_bytes": max_rss_bytes(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        snap.update(traced_bytes=current, traced_peak_bytes=peak, top=[
+            {"lokasi": str(s.traceback), "bytes": s.size, "blok": s.count} for s in stats
+        ])
+    with _lock:
+        _memory.append(snap)
+    return snap
+
+
+# ------------------------------------------------------------------- span
+class _SpanStats:
+    __slots__ = ("count", "total", "max", "last", "window", "buckets", "rss_delta")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.window = deque(maxlen=WINDOW)
+        self.buckets = [0] * len(BUCKETS)
+        self.rss_delta = None
+
+    def add(self, seconds, rss_delta):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.window.append(seconds)
+        for k, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[k] += 1
+                break
+        self.rss_delta = rss_delta
+
+    def summary(self):
+        recent = sorted(self.window)
+
+        def pct(q):
+            return recent[min(len(recent) - 1, int(q * len(recent)))] if recent else None
+
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else None,
+            "p50_s": pct(0.5),
+            "p95_s": pct(0.95),
+            "max_s": self.max,
+            "last_s": self.last,
+            "rss_delta_bytes": self.rss_delta,
+        }
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def span(name):
+    """Ukur satu tahap; nama digabung dengan span induk di thread yang sama."""
+    stack = _stack()
+    stack.append(name)
+    path = "/".join(stack)
+    rss0 = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        rss1 = rss_bytes()
+        delta = rss1 - rss0 if rss0 is not None and rss1 is not None else None
+        with _lock:
+            stats = _spans.get(path)
+            if stats is None:
+                stats = _spans[path] = _SpanStats()
+            stats.add(elapsed, delta)
+
+
+def span_stats():
+    """{jalur span: ringkasan} untuk semua span yang pernah tercatat."""
+    with _lock:
+        return {path: stats.summary() for path, stats in _spans.items()}
+
+
+# ---------------------------------------------------------------- cProfile
+def profiling_requested():
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+@contextmanager
+def profile(name, enabled=None):
+    """Jalankan blok di bawah cProfile jika diaktifkan; hasil disimpan per nama.
+
+    enabled=None → ikuti env DTSEN_PROFILE. Jika profil lain sedang
+    berjalan (sesi lain), blok dijalankan tanpa profil.
+    """
+    enabled = profiling_requested() if enabled is None else enabled
+    if not enabled or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        profiler.create_stats()
+        with _lock:
+            _profiles[name] = {
+                "timestamp": time.time(),
+                "seconds": elapsed,
+                "text": out.getvalue(),
+                "pstats": marshal.dumps(profiler.stats),  # format file .prof
+            }
+    finally:
+        _profile_lock.release()
+
+
+def profiles():
+    with _lock:
+        return dict(_profiles)
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _memory.clear()
+        _profiles.clear()
+
+
+# ------------------------------------------------------------------ ekspor
+def _collectors():
+    """Statistik modul lain yang sudah dimuat (tanpa memicu impor baru)."""
+    out = {}
+    for name, func in [("loader", "cache_stats"), ("charts", "cache_stats"),
+                       ("startup", "startup_stats")]:
+        module = sys.modules.get(f"dtsen.{name}")
+        if module is not None:
+            out[name] = getattr(module, func)()
+    return out
+
+
+def to_json():
+    """Seluruh data instrumentasi sebagai dict siap json.dumps."""
+    with _lock:
+        memory = list(_memory)
+        profs = {k: {"timestamp": v["timestamp"], "seconds": v["seconds"], "text": v["text"]}
+                 for k, v in _profiles.items()}
+    return {
+        "timestamp": time.time(),
+        "process": {"pid": os.getpid(), "rss_bytes": rss_bytes(), "max_rss_bytes": max_rss_bytes()},
+        "spans": span_stats(),
+        "memory": memory,
+        "profiles": profs,
+        **_collectors(),
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _split(path):
+    page, _, stage = path.partition("/")
+    return f'page="{_label(page)}",stage="{_label(stage or "total")}"'
+
+
+def to_prometheus():
+    """Teks eksposisi Prometheus (histogram span + gauge proses/cache)."""
+    spans = {}
+    with _lock:
+        for path, stats in _spans.items():
+            spans[path] = (stats.count, stats.total, stats.max, list(stats.buckets))
+
+    lines = [
+        "# HELP dtsen_span_seconds Durasi tahap dashboard per halaman.",
+        "# TYPE dtsen_span_seconds histogram",
+    ]
+    for path, (count, total, _, buckets) in sorted(spans.items()):
+        labels = _split(path)
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(f'dtsen_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'dtsen_span_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"dtsen_span_seconds_sum{{{labels}}} {total}")
+        lines.append(f"dtsen_span_seconds_count{{{labels}}} {count}")
+    lines += ["# HELP dtsen_span_max_seconds Durasi terlama per tahap.",
+              "# TYPE dtsen_span_max_seconds gauge"]
+    lines += [f"dtsen_span_max_seconds{{{_split(p)}}} {v[2]}" for p, v in sorted(spans.items())]
+
+    def gauge(name, value, help_text, kind="gauge"):
+        if value is not None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"])
+
+    gauge("dtsen_process_resident_memory_bytes", rss_bytes(), "RSS proses saat ini.")
+    gauge("dtsen_process_max_resident_memory_bytes", max_rss_bytes(), "RSS puncak proses.")
+    collected = _collectors()
+    if "loader" in collected:
+        stats = collected["loader"]
+        for key in ("hits", "misses", "invalidations"):
+            gauge(f"dtsen_loader_cache_{key}_total", stats[key], f"Cache loader: {key}.", "counter")
+        gauge("dtsen_loader_load_seconds_total", stats["load_seconds"], "Total waktu baca dataset.", "counter")
+    if "charts" in collected:
+        stats = collected["charts"]
+        for key in ("hits", "misses", "evictions"):
+            gauge(f"dtsen_chart_cache_{key}_total", stats[key], f"Cache grafik: {key}.", "counter")
+        gauge("dtsen_chart_render_seconds_total", stats["render_seconds"], "Total waktu render grafik.", "counter")
+        gauge("dtsen_chart_cache_bytes", stats["bytes"], "Ukuran PNG di cache grafik.")
+    if "startup" in collected:
+        gauge("dtsen_startup_first_render_seconds", collected["startup"]["first_render_s"],
+              "Waktu dari skrip pertama jalan sampai render pertama selesai.")
+    return "\n".join(lines) + "\n"
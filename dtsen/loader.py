@@ -0,0 +1,177 @@
+"""Loader dataset DTSEN dengan dtype eksplisit dan cache per proses.
+
+Setiap file dibaca sekali per proses dan disimpan di cache dengan kunci
+(mtime, ukuran file). Jika file berubah di disk, entri cache dibuang dan
+file dibaca ulang pada pemanggilan berikutnya.
+
+Jika ada snapshot Parquet (lihat `dtsen.snapshot`) di sebelah CSV dan
+snapshot itu tidak lebih tua dari CSV-nya, snapshot yang dibaca.
+"""
+import os
+import threading
+import time
+
+import pandas as pd
+
+from dtsen.instrument import span
+
+DATA_DIR = os.environ.get(
+    "DTSEN_DATA_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+NIK_COL = "nik_kepala_keluarga"
+
+# Kolom kategori DTSEN (kardinalitas rendah) → disimpan sebagai category
+CATEGORY_COLS = [
+    "kelurahan", "kecamatan", "kabupaten_kota", "provinsi",
+    "status_kepemilikan_rumah", "jenis_lantai", "jenis_dinding", "jenis_atap",
+    "sumber_air_minum", "sumber_penerangan", "jenis_kloset", "fasilitas_buang_tinja",
+    "akses_internet", "akses_listrik",
+    "pendidikan_kepala_keluarga", "pekerjaan_kepala_keluarga", "status_perkawinan",
+    "kepemilikan_lahan", "kepemilikan_kendaraan", "kepemilikan_tabungan",
+    "penerima_bansos", "jenis_bansos", "status_stunting",
+    "akses_fasilitas_kesehatan", "riwayat_penyakit_kronis", "disabilitas",
+    "socio_segment_label", "anomaly_label",
+]
+
+DTYPES = {NIK_COL: "int64", **{c: "category" for c in CATEGORY_COLS}}
+
+# Kolom tanggal per file (selain itu dibaca apa adanya)
+DATE_COLS = ["tanggal_update", "period", "ds", "date"]
+
+# Ukuran chunk default untuk pembacaan streaming (scoring, cleaning)
+DEFAULT_CHUNKSIZE = 50_000
+
+_cache = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "load_seconds": 0.0}
+_per_file = {}
+
+
+def _resolve(path):
+    return path if os.path.isabs(path) else os.path.join(DATA_DIR, path)
+
+
+def _file_key(full_path):
+    st = os.stat(full_path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def read_csv_typed(full_path, columns=None):
+    """Baca CSV dengan dtype DTSEN; `columns` dipakai sebagai usecols.
+
+    Kolom yang tidak ada di header → KeyError (sama dengan read_snapshot).
+    """
+    header = pd.read_csv(full_path, nrows=0).columns
+    usecols = list(columns) if columns else None
+    missing = [c for c in usecols or () if c not in header]
+    if missing:
+        raise KeyError(f"Kolom tidak ada di {os.path.basename(full_path)}: {missing}")
+    dtypes = {c: t for c, t in DTYPES.items() if c in header}
+    df = pd.read_csv(full_path, dtype=dtypes, usecols=usecols)
+    for c in DATE_COLS:
+        if c in df.columns:
+            df[c] = pd.to_datetime(df[c], errors="coerce")
+    if columns:
+        df = df[usecols]
+    return df
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Baca CSV/Parquet per chunk tanpa memuat seluruh file."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: t for c, t in DTYPES.items() if c in header}
+    yield from pd.read_csv(path, chunksize=chunksize, usecols=columns, dtype=dtypes)
+
+
+def _source_for(full_path):
+    """Pilih snapshot Parquet jika ada dan masih sinkron dengan CSV-nya."""
+    if not full_path.endswith(".csv"):
+        return full_path
+    pq_path = full_path[:-4] + ".parquet"
+    if os.path.exists(pq_path) and (
+        not os.path.exists(full_path)
+        or os.stat(pq_path).st_mtime_ns >= os.stat(full_path).st_mtime_ns
+    ):
+        return pq_path
+    return full_path
+
+
+def _read(source, columns):
+    if source.endswith(".parquet"):
+        from dtsen.snapshot import read_snapshot
+
+        return read_snapshot(source, columns)
+    return read_csv_typed(source, columns)
+
+
+def dataset_columns(path):
+    """Nama kolom dataset dari header CSV / skema Parquet, tanpa membaca isinya."""
+    source = _source_for(_resolve(path))
+    if source.endswith(".parquet"):
+        from dtsen.snapshot import snapshot_columns
+
+        return snapshot_columns(source)
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def load_dataset(path, columns=None):
+    """Baca dataset DTSEN (relatif ke DATA_DIR) lewat cache proses.
+
+    `columns` membatasi kolom yang dibaca; setiap proyeksi di-cache terpisah.
+    Yang dikembalikan adalah salinan dangkal, jadi menambah/mengganti kolom
+    di halaman dashboard tidak mengubah isi cache.
+    """
+    source = _source_for(_resolve(path))
+    key = _file_key(source)
+    cache_key = (source, tuple(columns) if columns else None)
+
+    with _lock:
+        entry = _cache.get(cache_key)
+        file_stats = _per_file.setdefault(
+            path, {"hits": 0, "misses": 0, "load_seconds": 0.0, "rows": 0}
+        )
+        if entry is not None and entry[0] == key:
+            _stats["hits"] += 1
+            file_stats["hits"] += 1
+            return entry[1].copy(deep=False)
+        if entry is not None:
+            _stats["invalidations"] += 1
+
+    # Baca di luar lock supaya file lain tidak ikut menunggu
+    start = time.perf_counter()
+    with span(f"read:{os.path.basename(source)}"):
+        df = _read(source, columns)
+    elapsed = time.perf_counter() - start
+
+    with _lock:
+        _cache[cache_key] = (key, df)
+        _stats["misses"] += 1
+        _stats["load_seconds"] += elapsed
+        file_stats["misses"] += 1
+        file_stats["load_seconds"] += elapsed
+        file_stats["rows"] = len(df)
+    return df.copy(deep=False)
+
+
+def dataset_version(path):
+    """Versi dataset = (mtime_ns, ukuran) dari sumber yang akan dibaca."""
+    return _file_key(_source_for(_resolve(path)))
+
+
+def cache_stats():
+    """Counter hit/miss dan total waktu baca, global dan per file."""
+    with _lock:
+        return {**_stats, "files": {k: dict(v) for k, v in _per_file.items()}}
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
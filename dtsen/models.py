@@ -0,0 +1,160 @@
+"""Training dan artefak model LightGBM (kemiskinan & stunting).
+
+Mengikuti langkah di Modeling_Use_Case_1_Prediksi_Kemiskinan_.ipynb, tapi
+hasilnya disimpan dengan joblib sebagai "bundle" (model + daftar fitur +
+versi encoder) agar scoring bisa berjalan tanpa membuka notebook. Kolom
+kategori di-encode dengan encoder bersama dari `dtsen.encoding`:
+
+    python -m dtsen.models                  # latih & simpan ke models/
+"""
+import os
+import sys
+import threading
+
+import joblib
+import pandas as pd
+from lightgbm import LGBMClassifier, early_stopping
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from dtsen.loader import DATA_DIR, load_dataset
+
+MODEL_DIR = os.environ.get("DTSEN_MODEL_DIR", os.path.join(DATA_DIR, "models"))
+
+# Fitur per model, sama dengan notebook
+FEATURES = {
+    "kemiskinan": {
+        "cat_cols": [
+            "kelurahan", "kecamatan", "status_kepemilikan_rumah",
+            "pendidikan_kepala_keluarga", "pekerjaan_kepala_keluarga",
+            "status_perkawinan", "penerima_bansos", "jenis_bansos",
+            "status_stunting", "akses_fasilitas_kesehatan",
+            "riwayat_penyakit_kronis", "disabilitas",
+        ],
+        "num_cols": [
+            "jumlah_anggota_keluarga", "luas_lantai", "jumlah_kamar_tidur",
+            "jumlah_anak_balita", "jumlah_anak_sekolah",
+            "pengeluaran_per_bulan", "pendapatan_per_bulan",
+            "rasio_pengeluaran_pendapatan", "kepadatan_rumah",
+        ],
+        "target": "is_poor",
+        "score_col": "risk_score",
+    },
+    "stunting": {
+        "cat_cols": [
+            "pendidikan_kepala_keluarga", "akses_fasilitas_kesehatan",
+            "riwayat_penyakit_kronis", "disabilitas",
+        ],
+        "num_cols": [
+            "jumlah_anak_balita", "jumlah_anak_sekolah", "luas_lantai",
+            "jumlah_anggota_keluarga", "rasio_pengeluaran_pendapatan",
+            "kepadatan_rumah",
+        ],
+        "target": "status_stunting",
+        "score_col": "stunting_risk_score",
+    },
+}
+
+
+def bundle_path(name, model_dir=None):
+    return os.path.join(model_dir or MODEL_DIR, f"model_{name}.joblib")
+
+
+def _target(df, spec):
+    y = df[spec["target"]]
+    if spec["target"] == "status_stunting":
+        y = y.astype(str).map({"Ya": 1, "Tidak": 0})
+    return y.astype(int)
+
+
+def encode_features(df, bundle, encoder=None):
+    """Matriks fitur (kategori → kode encoder bersama, numerik apa adanya)."""
+    from dtsen.encoding import get_encoder
+
+    encoder = encoder or get_encoder()
+    if bundle["encoder_version"] != encoder.version:
+        raise ValueError(
+            f"Model {bundle['name']} dilatih dengan encoder {bundle['encoder_version']}, "
+            f"encoder aktif {encoder.version}; latih ulang dengan `python -m dtsen.models`"
+        )
+    X = pd.DataFrame(index=df.index)
+    for c in bundle["cat_cols"]:
+        X[c] = encoder.transform_column(c, df[c])
+    for c in bundle["num_cols"]:
+        X[c] = df[c].to_numpy()
+    return X
+
+
+def train_model(name, df=None, encoder=None):
+    """Latih satu model seperti di notebook; kembalikan bundle + AUC test."""
+    from dtsen.encoding import get_encoder
+
+    spec = FEATURES[name]
+    df = load_dataset("dtsen_clean_padangpanjang.csv") if df is None else df
+    encoder = encoder or get_encoder()
+
+    bundle = {"name": name, "encoder_version": encoder.version, **spec}
+    X = encode_features(df, bundle, encoder)
+    y = _target(df, spec)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, stratify=y, random_state=42
+    )
+    model = LGBMClassifier(
+        n_estimators=500, random_state=42, objective="binary",
+        boosting_type="gbdt", verbose=-1,
+    )
+    model.fit(
+        X_train, y_train,
+        eval_set=[(X_test, y_test)],
+        eval_metric="auc",
+        callbacks=[early_stopping(stopping_rounds=50, verbose=False)],
+    )
+    bundle["model"] = model
+    bundle["auc"] = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+    return bundle
+
+
+def save_bundle(bundle, model_dir=None):
+    path = bundle_path(bundle["name"], model_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(bundle, path)
+    return path
+
+
+_bundles = {}
+_bundles_lock = threading.Lock()
+
+
+def load_bundle(name, model_dir=None):
+    """Muat bundle dari disk sekali per proses (dibaca ulang jika file berubah)."""
+    path = bundle_path(name, model_dir)
+    mtime = os.stat(path).st_mtime_ns
+    with _bundles_lock:
+        cached = _bundles.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    bundle = joblib.load(path)
+    with _bundles_lock:
+        _bundles[path] = (mtime, bundle)
+    return bundle
+
+
+def predict_scores(df, bundle, encoder=None):
+    """Probabilitas kelas positif untuk setiap baris df."""
+    return bundle["model"].predict_proba(encode_features(df, bundle, encoder))[:, 1]
+
+
+def main(argv=None):
+    from dtsen.encoding import get_encoder
+
+    model_dir = argv[0] if argv else None
+    encoder = get_encoder(model_dir)
+    for name in FEATURES:
+        bundle = train_model(name, encoder=encoder)
+        path = save_bundle(bundle, model_dir)
+        print(f"✅ Model {name} disimpan: {path} (AUC test {bundle['auc']:.3f})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,245 @@
+"""Proyeksi kebutuhan layanan publik (Puskesmas & sekolah) untuk banyak skenario.
+
+Satu skenario terdiri dari:
+  band                    posisi di pita forecast: -1 = yhat_lower, 0 = yhat,
+                          1 = yhat_upper (nilai di antaranya diinterpolasi)
+  penduduk_per_puskesmas  rasio kapasitas Puskesmas
+  anak_per_sekolah        rasio kapasitas sekolah
+  skala_proporsi_anak     pengali proporsi anak sekolah per kelurahan
+
+Proporsi anak sekolah diambil per kelurahan dari cube DTSEN (bukan satu
+proporsi kota). Seluruh grid skenario × kelurahan × bulan dihitung sebagai
+satu operasi broadcast NumPy, dipotong per blok skenario agar memori tetap
+terbatas, lalu langsung direduksi ke kekurangan puncak per skenario ×
+kelurahan. Tabel peringkat kekurangan cukup cepat untuk dibuat ulang di
+setiap rerun Streamlit.
+
+Kekurangan = kebutuhan fasilitas − fasilitas saat ini. Tanpa data
+fasilitas, "saat ini" = kebutuhan pada bulan historis terakhir dengan
+skenario default (rasio lama dashboard: 10000 penduduk per Puskesmas,
+1000 anak per sekolah).
+"""
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dtsen.cube import get_cube
+from dtsen.feature_store import feature_store_version
+from dtsen.forecasting import FORECAST_KEL_FILE, TS_FILE
+from dtsen.loader import dataset_version, load_dataset
+
+SERVICES = ("puskesmas", "sekolah")
+BANDS = {"Bawah (yhat_lower)": -1.0, "Tengah (yhat)": 0.0, "Atas (yhat_upper)": 1.0}
+DEFAULT_SCENARIO = {
+    "band": 0.0,
+    "penduduk_per_puskesmas": 10000,
+    "anak_per_sekolah": 1000,
+    "skala_proporsi_anak": 1.0,
+}
+GRID_COLS = list(DEFAULT_SCENARIO)
+BLOCK_CELLS = 4_000_000  # sel skenario × kelurahan × bulan per blok broadcast
+
+
+def scenario_grid(**params):
+    """Produk kartesius nilai parameter; parameter yang tidak diberikan = default.
+
+    scenario_grid(band=[0, 1], anak_per_sekolah=[250, 500]) → 4 skenario.
+    """
+    unknown = set(params) - set(GRID_COLS)
+    if unknown:
+        raise KeyError(f"Parameter skenario tidak dikenal: {sorted(unknown)}")
+    values = [np.atleast_1d(params.get(c, DEFAULT_SCENARIO[c])) for c in GRID_COLS]
+    grid = pd.DataFrame(list(itertools.product(*values)), columns=GRID_COLS)
+    grid.index.name = "skenario"
+    return grid
+
+
+def child_share_by_kelurahan(cube):
+    """Proporsi anak sekolah per kelurahan (jumlah anak sekolah / jumlah anggota)."""
+    s = cube.summary("kelurahan", ["jumlah_anak_sekolah", "jumlah_anggota_keluarga"])
+    share = s["jumlah_anak_sekolah_sum"] / s["jumlah_anggota_keluarga_sum"]
+    share.index = share.index.astype(str)
+    return share.rename("proporsi_anak_sekolah")
+
+
+class ProjectionEngine:
+    """Forecast per kelurahan dalam bentuk array (kelurahan × bulan)."""
+
+    def __init__(self, months, kelurahan, yhat, lower, upper, child_share, existing=None, base=None):
+        self.months = pd.DatetimeIndex(months)
+        self.kelurahan = np.asarray(kelurahan, dtype=object)
+        self.yhat = np.asarray(yhat, dtype=float)
+        # Selisih ke batas bawah/atas: populasi = yhat + band × selisih
+        self.down = self.yhat - np.asarray(lower, dtype=float)
+        self.up = np.asarray(upper, dtype=float) - self.yhat
+        self.child_share = np.asarray(child_share, dtype=float)
+        if existing is None:
+            existing = self.baseline_capacity(base if base is not None else self.yhat[:, 0])
+        self.existing = {s: np.asarray(existing[s], dtype=float) for s in SERVICES}
+
+    @classmethod
+    def from_forecast(cls, fcst, child_share, start=None, existing=None):
+        """Bangun dari forecast panjang (ds, kelurahan, yhat, yhat_lower, yhat_upper).
+
+        Hanya bulan ≥ `start` yang diproyeksikan; bulan sebelumnya yang
+        terakhir menjadi dasar fasilitas saat ini. Kelurahan yang tidak ada
+        di `child_share` memakai proporsi rata-rata.
+        """
+        fcst = fcst.assign(ds=pd.to_datetime(fcst["ds"]), kelurahan=fcst["kelurahan"].astype(str))
+        wide = fcst.pivot(index="kelurahan", columns="ds", values=["yhat", "yhat_lower", "yhat_upper"])
+        months = wide["yhat"].columns
+        base = None
+        if start is not None:
+            before = months < pd.Timestamp(start)
+            if before.any():
+                base = wide["yhat"].to_numpy()[:, np.flatnonzero(before)[-1]]
+            months = months[~before]
+        kel = wide.index
+        share = pd.Series(child_share, dtype=float).reindex(kel)
+        share = share.fillna(share.mean())
+        return cls(months, kel, *(wide[c][months].to_numpy() for c in ("yhat", "yhat_lower", "yhat_upper")),
+                   share.to_numpy(), existing=existing, base=base)
+
+    def baseline_capacity(self, population):
+        """Fasilitas yang dibutuhkan `population` (per kelurahan) pada skenario default."""
+        population = np.asarray(population, dtype=float)
+        d = DEFAULT_SCENARIO
+        return {
+            "puskesmas": np.ceil(population / d["penduduk_per_puskesmas"]),
+            "sekolah": np.ceil(population * self.child_share * d["skala_proporsi_anak"] / d["anak_per_sekolah"]),
+        }
+
+    @property
+    def shape(self):
+        return len(self.kelurahan), len(self.months)
+
+    def _project(self, grid):
+        """Array (skenario × kelurahan × bulan): populasi, anak sekolah, kebutuhan."""
+        col = {c: grid[c].to_numpy(dtype=float)[:, None, None] for c in GRID_COLS}
+        band = col["band"]
+        pop = self.yhat + np.maximum(band, 0) * self.up + np.minimum(band, 0) * self.down
+        children = pop * self.child_share[:, None] * col["skala_proporsi_anak"]
+        need = {
+            "puskesmas": np.ceil(pop / col["penduduk_per_puskesmas"]),
+            "sekolah": np.ceil(children / col["anak_per_sekolah"]),
+        }
+        return pop, children, need
+
+    def run(self, grid=None):
+        """Evaluasi grid skenario; kembalikan ProjectionResult (sudah direduksi)."""
+        grid = scenario_grid() if grid is None else grid.reset_index(drop=True).rename_axis("skenario")
+        n_kel, n_month = self.shape
+        n = len(grid)
+        out = {s: {"peak": np.empty((n, n_kel)), "peak_at": np.empty((n, n_kel), dtype=np.int64),
+                   "first_at": np.empty((n, n_kel), dtype=np.int64), "end": np.empty((n, n_kel))}
+               for s in SERVICES}
+        block = max(1, BLOCK_CELLS // max(n_kel * n_month, 1))
+        for lo in range(0, n, block):
+            _, _, need = self._project(grid.iloc[lo:lo + block])
+            for s in SERVICES:
+                short = np.maximum(need[s] - self.existing[s][:, None], 0)
+                r = out[s]
+                r["peak_at"][lo:lo + block] = short.argmax(axis=2)
+                r["peak"][lo:lo + block] = np.take_along_axis(
+                    short, r["peak_at"][lo:lo + block, :, None], axis=2)[..., 0]
+                # Bulan pertama kekurangan muncul (-1 jika tidak pernah)
+                any_short = short > 0
+                r["first_at"][lo:lo + block] = np.where(any_short.any(axis=2), any_short.argmax(axis=2), -1)
+                r["end"][lo:lo + block] = need[s][..., -1]
+        return ProjectionResult(self, grid, out)
+
+    def series(self, scenario=None, kelurahan=None):
+        """Deret bulanan satu skenario (dict parameter) untuk satu/semua kelurahan."""
+        grid = pd.DataFrame([{**DEFAULT_SCENARIO, **(scenario or {})}])[GRID_COLS]
+        pop, children, need = self._project(grid)
+        rows = np.arange(len(self.kelurahan))
+        if kelurahan is not None:
+            rows = np.flatnonzero(self.kelurahan == kelurahan)
+        n_month = len(self.months)
+        frame = pd.DataFrame({
+            "period": np.tile(self.months, len(rows)),
+            "kelurahan": np.repeat(self.kelurahan[rows], n_month),
+            "population": pop[0, rows].ravel(),
+            "anak_sekolah_pred": np.round(children[0, rows].ravel()),
+            "puskesmas_needed": need["puskesmas"][0, rows].ravel(),
+            "school_needed": need["sekolah"][0, rows].ravel(),
+        })
+        for s in SERVICES:
+            frame[f"kekurangan_{s}"] = np.maximum(need[s][0, rows] - self.existing[s][rows, None], 0).ravel()
+        return frame
+
+
+class ProjectionResult:
+    """Ringkasan hasil run: kekurangan puncak per skenario × kelurahan."""
+
+    def __init__(self, engine, grid, reduced):
+        self.engine = engine
+        self.grid = grid
+        self.reduced = reduced
+
+    def _months(self, idx):
+        months = self.engine.months.to_numpy()
+        return np.where(idx >= 0, months[np.clip(idx, 0, None)], np.datetime64("NaT"))
+
+    def shortfall_table(self, service="sekolah", top=None, only_short=False):
+        """Tabel peringkat skenario × kelurahan, kekurangan puncak terbesar dulu.
+
+        `top` membatasi jumlah baris (argpartition, tanpa mengurutkan semua).
+        """
+        r = self.reduced[service]
+        peak = r["peak"].ravel()
+        order = np.arange(len(peak))
+        if only_short:
+            order = order[peak > 0]
+        if top is not None and top < len(order):
+            order = order[np.argpartition(-peak[order], top - 1)[:top]]
+        # Urut: kekurangan puncak turun, lalu bulan pertama kekurangan (lebih awal dulu)
+        first = r["first_at"].ravel()[order]
+        order = order[np.lexsort((np.where(first < 0, np.iinfo(np.int64).max, first), -peak[order]))]
+
+        n_kel = len(self.engine.kelurahan)
+        s_idx, k_idx = np.divmod(order, n_kel)
+        table = self.grid.iloc[s_idx].reset_index(names="skenario")
+        table.insert(1, "kelurahan", self.engine.kelurahan[k_idx])
+        table["fasilitas_saat_ini"] = self.engine.existing[service][k_idx]
+        table["kebutuhan_akhir"] = r["end"].ravel()[order]
+        table["kekurangan_puncak"] = peak[order]
+        table["bulan_puncak"] = self._months(np.where(peak[order] > 0, r["peak_at"].ravel()[order], -1))
+        table["bulan_kurang_pertama"] = self._months(first)
+        table.insert(0, "peringkat", np.arange(1, len(table) + 1))
+        return table
+
+    def scenario_summary(self):
+        """Total kekurangan puncak & jumlah kelurahan kurang per skenario."""
+        out = self.grid.copy()
+        for s in SERVICES:
+            peak = self.reduced[s]["peak"]
+            out[f"kekurangan_{s}"] = peak.sum(axis=1)
+            out[f"kelurahan_kurang_{s}"] = (peak > 0).sum(axis=1)
+        return out.sort_values([f"kekurangan_{s}" for s in SERVICES], ascending=False, kind="stable")
+
+
+_engine_cache = {}
+_engine_lock = threading.Lock()
+
+
+def engine_version():
+    return (dataset_version(FORECAST_KEL_FILE), dataset_version(TS_FILE), feature_store_version())
+
+
+def get_engine():
+    """Engine untuk forecast kelurahan & cube saat ini (dibangun sekali per versi)."""
+    version = engine_version()
+    with _engine_lock:
+        cached = _engine_cache.get("default")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    fcst = load_dataset(FORECAST_KEL_FILE)
+    last_obs = pd.to_datetime(load_dataset(TS_FILE, columns=["date"])["date"]).max()
+    engine = ProjectionEngine.from_forecast(fcst, child_share_by_kelurahan(get_cube()),
+                                            start=last_obs + pd.offsets.MonthBegin(1))
+    with _engine_lock:
+        _engine_cache["default"] = (version, engine)
+    return engine
@@ -0,0 +1,202 @@
+"""Lapisan query tabel: filter, urut, dan paging di sisi server.
+
+Setiap tabel mendapat `TableIndex` yang dibangun lazy per kolom: kolom
+kategori disimpan sebagai kode + daftar posisi per nilai (posting list),
+kolom yang dipakai untuk urut/rentang disimpan sebagai urutan argsort dan
+peringkat. Query dimulai dari predikat paling selektif (posting list atau
+potongan rentang dari urutan terurut), sisa predikat dicek secara vektor
+hanya pada kandidat itu, lalu hanya baris satu halaman yang diambil dari
+DataFrame. Yang dikirim ke browser hanyalah halaman tersebut.
+
+Indeks berlaku untuk satu versi tabel; kolom turunan (mis. band status)
+boleh ditambahkan selama nilainya deterministik untuk versi yang sama.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class TableIndex:
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self._codes = {}     # kolom → (kode int32, {nilai: kode}, daftar nilai)
+        self._postings = {}  # kolom → daftar array posisi per kode
+        self._values = {}    # kolom → nilai float64 (kolom numerik/tanggal)
+        self._orders = {}    # (kolom, naik?) → (urutan, peringkat, nilai terurut tanpa NaN)
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------- kolom lazy
+    def _categorical(self, df, col):
+        cached = self._codes.get(col)
+        if cached is None:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, uniques = values.cat.codes.to_numpy(), list(values.cat.categories)
+            else:
+                codes, uniques = pd.factorize(values, sort=True)
+                uniques = list(uniques)
+            codes = np.asarray(codes, dtype=np.int32)
+            cached = (codes, {v: i for i, v in enumerate(uniques)}, uniques)
+            with self._lock:
+                self._codes[col] = cached
+        return cached
+
+    def _posting(self, df, col):
+        postings = self._postings.get(col)
+        if postings is None:
+            codes, _, uniques = self._categorical(df, col)
+            # Sort stabil sekali → semua posting list terurut naik sekaligus
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            start = int((codes < 0).sum())
+            postings = []
+            for n in counts:
+                postings.append(order[start:start + n])
+                start += n
+            with self._lock:
+                self._postings[col] = postings
+        return postings
+
+    def _numeric(self, df, col):
+        values = self._values.get(col)
+        if values is None:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = series.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+                values[series.isna().to_numpy()] = np.nan
+            elif isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series):
+                # Kolom teks diurutkan berdasarkan kode kategori terurut
+                values = self._categorical(df, col)[0].astype(float)
+                values[values < 0] = np.nan
+            else:
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+            with self._lock:
+                self._values[col] = values
+        return values
+
+    def _order(self, df, col, ascending=True):
+        cached = self._orders.get((col, ascending))
+        if cached is None:
+            values = self._numeric(df, col)
+            keys = values.copy() if ascending else -values
+            keys[np.isnan(keys)] = np.inf  # nilai kosong selalu di akhir
+            order = np.argsort(keys, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            sorted_vals = values[order]
+            cached = (order, rank, sorted_vals[~np.isnan(sorted_vals)])
+            with self._lock:
+                self._orders[(col, ascending)] = cached
+        return cached
+
+    def options(self, df, col):
+        """Nilai unik kolom (urut kategori) untuk pilihan filter."""
+        return list(self._categorical(df, col)[2])
+
+    def bounds(self, df, col):
+        values = self._numeric(df, col)
+        return float(np.nanmin(values)), float(np.nanmax(values))
+
+    # ---------------------------------------------------------------- query
+    def _candidates(self, df, where, between):
+        """(perkiraan jumlah baris, jenis, kolom, argumen) per predikat, naik."""
+        preds = []
+        for col, wanted in where.items():
+            _, lookup, _ = self._categorical(df, col)
+            wanted = [wanted] if np.isscalar(wanted) else list(wanted)
+            codes = [lookup[v] for v in wanted if v in lookup]
+            postings = self._posting(df, col)
+            size = sum(len(postings[c]) for c in codes)
+            preds.append((size, "where", col, codes))
+        for col, (lo, hi) in between.items():
+            _, _, sorted_vals = self._order(df, col)
+            start = 0 if lo is None else np.searchsorted(sorted_vals, lo, "left")
+            end = len(sorted_vals) if hi is None else np.searchsorted(sorted_vals, hi, "right")
+            preds.append((end - start, "between", col, (lo, hi, start, end)))
+        return sorted(preds, key=lambda p: p[0])
+
+    def _positions(self, df, pred):
+        _, kind, col, arg = pred
+        if kind == "where":
+            postings = self._posting(df, col)
+            parts = [postings[c] for c in arg]
+            return np.sort(np.concatenate(parts)) if len(parts) > 1 else \
+                (parts[0] if parts else np.empty(0, dtype=np.int64))
+        order = self._order(df, col)[0]
+        return np.sort(order[arg[2]:arg[3]])
+
+    def _check(self, df, pred, rows):
+        _, kind, col, arg = pred
+        if kind == "where":
+            return np.isin(self._categorical(df, col)[0][rows], arg)
+        values = self._numeric(df, col)[rows]
+        lo, hi = arg[0], arg[1]
+        mask = ~np.isnan(values)
+        if lo is not None:
+            mask &= values >= lo
+        if hi is not None:
+            mask &= values <= hi
+        return mask
+
+    def query(self, df, where=None, between=None, sort=None, ascending=True,
+              page=0, page_size=20, columns=None):
+        """Satu halaman hasil query → (frame halaman, total baris cocok).
+
+        where   : {kolom: nilai atau daftar nilai}; None/kosong diabaikan
+        between : {kolom: (min, maks)} inklusif; batas None = terbuka
+        sort    : kolom pengurut (NaN selalu di akhir); None = urutan asli
+        """
+        where = {c: v for c, v in (where or {}).items()
+                 if v is not None and not (not np.isscalar(v) and len(v) == 0)}
+        between = {c: b for c, b in (between or {}).items()
+                   if b is not None and (b[0] is not None or b[1] is not None)}
+
+        rows = None
+        preds = self._candidates(df, where, between)
+        if preds:
+            # Mulai dari predikat paling selektif, sisanya dicek pada kandidat
+            rows = self._positions(df, preds[0])
+            for pred in preds[1:]:
+                rows = rows[self._check(df, pred, rows)]
+        total = self.n_rows if rows is None else len(rows)
+
+        start, stop = page * page_size, (page + 1) * page_size
+        if sort is None:
+            page_rows = np.arange(start, min(stop, total)) if rows is None else rows[start:stop]
+        else:
+            order, rank, _ = self._order(df, sort, ascending)
+            if rows is None:
+                page_rows = order[start:stop]
+            else:
+                ranks = rank[rows]
+                if stop < len(rows):
+                    # Cukup ambil `stop` peringkat teratas, tidak perlu sort penuh
+                    keep = np.argpartition(ranks, stop)[:stop]
+                    rows, ranks = rows[keep], ranks[keep]
+                page_rows = rows[np.argsort(ranks, kind="stable")][start:stop]
+
+        frame = df.iloc[page_rows]
+        return (frame[columns] if columns else frame), total
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_table_index(name, df, version=None):
+    """Indeks untuk tabel `name`; dibangun ulang jika versi/jumlah baris berubah.
+
+    version=None → indeks sekali pakai (untuk tabel kecil hasil agregasi).
+    """
+    if version is None:
+        return TableIndex(len(df))
+    key = (version, len(df))
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    index = TableIndex(len(df))
+    with _indexes_lock:
+        _indexes[name] = (key, index)
+    return index
@@ -0,0 +1,119 @@
+"""Batch scoring register DTSEN dengan model LightGBM yang tersimpan.
+
+Register dibaca per chunk berukuran tetap, setiap chunk di-score di
+process pool (model dimuat sekali per worker), lalu hasilnya langsung
+ditulis ke file keluaran sesuai urutan chunk. Jumlah chunk yang sedang
+diproses dibatasi, sehingga memori tetap terbatas meski register berisi
+jutaan rumah tangga.
+
+    python -m dtsen.scoring dtsen_clean_padangpanjang.csv skor.parquet
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from dtsen.encoding import get_encoder
+from dtsen.loader import DEFAULT_CHUNKSIZE, NIK_COL, iter_chunks
+from dtsen.models import FEATURES, load_bundle, predict_scores
+from dtsen.snapshot import ChunkWriter
+
+_worker_bundles = None
+_worker_encoder = None
+
+
+def _init_worker(names, model_dir, single_thread=False):
+    # Di pool: satu thread LightGBM per proses supaya tidak berebut core antar
+    # worker. Tanpa pool fungsi ini jalan di proses pemanggil, dan bundle dari
+    # cache load_bundle dipakai bersama (dashboard, layanan) → jangan diubah.
+    global _worker_bundles, _worker_encoder
+    _worker_encoder = get_encoder(model_dir)
+    _worker_bundles = []
+    for name in names:
+        bundle = load_bundle(name, model_dir)
+        if single_thread:
+            bundle["model"].set_params(n_jobs=1)
+        _worker_bundles.append(bundle)
+
+
+def _score_chunk(chunk, passthrough=()):
+    out = chunk[[NIK_COL, *passthrough]].copy()
+    for bundle in _worker_bundles:
+        out[bundle["score_col"]] = predict_scores(chunk, bundle, _worker_encoder)
+    return out
+
+
+def score_file(src, dst, models=tuple(FEATURES), chunksize=DEFAULT_CHUNKSIZE,
+               workers=None, model_dir=None, passthrough=()):
+    """Score `src` ke `dst`; kembalikan ringkasan (rows, detik, rows/detik).
+
+    workers=None → jumlah CPU; workers<=1 → tanpa process pool.
+    `passthrough` menambahkan kolom sumber ke keluaran (mis. kelurahan).
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    needed = {NIK_COL, *passthrough}
+    for name in models:
+        needed.update(FEATURES[name]["cat_cols"], FEATURES[name]["num_cols"])
+
+    start = time.perf_counter()
+    rows = chunks = 0
+    writer = ChunkWriter(dst)
+    try:
+        if workers <= 1:
+            _init_worker(models, model_dir)
+            for chunk in iter_chunks(src, chunksize, sorted(needed)):
+                writer.write(_score_chunk(chunk, passthrough))
+                rows += len(chunk)
+                chunks += 1
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(models, model_dir, True)) as pool:
+                pending = deque()
+                for chunk in iter_chunks(src, chunksize, sorted(needed)):
+                    pending.append(pool.submit(_score_chunk, chunk, passthrough))
+                    # Batasi chunk yang sedang diproses → memori terbatas
+                    while len(pending) >= 2 * workers:
+                        out = pending.popleft().result()
+                        writer.write(out)
+                        rows += len(out)
+                        chunks += 1
+                while pending:
+                    out = pending.popleft().result()
+                    writer.write(out)
+                    rows += len(out)
+                    chunks += 1
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "workers": max(workers, 1),
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("nan"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch scoring register DTSEN")
+    parser.add_argument("src")
+    parser.add_argument("dst", help="keluaran .csv atau .parquet")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--model-dir", default=None)
+    parser.add_argument("--models", nargs="+", default=list(FEATURES))
+    args = parser.parse_args(argv)
+
+    report = score_file(args.src, args.dst, tuple(args.models), args.chunksize,
+                        args.workers, args.model_dir)
+    print(
+        f"✅ {report['rows']:,} baris di-score dalam {report['seconds']:.2f}s "
+        f"({report['rows_per_sec']:,.0f} baris/detik, {report['chunks']} chunk, "
+        f"{report['workers']} worker) → {args.dst}"
+    )
+
+
+if __name__ == "__main__":
+    main()
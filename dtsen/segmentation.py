@@ -0,0 +1,206 @@
+"""Segmentasi sosial-ekonomi & cluster hunian dengan mini-batch K-Means.
+
+Pengganti KMeans(n_clusters=3, n_init=10) di Segmentasi.ipynb dan
+Modeling_Use_Case_1: model di-fit secara bertahap (partial_fit per batch),
+sehingga rumah tangga baru bisa ikut memperbarui centroid tanpa fit ulang.
+Centroid disimpan, jadi penetapan segmen cukup satu pencarian centroid
+terdekat secara vektor.
+
+Label ditetapkan secara deterministik dengan mengurutkan centroid pada
+satu fitur (pendapatan untuk segmen, luas lantai untuk hunian), bukan
+bergantung pada urutan ID cluster hasil K-Means. Kode yang dikembalikan
+sudah mengikuti urutan label (0 = label pertama).
+
+    python -m dtsen.segmentation              # fit kedua model & simpan ke models/
+"""
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+from dtsen.encoding import get_encoder
+from dtsen.loader import DEFAULT_CHUNKSIZE, iter_chunks, load_dataset
+from dtsen.models import MODEL_DIR
+
+SPECS = {
+    "segmen": {
+        "features": [
+            "pendapatan_per_bulan", "pengeluaran_per_bulan", "jumlah_anggota_keluarga",
+            "pendidikan_kepala_keluarga", "pekerjaan_kepala_keluarga",
+            "kepemilikan_lahan", "kepemilikan_kendaraan", "kepemilikan_tabungan",
+        ],
+        "order_by": "pendapatan_per_bulan",
+        "labels": ["Mampu", "Menengah", "Rentan"],  # pendapatan centroid turun
+        "code_col": "socio_segment",
+        "label_col": "socio_segment_label",
+    },
+    "hunian": {
+        "features": [
+            "status_kepemilikan_rumah", "jenis_lantai", "jenis_dinding", "jenis_atap",
+            "luas_lantai", "jumlah_anggota_keluarga", "jumlah_kamar_tidur",
+            "fasilitas_buang_tinja",
+        ],
+        "order_by": "luas_lantai",
+        "labels": ["Layak Huni", "Semi Kumuh", "Kumuh"],  # luas lantai centroid turun
+        "code_col": "cluster",
+        "label_col": "cluster_label",
+    },
+}
+
+
+def model_path(name, model_dir=None):
+    return os.path.join(model_dir or MODEL_DIR, f"segmentasi_{name}.joblib")
+
+
+class SegmentationModel:
+    def __init__(self, spec, batch_size=4096, random_state=42, encoder=None):
+        self.spec = spec
+        self.batch_size = batch_size
+        self.encoder = encoder or get_encoder()
+        self.scaler = StandardScaler()
+        self.kmeans = MiniBatchKMeans(
+            n_clusters=len(spec["labels"]), batch_size=batch_size,
+            random_state=random_state, n_init=3,
+        )
+        self.centroids = None  # dalam skala terstandar, urut sesuai label
+        self._rank = None
+        self._pending = None  # baris yang ditahan sebelum partial_fit pertama
+
+    def features(self, df):
+        """Matriks fitur float64 (kategori di-encode dengan encoder bersama)."""
+        cols = []
+        for c in self.spec["features"]:
+            if c in self.encoder.columns:
+                cols.append(self.encoder.transform_column(c, df[c]).astype(float))
+            else:
+                cols.append(df[c].to_numpy(dtype=float))
+        return np.column_stack(cols)
+
+    def _batches(self, X):
+        for start in range(0, len(X), self.batch_size):
+            yield X[start:start + self.batch_size]
+
+    def fit(self, df, epochs=3):
+        """Fit dari satu DataFrame (scaler lalu K-Means per mini-batch)."""
+        X = self.features(df)
+        self.scaler.fit(X)
+        Xs = self.scaler.transform(X)
+        rng = np.random.default_rng(self.kmeans.random_state)
+        for _ in range(epochs):
+            for batch in self._batches(Xs[rng.permutation(len(Xs))]):
+                self._partial(batch)
+        self._relabel()
+        return self
+
+    def fit_file(self, path, chunksize=DEFAULT_CHUNKSIZE, epochs=1):
+        """Fit streaming dari file: pass 1 scaler, pass 2+ K-Means per chunk."""
+        cols = self.spec["features"]
+        for chunk in iter_chunks(path, chunksize, cols):
+            self.scaler.partial_fit(self.features(chunk))
+        for _ in range(epochs):
+            for chunk in iter_chunks(path, chunksize, cols):
+                for batch in self._batches(self.scaler.transform(self.features(chunk))):
+                    self._partial(batch)
+        self._relabel()
+        return self
+
+    def partial_fit(self, df):
+        """Perbarui centroid dengan rumah tangga baru (scaler tetap)."""
+        for batch in self._batches(self.scaler.transform(self.features(df))):
+            self._partial(batch)
+        self._relabel()
+        return self
+
+    def _partial(self, batch):
+        # partial_fit pertama butuh minimal n_clusters baris: batch kecil
+        # ditahan dan digabung sampai cukup
+        if not hasattr(self.kmeans, "cluster_centers_"):
+            if self._pending is not None:
+                batch = np.vstack([self._pending, batch])
+            if len(batch) < self.kmeans.n_clusters:
+                self._pending = batch
+                return
+            self._pending = None
+        self.kmeans.partial_fit(batch)
+
+    def _relabel(self):
+        if not hasattr(self.kmeans, "cluster_centers_"):
+            n = 0 if self._pending is None else len(self._pending)
+            raise ValueError(
+                f"Butuh minimal {self.kmeans.n_clusters} baris untuk fit segmentasi, baru {n}"
+            )
+        centers = self.kmeans.cluster_centers_
+        idx = self.spec["features"].index(self.spec["order_by"])
+        raw = centers[:, idx] * self.scaler.scale_[idx] + self.scaler.mean_[idx]
+        order = np.argsort(-raw, kind="stable")  # nilai tertinggi → label pertama
+        self.centroids = centers[order]
+        self._rank = order
+
+    def assign_codes(self, df, chunk=200_000):
+        """Kode segmen (urut label) via centroid terdekat, diproses per blok."""
+        Xs = self.scaler.transform(self.features(df))
+        c = self.centroids
+        c_sq = (c ** 2).sum(axis=1)
+        out = np.empty(len(Xs), dtype=np.int8)
+        for start in range(0, len(Xs), chunk):
+            block = Xs[start:start + chunk]
+            # ||x - c||² = ||x||² - 2x·c + ||c||²; ||x||² sama untuk semua c
+            out[start:start + chunk] = np.argmin(c_sq - 2 * block @ c.T, axis=1)
+        return out
+
+    def assign(self, df):
+        """Kolom kode & label segmen untuk df."""
+        codes = self.assign_codes(df)
+        labels = pd.Categorical.from_codes(codes, categories=self.spec["labels"], ordered=True)
+        return pd.DataFrame(
+            {self.spec["code_col"]: codes, self.spec["label_col"]: labels}, index=df.index
+        )
+
+    def centroid_table(self):
+        """Centroid dalam satuan asli, satu baris per label."""
+        raw = self.centroids * self.scaler.scale_ + self.scaler.mean_
+        return pd.DataFrame(raw, index=self.spec["labels"], columns=self.spec["features"])
+
+    def save(self, path):
+        # Simpan state (bukan objek) agar bisa dimuat walau disimpan dari `python -m`
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump({
+            "spec": self.spec, "batch_size": self.batch_size, "scaler": self.scaler,
+            "kmeans": self.kmeans, "centroids": self.centroids, "rank": self._rank,
+            "encoder_version": self.encoder.version,
+        }, path)
+        return path
+
+    @classmethod
+    def load(cls, path, encoder=None):
+        state = joblib.load(path)
+        model = cls(state["spec"], batch_size=state["batch_size"], encoder=encoder)
+        # Centroid kategori bergantung pada kode encoder saat fit
+        if state.get("encoder_version") != model.encoder.version:
+            raise ValueError(
+                f"Model segmentasi {os.path.basename(path)} dilatih dengan encoder "
+                f"{state.get('encoder_version')}, encoder aktif {model.encoder.version}; "
+                "latih ulang dengan `python -m dtsen.segmentation`"
+            )
+        model.scaler, model.kmeans = state["scaler"], state["kmeans"]
+        model.centroids, model._rank = state["centroids"], state["rank"]
+        return model
+
+
+def main(argv=None):
+    model_dir = argv[0] if argv else None
+    df = load_dataset("dtsen_with_scores.csv")
+    for name, spec in SPECS.items():
+        model = SegmentationModel(spec).fit(df)
+        path = model.save(model_path(name, model_dir))
+        counts = model.assign(df)[spec["label_col"]].value_counts(sort=False)
+        print(f"✅ Model {name} disimpan: {path}")
+        print(model.centroid_table()[[spec["order_by"]]].assign(jumlah=counts).to_string())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
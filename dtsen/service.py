@@ -0,0 +1,428 @@
+"""Layanan scoring real-time untuk satu rumah tangga.
+
+Semua artefak (encoder, model LightGBM kemiskinan & stunting, centroid
+segmentasi, IsolationForest anomali) dimuat sekali saat layanan dibuat dan
+diberi satu prediksi pemanasan, sehingga permintaan pertama tidak membayar
+biaya load. Encoding satu baris memakai tabel lookup dict yang disusun di
+awal (bukan pd.Categorical per permintaan), dan model dipanggil langsung
+lewat booster pada array NumPy.
+
+Permintaan yang datang bersamaan dikumpulkan menjadi micro-batch (maks.
+`max_batch` baris atau `max_wait_ms` milidetik), lalu di-score sekaligus di
+thread terpisah agar event loop tetap responsif. Latensi per permintaan
+dicatat untuk p50/p99.
+
+    python -m dtsen.service --port 8765     # GET /score/<nik>, POST /score, GET /metrics
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+
+import numpy as np
+
+from dtsen.anomaly import CompiledForest, load_anomaly_model
+from dtsen.banding import RISK_LABELS, RISK_THRESHOLDS
+from dtsen.encoding import UNKNOWN_CODE, get_encoder
+from dtsen.loader import NIK_COL, dataset_columns, load_dataset
+from dtsen.models import FEATURES, load_bundle
+from dtsen.segmentation import SPECS, SegmentationModel, model_path
+
+DEFAULT_PORT = 8765
+
+# Fitur turunan yang dihitung sendiri jika tidak dikirim klien
+DERIVED = {
+    "rasio_pengeluaran_pendapatan": ("pengeluaran_per_bulan", "pendapatan_per_bulan"),
+    "kepadatan_rumah": ("jumlah_anggota_keluarga", "luas_lantai"),
+}
+
+
+def _scaler(scaler):
+    """StandardScaler sebagai (mean, scale) agar transform tanpa validasi sklearn."""
+    return scaler.mean_, scaler.scale_
+
+
+def _ratio(num, den):
+    num, den = float(num), float(den)
+    return num / den if den > 0 else np.nan
+
+
+class RowCompiler:
+    """Penyusun matriks fitur dari record dict, lookup kategori sudah jadi."""
+
+    def __init__(self, features, encoder):
+        self.features = list(features)
+        self._steps = []
+        for c in self.features:
+            lookup = None
+            if c in encoder.columns:
+                lookup = {v: i for i, v in enumerate(encoder.categories[c])}
+            self._steps.append((c, lookup))
+
+    def matrix(self, records):
+        X = np.empty((len(records), len(self._steps)))
+        for i, record in enumerate(records):
+            for j, (c, lookup) in enumerate(self._steps):
+                v = record[c]
+                if lookup is not None:
+                    X[i, j] = lookup.get(str(v), UNKNOWN_CODE)
+                else:
+                    X[i, j] = np.nan if v is None else float(v)
+        return X
+
+
+class LatencyStats:
+    """Latensi per permintaan (jendela geser) dan ukuran micro-batch."""
+
+    def __init__(self, window=10_000):
+        self._latency = deque(maxlen=window)
+        self._batches = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._latency.append(seconds)
+            self.requests += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_batch(self, size):
+        with self._lock:
+            self._batches.append(size)
+
+    def summary(self):
+        with self._lock:
+            lat = np.array(self._latency)
+            batches = np.array(self._batches)
+            out = {"requests": self.requests, "errors": self.errors}
+        if len(lat):
+            p50, p99 = np.percentile(lat * 1000, [50, 99])
+            out.update(p50_ms=round(float(p50), 3), p99_ms=round(float(p99), 3))
+        if len(batches):
+            out["mean_batch"] = round(float(batches.mean()), 2)
+        return out
+
+
+class ScoringService:
+    def __init__(self, model_dir=None, max_batch=64, max_wait_ms=2.0):
+        self.encoder = get_encoder(model_dir)
+        self.bundles = [load_bundle(name, model_dir) for name in FEATURES]
+        for bundle in self.bundles:
+            if bundle["encoder_version"] != self.encoder.version:
+                raise ValueError(
+                    f"Model {bundle['name']} tidak cocok dengan encoder aktif; "
+                    "latih ulang dengan `python -m dtsen.models`"
+                )
+        self.segmenters = {
+            name: SegmentationModel.load(model_path(name, model_dir), self.encoder)
+            for name in SPECS
+        }
+        self.anomaly = load_anomaly_model(model_dir)
+        self._forest = CompiledForest(self.anomaly["model"])
+        self._anomaly_scaler = _scaler(self.anomaly["scaler"])
+        self._segment_scalers = {name: _scaler(m.scaler) for name, m in self.segmenters.items()}
+
+        self._model_rows = [
+            RowCompiler(b["cat_cols"] + b["num_cols"], self.encoder) for b in self.bundles
+        ]
+        self._segment_rows = {
+            name: RowCompiler(m.spec["features"], self.encoder)
+            for name, m in self.segmenters.items()
+        }
+        self._anomaly_rows = RowCompiler(self.anomaly["features"], self.encoder)
+        self.required = sorted(
+            {c for r in self._all_compilers() for c in r.features} - set(DERIVED)
+            | {c for pair in DERIVED.values() for c in pair}
+        )
+
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.stats = LatencyStats()
+        self._queue = None
+        self._register = None
+        self._register_lock = threading.Lock()
+        self._warm_up()
+
+    def _all_compilers(self):
+        return [*self._model_rows, *self._segment_rows.values(), self._anomaly_rows]
+
+    def _warm_up(self):
+        # Satu prediksi dummy: inisialisasi booster & scaler sebelum trafik nyata
+        record = {}
+        for c in self.required:
+            cats = self.encoder.categories.get(c)
+            record[c] = cats[0] if cats else 0.0
+        self.score_records([record])
+
+    # ------------------------------------------------------------------ scoring
+    def score_records(self, records):
+        """Skor sekumpulan record dict sekaligus (satu panggilan per model)."""
+        records = [self._complete(r) for r in records]
+        out = [{} for _ in records]
+        if NIK_COL in records[0]:
+            for o, r in zip(out, records):
+                o[NIK_COL] = r.get(NIK_COL)
+
+        for bundle, rows in zip(self.bundles, self._model_rows):
+            scores = bundle["model"].booster_.predict(rows.matrix(records))
+            # Sama dengan band_scores, tanpa membangun Categorical per permintaan
+            bands = np.searchsorted(RISK_THRESHOLDS, scores, side="right")
+            for o, s, b in zip(out, scores, bands):
+                o[bundle["score_col"]] = float(s)
+                o[bundle["score_col"].replace("_score", "_band")] = RISK_LABELS[b]
+
+        for name, model in self.segmenters.items():
+            mean, scale = self._segment_scalers[name]
+            Xs = (self._segment_rows[name].matrix(records) - mean) / scale
+            c = model.centroids
+            codes = np.argmin((c ** 2).sum(axis=1) - 2 * Xs @ c.T, axis=1)
+            for o, code in zip(out, codes):
+                o[model.spec["label_col"]] = model.spec["labels"][code]
+
+        mean, scale = self._anomaly_scaler
+        Xa = (self._anomaly_rows.matrix(records) - mean) / scale
+        raw = self._forest.score_samples(Xa)
+        flags = self._forest.predict(Xa, raw)
+        # score_samples: makin kecil makin janggal; dibalik supaya tinggi = mencurigakan
+        suspicion = -raw
+        for o, f, s in zip(out, flags, suspicion):
+            o["anomaly_label"] = "Anomali" if f == -1 else "Normal"
+            o["anomaly_score"] = float(s)
+        return out
+
+    def _complete(self, record):
+        missing = [c for c in self.required if c not in record]
+        if missing:
+            raise KeyError(f"Kolom hilang: {', '.join(missing)}")
+        derived = {
+            c: _ratio(record[num], record[den])
+            for c, (num, den) in DERIVED.items()
+            if record.get(c) is None
+        }
+        return {**record, **derived} if derived else record
+
+    # ----------------------------------------------------------- lookup NIK
+    def _load_register(self):
+        # Hanya kolom yang dibutuhkan RowCompiler (bukan seluruh feature store),
+        # disimpan sebagai array NumPy urut NIK agar lookup satu NIK murah
+        from dtsen.feature_store import BASE_FILE
+
+        with self._register_lock:
+            if self._register is None:
+                cols = [NIK_COL, "kelurahan", "kecamatan"] + [
+                    c for c in self.required if c not in (NIK_COL, "kelurahan", "kecamatan")
+                ]
+                available = set(dataset_columns(BASE_FILE))
+                frame = load_dataset(BASE_FILE, columns=[c for c in cols if c in available])
+                frame = frame.sort_values(NIK_COL, kind="stable")
+                self._register = {c: np.asarray(frame[c]) for c in frame.columns}
+        return self._register
+
+    def lookup(self, nik):
+        """Record register untuk satu NIK, atau None jika tidak terdaftar."""
+        arrays = self._load_register()
+        keys, nik = arrays[NIK_COL], int(nik)
+        i = np.searchsorted(keys, nik)
+        if i >= len(keys) or keys[i] != nik:
+            return None
+        return {c: arr[i].item() if hasattr(arr[i], "item") else arr[i] for c, arr in arrays.items()}
+
+    def score_nik(self, nik):
+        """Skor segar satu NIK secara sinkron (tanpa micro-batch)."""
+        start = time.perf_counter()
+        record = self.lookup(nik)
+        if record is None:
+            return None
+        result = self.score_records([record])[0]
+        result.update(kelurahan=record["kelurahan"], kecamatan=record["kecamatan"])
+        self.stats.record(time.perf_counter() - start)
+        return result
+
+    # ------------------------------------------------------------ micro-batch
+    async def score(self, record):
+        """Skor satu record lewat micro-batcher (dipanggil dari event loop)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            asyncio.get_running_loop().create_task(self._batcher())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(loop, batch)
+
+    async def _run_batch(self, loop, batch):
+        records = [r for r, _, _ in batch]
+        self.stats.record_batch(len(batch))
+        try:
+            results = await loop.run_in_executor(None, self.score_records, records)
+        except Exception:
+            # Satu record rusak jangan menggagalkan seluruh batch: ulangi per record
+            results = []
+            for record in records:
+                try:
+                    results.append(self.score_records([record])[0])
+                except Exception as exc:
+                    results.append(exc)
+        now = time.perf_counter()
+        for (_, future, start), result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.stats.record_error()
+                future.set_exception(result)
+            else:
+                self.stats.record(now - start)
+                future.set_result(result)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service(model_dir=None):
+    """Layanan in-process (dimuat sekali per proses)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScoringService(model_dir)
+        return _service
+
+
+class ScoringClient:
+    """Klien HTTP tipis untuk layanan yang berjalan di proses lain."""
+
+    def __init__(self, url, timeout=2.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _get(self, path):
+        try:
+            with urllib.request.urlopen(self.url + path, timeout=self.timeout) as resp:
+                return json.load(resp)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 404:
+                return None
+            raise
+
+    def score_nik(self, nik):
+        return self._get(f"/score/{int(nik)}")
+
+    def metrics(self):
+        return self._get("/metrics")
+
+
+def score_nik(nik, url=None):
+    """Skor satu NIK: lewat HTTP jika DTSEN_SCORING_URL di-set, selainnya in-process."""
+    url = url or os.environ.get("DTSEN_SCORING_URL")
+    if url:
+        return ScoringClient(url).score_nik(nik)
+    return get_service().score_nik(nik)
+
+
+# ---------------------------------------------------------------- HTTP server
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+async def _respond(writer, status, payload):
+    body = json.dumps(payload, default=str).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+    await writer.drain()
+    writer.close()
+
+
+async def _handle(service, reader, writer):
+    try:
+        request_line = (await reader.readline()).decode().split()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if len(request_line) < 2:
+            return await _respond(writer, 400, {"error": "Permintaan tidak valid"})
+        method, path = request_line[0], request_line[1]
+
+        if method == "GET" and path == "/metrics":
+            return await _respond(writer, 200, service.stats.summary())
+        if method == "GET" and path == "/health":
+            return await _respond(writer, 200, {"status": "ok"})
+        if method == "GET" and path.startswith("/score/"):
+            record = service.lookup(path.rsplit("/", 1)[1])
+            if record is None:
+                return await _respond(writer, 404, {"error": "NIK tidak ditemukan"})
+            result = await service.score(record)
+            result.update(kelurahan=record["kelurahan"], kecamatan=record["kecamatan"])
+            return await _respond(writer, 200, result)
+        if method == "POST" and path == "/score":
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            payload = json.loads(body)
+            records = payload if isinstance(payload, list) else [payload]
+            if not all(isinstance(r, dict) for r in records):
+                raise TypeError("Body harus objek JSON atau daftar objek")
+            if isinstance(payload, list):
+                results = await asyncio.gather(*(service.score(r) for r in payload))
+                return await _respond(writer, 200, results)
+            return await _respond(writer, 200, await service.score(payload))
+        return await _respond(writer, 404 if method in ("GET", "POST") else 405,
+                              {"error": f"{method} {path} tidak tersedia"})
+    except asyncio.IncompleteReadError:
+        await _respond(writer, 400, {"error": "Body tidak lengkap"})
+    except (KeyError, ValueError, TypeError) as exc:
+        await _respond(writer, 400, {"error": str(exc).strip("'\"")})
+    except Exception as exc:
+        # Jangan biarkan koneksi menggantung tanpa jawaban
+        service.stats.record_error()
+        await _respond(writer, 500, {"error": f"{type(exc).__name__}: {exc}"})
+
+
+async def serve(service, host="127.0.0.1", port=DEFAULT_PORT):
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+    print(f"✅ Layanan scoring siap di http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan scoring real-time DTSEN")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model-dir", default=None)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    service = ScoringService(args.model_dir, args.max_batch, args.max_wait_ms)
+    service.lookup(0)  # muat register sebelum menerima trafik
+    print(f"Model & register dimuat dalam {time.perf_counter() - start:.2f} detik")
+    asyncio.run(serve(service, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Format snapshot kolumnar (Parquet) untuk dataset DTSEN.
+
+Kolom kategori disimpan dengan dictionary encoding, sehingga nilai seperti
+"Padang Panjang Barat" hanya ditulis sekali per row group. Pembacaan bisa
+memilih kolom tertentu saja (column projection), jadi halaman dashboard
+tidak perlu membaca 45+ kolom register untuk menampilkan 5 kolom.
+
+Migrasi CSV lama:
+
+    python -m dtsen.snapshot                 # semua CSV DTSEN bawaan
+    python -m dtsen.snapshot file_a.csv ...  # file tertentu
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dtsen.loader import CATEGORY_COLS, DATA_DIR, read_csv_typed
+
+SNAPSHOT_EXT = ".parquet"
+
+# CSV keluaran notebook yang dimigrasikan secara default
+DTSEN_CSVS = [
+    "dtsen_clean_padangpanjang.csv",
+    "dtsen_with_scores.csv",
+    "dtsen_with_segments.csv",
+    "dtsen_with_anomalies.csv",
+    "dtsen_update_2026.csv",
+]
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_EXT
+
+
+def write_snapshot(df, path, compression="zstd"):
+    """Tulis DataFrame ke Parquet; kolom kategori → dictionary encoding."""
+    df = df.copy(deep=False)
+    for c in CATEGORY_COLS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, path, compression=compression, use_dictionary=True)
+    return path
+
+
+def read_snapshot(path, columns=None):
+    """Baca snapshot; `columns` membatasi kolom yang didekode dari disk.
+
+    Kolom yang tidak ada di skema → KeyError (sama dengan read_csv_typed).
+    """
+    if columns:
+        names = snapshot_columns(path)
+        missing = [c for c in columns if c not in names]
+        if missing:
+            raise KeyError(f"Kolom tidak ada di {os.path.basename(path)}: {missing}")
+    table = pq.read_table(path, columns=list(columns) if columns else None)
+    return table.to_pandas()
+
+
+def snapshot_columns(path):
+    return pq.read_schema(path).names
+
+
+class ChunkWriter:
+    """Penulis keluaran inkremental (CSV append atau Parquet row group)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._pq = None
+        self._first = True
+
+    def write(self, df):
+        if self.path.endswith(".parquet"):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._pq is None:
+                self._pq = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            else:
+                # Chunk kosong / unit timestamp berbeda → samakan dengan skema file
+                table = table.cast(self._pq.schema)
+            self._pq.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._pq is not None:
+            self._pq.close()
+
+
+def convert_csv(csv_path, out_path=None):
+    """Migrasi satu CSV ke snapshot Parquet di sebelahnya."""
+    out_path = out_path or snapshot_path(csv_path)
+    df = read_csv_typed(csv_path)
+    write_snapshot(df, out_path)
+    return out_path
+
+
+def main(argv=None):
+    paths = argv if argv else [os.path.join(DATA_DIR, f) for f in DTSEN_CSVS]
+    for csv_path in paths:
+        if not os.path.exists(csv_path):
+            print(f"⚠️ Lewati {csv_path} (tidak ditemukan)")
+            continue
+        start = time.perf_counter()
+        out = convert_csv(csv_path)
+        elapsed = time.perf_counter() - start
+        size_csv = os.path.getsize(csv_path) / 1024
+        size_pq = os.path.getsize(out) / 1024
+        print(
+            f"✅ {os.path.basename(csv_path)} → {os.path.basename(out)}: "
+            f"{size_csv:.0f} KB → {size_pq:.0f} KB ({elapsed:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
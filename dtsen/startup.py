@@ -0,0 +1,51 @@
+"""Pencatatan waktu cold start dashboard.
+
+Modul ini diimpor paling awal oleh app.py, jadi `_T0` kira-kira adalah saat
+skrip Streamlit pertama kali jalan di proses ini. Yang dicatat:
+
+- waktu impor pertama setiap modul halaman (termasuk library berat yang
+  ditarik halaman itu),
+- waktu render pertama setiap halaman, dan
+- waktu dari `_T0` sampai render pertama selesai (time to first render).
+
+Pengukuran cold start di proses baru (tanpa cache impor sama sekali) ada
+di `benchmarks/bench_startup.py`.
+"""
+import threading
+import time
+
+_T0 = time.perf_counter()
+
+_lock = threading.Lock()
+_stats = {"first_render_s": None, "pages": {}}
+
+
+def _page(name):
+    return _stats["pages"].setdefault(
+        name, {"import_s": None, "first_render_s": None, "last_render_s": None, "renders": 0}
+    )
+
+
+def record_import(page, seconds):
+    with _lock:
+        _page(page)["import_s"] = seconds
+
+
+def record_render(page, seconds):
+    """Catat satu render halaman; render pertama proses juga dicatat."""
+    with _lock:
+        stats = _page(page)
+        if stats["first_render_s"] is None:
+            stats["first_render_s"] = seconds
+        stats["last_render_s"] = seconds
+        stats["renders"] += 1
+        if _stats["first_render_s"] is None:
+            _stats["first_render_s"] = time.perf_counter() - _T0
+
+
+def startup_stats():
+    with _lock:
+        return {
+            "first_render_s": _stats["first_render_s"],
+            "pages": {k: dict(v) for k, v in _stats["pages"].items()},
+        }
@@ -0,0 +1,335 @@
+"""Generator register DTSEN sintetis untuk skala kota sampai provinsi.
+
+Skema keluaran sama dengan dtsen_with_scores.csv. Distribusi diambil dari
+data repo:
+
+- kolom kategori: proporsi di dtsen_clean_padangpanjang.csv (jenis_bansos
+  bersyarat pada penerima_bansos, kecamatan mengikuti kelurahan),
+- kolom numerik: kuantil empiris (pengeluaran lewat rasio terhadap
+  pendapatan, supaya korelasinya tetap ~0.93), is_poor bersyarat pada
+  desil pendapatan,
+- bobot kelurahan: populasi terakhir di ts_penduduk_kelurahan_2019_2025.csv,
+- skor & cluster: distribusi di dtsen_with_scores.csv.
+
+Di atas HOUSEHOLDS_PER_KOTA rumah tangga, register diperluas menjadi
+beberapa kota sintetis (setiap kota menyalin 16 kelurahan Padang Panjang
+dengan sufiks nomor kota), sehingga kardinalitas kelurahan ikut tumbuh
+seperti data provinsi. Sebagian kecil baris sengaja diduplikasi (nama &
+alamat sama, NIK berbeda) untuk beban deteksi anomali.
+
+Pembangkitan berjalan per chunk dengan seed turunan per chunk, jadi
+hasilnya deterministik dan memori tetap sebesar satu chunk.
+
+    python -m dtsen.synthetic 1000000 register_1m.parquet
+    python -m dtsen.synthetic 100000 reg.csv --timeseries ts.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dtsen.loader import DEFAULT_CHUNKSIZE, NIK_COL, load_dataset
+from dtsen.snapshot import ChunkWriter
+
+CLEAN_FILE = "dtsen_clean_padangpanjang.csv"
+SCORES_FILE = "dtsen_with_scores.csv"
+TS_FILE = "ts_penduduk_kelurahan_2019_2025.csv"
+
+NIK_START = 3201000000000000
+HOUSEHOLDS_PER_KOTA = 50_000
+DUPLICATE_RATE = 0.001
+QUANTILES = np.linspace(0, 1, 101)
+
+# Kolom kategori yang diambil langsung dari proporsi marginal
+MARGINAL_COLS = [
+    "status_kepemilikan_rumah", "jenis_lantai", "jenis_dinding", "jenis_atap",
+    "sumber_air_minum", "sumber_penerangan", "jenis_kloset", "fasilitas_buang_tinja",
+    "akses_internet", "akses_listrik", "pendidikan_kepala_keluarga",
+    "pekerjaan_kepala_keluarga", "status_perkawinan", "kepemilikan_lahan",
+    "kepemilikan_kendaraan", "kepemilikan_tabungan", "penerima_bansos",
+    "status_stunting", "akses_fasilitas_kesehatan", "riwayat_penyakit_kronis",
+    "disabilitas",
+]
+# Kolom bilangan bulat berkardinalitas rendah → proporsi per nilai
+DISCRETE_COLS = [
+    "jumlah_anggota_keluarga", "rt", "rw", "jumlah_kamar_tidur",
+    "jumlah_anak_balita", "jumlah_anak_sekolah", "cluster",
+]
+# Kolom kontinu → inverse CDF dari kuantil empiris
+CONTINUOUS_COLS = ["luas_lantai", "pendapatan_per_bulan", "risk_score", "stunting_risk_score"]
+
+
+def _proportions(values):
+    counts = pd.Series(values).value_counts(sort=False).sort_index()
+    return np.asarray(counts.index), (counts / counts.sum()).to_numpy()
+
+
+def fit_profile(clean=None, scores=None, ts=None):
+    """Ringkasan distribusi dari dataset repo (semua argumen opsional)."""
+    clean = load_dataset(CLEAN_FILE) if clean is None else clean
+    scores = load_dataset(SCORES_FILE) if scores is None else scores
+    ts = load_dataset(TS_FILE) if ts is None else ts
+
+    names = clean["nama_kepala_keluarga"].astype(str).str.split(" ", n=1, expand=True)
+    pendapatan = clean["pendapatan_per_bulan"].to_numpy(dtype=float)
+    rasio = clean["pengeluaran_per_bulan"].to_numpy(dtype=float) / pendapatan
+    deciles = np.quantile(pendapatan, np.linspace(0, 1, 11)[1:-1])
+    poor_by_decile = (
+        clean["is_poor"].groupby(np.searchsorted(deciles, pendapatan)).mean()
+        .reindex(range(10), fill_value=clean["is_poor"].mean()).to_numpy()
+    )
+
+    latest = ts.sort_values("date").groupby("kelurahan", observed=True).last()
+    kec_of = (clean.groupby("kelurahan", observed=True)["kecamatan"]
+              .agg(lambda s: s.astype(str).mode()[0]))
+    kelurahan = [k for k in latest.index.astype(str) if k in kec_of.index]
+    weights = latest.loc[kelurahan, "population"].to_numpy(dtype=float)
+
+    dates = pd.to_datetime(clean["tanggal_update"], errors="coerce").dropna()
+    day0 = dates.min()
+    bansos = {
+        str(k): _proportions(g.astype(str))
+        for k, g in clean.groupby("penerima_bansos", observed=True)["jenis_bansos"]
+    }
+    return {
+        "columns": list(scores.columns),
+        "marginal": {c: _proportions(clean[c].astype(str)) for c in MARGINAL_COLS},
+        "discrete": {c: _proportions(scores[c]) for c in DISCRETE_COLS},
+        "quantiles": {
+            **{c: np.quantile(scores[c].to_numpy(dtype=float), QUANTILES) for c in CONTINUOUS_COLS},
+            "rasio_pengeluaran": np.quantile(rasio, QUANTILES),
+            "hari_update": np.quantile((dates - day0).dt.days.to_numpy(), QUANTILES),
+        },
+        "jenis_bansos": bansos,
+        "poor_deciles": deciles,
+        "poor_by_decile": poor_by_decile,
+        "first_names": _proportions(names[0]),
+        "last_names": _proportions(names[1].fillna("")),
+        "alamat_max": int(clean["alamat"].astype(str).str.extract(r"(\d+)$")[0].astype(float).max()),
+        "kelurahan": kelurahan,
+        "kelurahan_weights": weights / weights.sum(),
+        "kecamatan_of": {k: str(kec_of[k]) for k in kelurahan},
+        "kabupaten_kota": str(clean["kabupaten_kota"].astype(str).mode()[0]),
+        "provinsi": str(clean["provinsi"].astype(str).mode()[0]),
+        "day0": day0,
+        "ts": _fit_timeseries(ts),
+    }
+
+
+def _fit_timeseries(ts):
+    """Per kelurahan: level awal, tren per bulan, sd residual, proporsi migrasi."""
+    out = {}
+    for kel, g in ts.sort_values("date").groupby("kelurahan", observed=True):
+        y = g["population"].to_numpy(dtype=float)
+        t = np.arange(len(y))
+        slope, level = np.polyfit(t, y, 1)
+        out[str(kel)] = {
+            "level": level, "slope": slope, "sd": float(np.std(y - (level + slope * t))),
+            "mig_in": _proportions(g["mig_in"]), "mig_out": _proportions(g["mig_out"]),
+        }
+    return out
+
+
+def kota_names(profile, n_kota):
+    base = profile["kabupaten_kota"]
+    return [base] + [f"Kota Sintetis {k + 1:03d}" for k in range(1, n_kota)]
+
+
+def region_categories(profile, n_kota):
+    """Kelurahan & kecamatan semua kota (kategori tetap antar chunk).
+
+    Kembalikan (daftar kelurahan, daftar kecamatan, kode kecamatan per kelurahan).
+    """
+    kelurahan, kec_of_kel = [], []
+    kecamatan = {}
+    for k in range(n_kota):
+        suffix = "" if k == 0 else f" {k + 1:03d}"
+        for name in profile["kelurahan"]:
+            kelurahan.append(f"{name}{suffix}")
+            kec = f"{profile['kecamatan_of'][name]}{suffix}"
+            kec_of_kel.append(kecamatan.setdefault(kec, len(kecamatan)))
+    return kelurahan, list(kecamatan), np.asarray(kec_of_kel)
+
+
+def _choice(rng, values_probs, n):
+    values, probs = values_probs
+    return np.asarray(values)[rng.choice(len(values), n, p=probs)]
+
+
+def _inverse_cdf(rng, quantiles, n):
+    return np.interp(rng.random(n), QUANTILES, quantiles)
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def generate_chunk(profile, start, n, rng, n_kota, duplicate_rate=DUPLICATE_RATE):
+    """Baris ke-`start` s.d. `start + n` register sintetis sebagai DataFrame."""
+    q = profile["quantiles"]
+    rows = np.arange(start, start + n)
+    kelurahan_cats, kecamatan_cats, kec_of_kel = region_categories(profile, n_kota)
+    per_kota = len(profile["kelurahan"])
+
+    # Register diurutkan per kota (seperti ekspor per wilayah)
+    kota = np.minimum(rows // HOUSEHOLDS_PER_KOTA, n_kota - 1)
+    kel_code = kota * per_kota + rng.choice(per_kota, n, p=profile["kelurahan_weights"])
+
+    first_vals, first_p = profile["first_names"]
+    last_vals, last_p = profile["last_names"]
+    name_cats = [f"{a} {b}".strip() for a in first_vals for b in last_vals]
+    alamat_cats = [f"Jl. Contoh No.{i}" for i in range(1, profile["alamat_max"] + 1)]
+    identity = {
+        "nama_kepala_keluarga": rng.choice(len(first_vals), n, p=first_p) * len(last_vals)
+        + rng.choice(len(last_vals), n, p=last_p),
+        "alamat": rng.integers(0, len(alamat_cats), n),
+        "rt": _choice(rng, profile["discrete"]["rt"], n),
+        "rw": _choice(rng, profile["discrete"]["rw"], n),
+        "kelurahan": kel_code,
+    }
+    if duplicate_rate and n > 1:
+        # Duplikat: salin nama & alamat baris lain di chunk yang sama, NIK baru
+        dup = rng.random(n) < duplicate_rate
+        src = rng.integers(0, n, dup.sum())
+        for values in identity.values():
+            values[dup] = values[src]
+    kel_code = identity["kelurahan"]
+
+    df = pd.DataFrame({
+        NIK_COL: NIK_START + rows,
+        "nama_kepala_keluarga": _categorical(identity["nama_kepala_keluarga"], name_cats),
+        "jumlah_anggota_keluarga": _choice(rng, profile["discrete"]["jumlah_anggota_keluarga"], n),
+        "alamat": _categorical(identity["alamat"], alamat_cats),
+        "rt": identity["rt"],
+        "rw": identity["rw"],
+        "kelurahan": _categorical(kel_code, kelurahan_cats),
+        "kecamatan": _categorical(kec_of_kel[kel_code], kecamatan_cats),
+        "kabupaten_kota": _categorical(kota, kota_names(profile, n_kota)),
+        "provinsi": _categorical(np.zeros(n, dtype=np.int8), [profile["provinsi"]]),
+    })
+    for c in MARGINAL_COLS:
+        values, probs = profile["marginal"][c]
+        df[c] = _categorical(rng.choice(len(values), n, p=probs), list(values))
+    for c in ["jumlah_kamar_tidur", "jumlah_anak_balita", "jumlah_anak_sekolah", "cluster"]:
+        df[c] = _choice(rng, profile["discrete"][c], n)
+    df["luas_lantai"] = _inverse_cdf(rng, q["luas_lantai"], n).round().astype(np.int64)
+
+    pendapatan = _inverse_cdf(rng, q["pendapatan_per_bulan"], n).round()
+    pengeluaran = (pendapatan * _inverse_cdf(rng, q["rasio_pengeluaran"], n)).round()
+    df["pendapatan_per_bulan"] = pendapatan.astype(np.int64)
+    df["pengeluaran_per_bulan"] = pengeluaran.astype(np.int64)
+    decile = np.searchsorted(profile["poor_deciles"], pendapatan)
+    df["is_poor"] = (rng.random(n) < profile["poor_by_decile"][decile]).astype(np.int64)
+
+    # jenis_bansos bersyarat pada penerima_bansos
+    bansos_cats = sorted({v for vals, _ in profile["jenis_bansos"].values() for v in vals})
+    penerima = df["penerima_bansos"].astype(str).to_numpy()
+    jenis = np.zeros(n, dtype=np.int16)
+    for status, (vals, probs) in profile["jenis_bansos"].items():
+        mask = penerima == status
+        jenis[mask] = np.searchsorted(bansos_cats, _choice(rng, (vals, probs), mask.sum()))
+    df["jenis_bansos"] = _categorical(jenis, bansos_cats)
+
+    days = _inverse_cdf(rng, q["hari_update"], n).round()
+    df["tanggal_update"] = profile["day0"] + pd.to_timedelta(days, unit="D")
+    df["rasio_pengeluaran_pendapatan"] = pengeluaran / pendapatan
+    df["kepadatan_rumah"] = df["jumlah_anggota_keluarga"] / df["luas_lantai"]
+    df["risk_score"] = _inverse_cdf(rng, q["risk_score"], n)
+    df["stunting_risk_score"] = _inverse_cdf(rng, q["stunting_risk_score"], n)
+    return df[profile["columns"]]
+
+
+def n_kota_for(n, households_per_kota=HOUSEHOLDS_PER_KOTA):
+    return max(1, -(-n // households_per_kota))
+
+
+def generate(n, seed=42, chunksize=DEFAULT_CHUNKSIZE, duplicate_rate=DUPLICATE_RATE, profile=None):
+    """Yield chunk register sintetis berisi total `n` rumah tangga."""
+    profile = profile or fit_profile()
+    n_kota = n_kota_for(n)
+    n_chunks = max(1, -(-n // chunksize))
+    # Seed turunan per chunk → chunk ke-i selalu sama, berapa pun chunksize lain
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        start = i * chunksize
+        yield generate_chunk(profile, start, min(chunksize, n - start),
+                             np.random.default_rng(child), n_kota, duplicate_rate)
+
+
+def write_register(dst, n, seed=42, chunksize=DEFAULT_CHUNKSIZE, duplicate_rate=DUPLICATE_RATE,
+                   profile=None):
+    """Tulis register sintetis ke CSV/Parquet; kembalikan ringkasan."""
+    profile = profile or fit_profile()
+    start = time.perf_counter()
+    writer = ChunkWriter(dst)
+    rows = chunks = 0
+    try:
+        for chunk in generate(n, seed, chunksize, duplicate_rate, profile):
+            if not dst.endswith(".parquet"):
+                chunk = chunk.assign(tanggal_update=chunk["tanggal_update"].dt.strftime("%Y-%m-%d"))
+            writer.write(chunk)
+            rows += len(chunk)
+            chunks += 1
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "kota": n_kota_for(n),
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("nan"),
+    }
+
+
+def generate_timeseries(kelurahan, months=81, start="2019-01-01", seed=42, profile=None):
+    """Deret penduduk bulanan per kelurahan (skema ts_penduduk_kelurahan).
+
+    Kelurahan sintetis ("<nama> 002") memakai parameter kelurahan asalnya
+    dengan skala acak, jadi forecast bisa diuji untuk ribuan kelurahan.
+    """
+    profile = profile or fit_profile()
+    params = profile["ts"]
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=months, freq="MS")
+    t = np.arange(months)
+    parts = []
+    for kel in kelurahan:
+        base = params.get(str(kel)) or params[str(kel).rsplit(" ", 1)[0]]
+        scale = 1.0 if str(kel) in params else rng.normal(1.0, 0.1)
+        y = scale * (base["level"] + base["slope"] * t) + rng.normal(0, base["sd"] * scale, months)
+        parts.append(pd.DataFrame({
+            "date": dates,
+            "kelurahan": kel,
+            "population": y,
+            "mig_in": _choice(rng, base["mig_in"], months),
+            "mig_out": _choice(rng, base["mig_out"], months),
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator register DTSEN sintetis")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("dst", help="keluaran .csv atau .parquet")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--duplicate-rate", type=float, default=DUPLICATE_RATE)
+    parser.add_argument("--timeseries", help="tulis juga deret penduduk per kelurahan (.csv)")
+    args = parser.parse_args(argv)
+
+    profile = fit_profile()
+    report = write_register(args.dst, args.rows, args.seed, args.chunksize,
+                            args.duplicate_rate, profile)
+    print(
+        f"✅ {report['rows']:,} rumah tangga sintetis ({report['kota']} kota) dalam "
+        f"{report['seconds']:.2f}s ({report['rows_per_sec']:,.0f} baris/detik) → {args.dst}"
+    )
+    if args.timeseries:
+        kelurahan = region_categories(profile, report["kota"])[0]
+        generate_timeseries(kelurahan, seed=args.seed, profile=profile).to_csv(args.timeseries, index=False)
+        print(f"✅ Deret penduduk {len(kelurahan)} kelurahan → {args.timeseries}")
+
+
+if __name__ == "__main__":
+    main()
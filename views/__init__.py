@@ -0,0 +1,38 @@
+"""Halaman dashboard, satu modul per use case di menu sidebar.
+
+Modul halaman diimpor lazy saat pertama kali dibuka, jadi library berat
+(sklearn, LightGBM, matplotlib, altair) dan dataset hanya dimuat untuk
+halaman yang benar-benar dipakai. Paket ini sendiri sengaja ringan: hanya
+registri halaman tanpa impor pandas/streamlit.
+"""
+import importlib
+import sys
+import time
+
+from dtsen import startup
+from dtsen.instrument import span
+
+# Label menu → nama modul di paket views (urutan = urutan di sidebar)
+PAGES = {
+    "Prediksi Kemiskinan": "kemiskinan",
+    "Prediksi Stunting": "stunting",
+    "Clustering Hunian Kumuh": "hunian",
+    "Forecast Migrasi & Pertumbuhan Penduduk Kota": "penduduk",
+    "Segmentasi Sosial-Ekonomi": "segmentasi",
+    "Deteksi Anomali Bansos": "anomali",
+    "Prediksi Layanan Publik": "layanan",
+    "Monitoring Program Kota": "monitoring",
+    "Early Warning Krisis Ekonomi": "early_warning",
+}
+
+
+def load_page(label):
+    """Impor modul halaman untuk `label`; waktu impor pertama dicatat."""
+    name = f"{__name__}.{PAGES[label]}"
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    with span("import"):
+        module = importlib.import_module(name)
+    startup.record_import(PAGES[label], time.perf_counter() - start)
+    return module
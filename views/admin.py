@@ -0,0 +1,55 @@
+"""Panel admin: span hot path, memori, cProfile, dan ekspor metrik.
+
+Tidak terdaftar di PAGES; app.py memuatnya hanya jika ?admin=1 atau
+DTSEN_ADMIN=1.
+"""
+import json
+
+import pandas as pd
+import streamlit as st
+
+from dtsen import instrument
+
+
+def _mb(value):
+    return f"{value / 2**20:,.1f} MB" if value is not None else "-"
+
+
+def render_panel(slot, halaman):
+    with slot.expander("🛠️ Panel Admin (Instrumentasi)"):
+        spans = instrument.span_stats()
+        st.write(f"**Span tercatat:** {len(spans)}")
+        if spans:
+            table = pd.DataFrame.from_dict(spans, orient="index").sort_values("total_s", ascending=False)
+            table.index.name = "span"
+            st.dataframe(table[["count", "total_s", "p50_s", "p95_s", "max_s", "last_s", "rss_delta_bytes"]]
+                         .head(30), width="stretch")
+
+        # --- Memori ---
+        st.write(f"**RSS:** {_mb(instrument.rss_bytes())} (puncak {_mb(instrument.max_rss_bytes())})")
+        tracing = st.checkbox("tracemalloc (alokasi per baris)", key="admin_tracemalloc")
+        if tracing:
+            instrument.start_tracemalloc()
+        else:
+            instrument.stop_tracemalloc()
+        snap = instrument.memory_snapshot(f"admin:{halaman}")
+        if "top" in snap:
+            st.write(f"Teralokasi: {_mb(snap['traced_bytes'])} (puncak {_mb(snap['traced_peak_bytes'])})")
+            st.dataframe(pd.DataFrame(snap["top"]), width="stretch")
+
+        # --- cProfile ---
+        st.checkbox("cProfile halaman (berlaku mulai rerun berikutnya)", key="admin_profile")
+        prof = instrument.profiles().get(halaman)
+        if prof is not None:
+            st.caption(f"Profil terakhir {halaman}: {prof['seconds']:.3f} s")
+            st.code(prof["text"], language=None)
+            st.download_button("Unduh .prof", prof["pstats"], file_name=f"{halaman}.prof",
+                               key="admin_prof_dl")
+
+        # --- Ekspor ---
+        st.download_button("Unduh JSON", json.dumps(instrument.to_json(), indent=2, default=str),
+                           file_name="dtsen_metrics.json", mime="application/json", key="admin_json")
+        st.download_button("Unduh Prometheus", instrument.to_prometheus(),
+                           file_name="dtsen_metrics.prom", mime="text/plain", key="admin_prom")
+        if st.button("Reset metrik", key="admin_reset"):
+            instrument.reset()
@@ -0,0 +1,57 @@
+"""Use case 6: deteksi anomali data penduduk (fraud bansos)."""
+import streamlit as st
+
+from dtsen.anomaly import get_suspicion_ranking, suspicion_version
+from dtsen.charts import count_png
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from views.common import paged_table
+
+
+def render():
+    st.header("🚨 Deteksi Anomali Data Penduduk (Fraud Bansos)")
+    st.write("""
+    **Tujuan:** Mengidentifikasi keluarga penerima bansos yang mencurigakan (fraud/duplikasi).  
+    **Data DTSEN:** NIK, pendapatan, status penerima bansos.  
+    **Model:** Isolation Forest → label: Normal / Anomali.
+    """)
+
+    # Load dataset dengan anomali
+    # Hanya kolom yang ditampilkan yang dibaca (column projection)
+    with span("load"):
+        df_anom = load_dataset("dtsen_with_anomalies.csv", columns=["anomaly_label"])
+
+    # Ringkasan jumlah anomali
+    st.subheader("Ringkasan")
+    paged_table(df_anom["anomaly_label"].value_counts().reset_index(), "anomali_ringkasan", filters=())
+
+    # Visualisasi
+    with span("chart"):
+        st.image(count_png(df_anom["anomaly_label"].value_counts().reindex(["Normal","Anomali"], fill_value=0),
+                           ("anomaly_label", dataset_version("dtsen_with_anomalies.csv")),
+                           colors=["#2ecc71","#e74c3c"], xlabel="anomaly_label"), width="stretch")
+
+    # Peringkat kecurigaan: outlier IsolationForest + kandidat duplikat nama/alamat
+    st.subheader("Peringkat Kecurigaan")
+    st.caption("Skor = 0.6 × kemiripan duplikat (nama, alamat, RT/RW) + 0.4 × persentil skor outlier.")
+    try:
+        with span("ranking"):
+            ranking, dup_pairs = get_suspicion_ranking("dtsen_with_anomalies.csv")
+            versi_anom = suspicion_version("dtsen_with_anomalies.csv")
+    except FileNotFoundError:
+        st.warning("Model anomali belum tersedia. Jalankan `python -m dtsen.anomaly`.")
+        return
+    except ValueError as exc:
+        st.warning(f"{exc}.")
+        return
+    paged_table(
+        ranking, "anomali",
+        columns=["nik_kepala_keluarga","nama_kepala_keluarga","kelurahan","skor_kecurigaan",
+                 "alasan","nik_duplikat","kemiripan","anomaly_score"],
+        version=versi_anom, sort="skor_kecurigaan", ascending=False,
+        labels=("alasan",), ranges=("skor_kecurigaan",),
+    )
+
+    st.subheader(f"Kandidat Duplikat ({len(dup_pairs)} pasangan)")
+    paged_table(dup_pairs, "duplikat", version=versi_anom, sort="kemiripan", ascending=False,
+                filters=(), labels=("jenis",))
@@ -0,0 +1,59 @@
+"""Komponen bersama halaman dashboard."""
+import streamlit as st
+
+from dtsen.instrument import span
+from dtsen.query import get_table_index
+
+
+def paged_table(data, key, columns=None, version=None, sort=None, ascending=True,
+                filters=("kelurahan", "kecamatan"), labels=(), ranges=(), where=None,
+                page_size=20, render=True):
+    """Tabel dengan filter, urut & paging di sisi server (hanya satu halaman dikirim).
+
+    filters → selectbox satu nilai, labels → multiselect, ranges → slider rentang.
+    Kembalikan (frame halaman, total baris cocok).
+    """
+    with span(f"tabel:{key}"):
+        return _paged_table(data, key, columns, version, sort, ascending, filters, labels,
+                            ranges, where, page_size, render)
+
+
+def _paged_table(data, key, columns, version, sort, ascending, filters, labels, ranges, where,
+                 page_size, render):
+    index = get_table_index(key, data, version)
+    filters = [c for c in filters if c in data.columns]
+    labels = [c for c in labels if c in data.columns]
+    ranges = [c for c in ranges if c in data.columns]
+    where, between = dict(where or {}), {}
+
+    widgets = filters + labels + ranges
+    slots = iter(st.columns(len(widgets))) if widgets else iter(())
+    for c in filters:
+        nama = c.replace("_", " ").title()
+        pilihan = next(slots).selectbox(f"Filter {nama}", ["Semua"] + index.options(data, c), key=f"{key}_{c}")
+        if pilihan != "Semua":
+            where[c] = pilihan
+    for c in labels:
+        where[c] = next(slots).multiselect(c.replace("_", " ").title(), index.options(data, c), key=f"{key}_{c}")
+    for c in ranges:
+        lo, hi = index.bounds(data, c)
+        if lo < hi:
+            rentang = next(slots).slider(c.replace("_", " ").title(), lo, hi, (lo, hi), key=f"{key}_{c}")
+            if rentang != (lo, hi):
+                between[c] = rentang
+
+    page_key = f"{key}_page"
+    page = int(st.session_state.get(page_key, 1))
+    with span("query"):
+        frame, total = index.query(data, where, between, sort, ascending, page - 1, page_size, columns)
+        n_pages = max(1, -(-total // page_size))
+        if page > n_pages:
+            # Filter mempersempit hasil → kembali ke halaman terakhir yang ada
+            page = st.session_state[page_key] = n_pages
+            frame, total = index.query(data, where, between, sort, ascending, page - 1, page_size, columns)
+    if n_pages > 1:
+        st.number_input(f"Halaman (dari {n_pages}, {total} baris)", min_value=1, max_value=n_pages, key=page_key)
+    if render:
+        with span("serialize"):
+            st.dataframe(frame)
+    return frame, total
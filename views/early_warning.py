@@ -0,0 +1,65 @@
+"""Use case 9: early warning krisis ekonomi lokal."""
+import streamlit as st
+
+from dtsen.early_warning import detect, get_monthly_store
+from dtsen.instrument import span
+from dtsen.loader import dataset_columns
+from views.common import paged_table
+
+
+def render():
+    st.header("🚨 Early Warning Krisis Ekonomi Lokal")
+    st.write("""
+    **Tujuan:** Sistem peringatan dini bila pendapatan masyarakat turun drastis atau penerima bansos meningkat tajam.  
+    **Data DTSEN:** Pendapatan per bulan, status pekerjaan, penerima bansos.  
+    **Model:** Change-point detection sederhana + analisis tren 3 bulan terakhir.
+    """)
+
+    # Cukup header/skema untuk cek kolom; agregat bulanan dibaca dari store
+    with span("load"):
+        kolom = dataset_columns("dtsen_with_scores.csv")
+
+    if "tanggal_update" not in kolom:
+        st.error("❌ Tidak ada kolom 'tanggal_update' di dataset. Pastikan file CSV punya tanggal update.")
+    else:
+        # --- Agregat bulanan tersimpan (dibangun sekali per versi dataset) ---
+        with span("monthly_store"):
+            ew_store = get_monthly_store("dtsen_with_scores.csv")
+            monthly = ew_store.monthly()
+            monthly_income = monthly[["pendapatan_mean"]].rename(columns={"pendapatan_mean": "pendapatan_per_bulan"})
+
+        # --- Tampilkan grafik tren ---
+        st.subheader("Tren Rata-rata Pendapatan Bulanan")
+        st.line_chart(monthly_income)
+
+        # --- Early Warning sederhana ---
+        if len(monthly_income) >= 3:
+            last = monthly_income["pendapatan_per_bulan"].iloc[-1]
+            prev = monthly_income["pendapatan_per_bulan"].iloc[-3]  # 3 bulan lalu
+
+            if last < 0.8 * prev:
+                st.error("⚠️ Pendapatan rata-rata turun >20% dalam 3 bulan terakhir → Potensi Krisis Ekonomi!")
+            else:
+                st.success("✅ Tidak ada indikasi krisis besar dalam 3 bulan terakhir.")
+        else:
+            st.info("ℹ️ Data belum cukup panjang untuk analisis tren (butuh minimal 3 bulan).")
+
+        # --- Deteksi perubahan (CUSUM) di atas agregat bulanan ---
+        st.subheader("Deteksi Perubahan (CUSUM)")
+        with span("cusum_kota"):
+            alarm_kota = detect(ew_store)
+        if alarm_kota.empty:
+            st.success("✅ CUSUM tingkat kota: tidak ada pergeseran signifikan pada pendapatan maupun penerima bansos.")
+        else:
+            st.warning("⚠️ CUSUM tingkat kota mendeteksi pergeseran pada bulan berikut:")
+            paged_table(alarm_kota.drop(columns="kelurahan"), "ew_kota", filters=())
+
+        with span("cusum_kelurahan"):
+            alarm_kel = detect(ew_store, by_kelurahan=True)
+        st.write(f"📍 Peringatan per kelurahan: {alarm_kel['kelurahan'].nunique()} kelurahan")
+        paged_table(alarm_kel, "ew_kel", filters=("kelurahan",))
+
+        # --- Distribusi penerima bansos (indikator tambahan) ---
+        st.subheader("Distribusi Penerima Bansos per Bulan")
+        bansos_trend = monthly[["penerima_bansos"]].rename(columns={"penerima_bansos": "jumlah_penerima"})
+        st.line_chart(bansos_trend)
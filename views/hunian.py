@@ -0,0 +1,61 @@
+"""Use case 3: clustering hunian kumuh."""
+import altair as alt
+import streamlit as st
+
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from dtsen.segmentation import SPECS
+from views.common import paged_table
+
+
+def render():
+    st.header("🏚️ Clustering Hunian Kumuh")
+    st.write("""
+    **Tujuan:** Memetakan kondisi rumah tangga (Layak Huni, Semi Kumuh, Kumuh) sebagai dasar program bedah rumah & infrastruktur.  
+    **Data DTSEN:** Jenis lantai, dinding, atap, fasilitas MCK, kepadatan rumah.  
+    **Model:** K-Means Clustering → label: Layak Huni (0), Semi Kumuh (1), Kumuh (2).
+    """)
+
+    with span("load"):
+        df = load_dataset("dtsen_with_scores.csv")
+        versi_skor = dataset_version("dtsen_with_scores.csv")
+
+    # st.write("Distribusi cluster rumah tangga")
+    # cluster_count = df["cluster"].value_counts()
+    # st.bar_chart(cluster_count)
+
+    # st.write("Contoh 20 data rumah")
+    # st.dataframe(df[["nik_kepala_keluarga","nama_kepala_keluarga","kelurahan","cluster"]].head(20))
+
+
+    # Mapping cluster → label: kode mengikuti urutan label model (centroid
+    # diurutkan berdasarkan luas lantai), jadi tidak perlu mapping tetap
+    labels = SPECS["hunian"]["labels"]
+    df["cluster_label"] = df["cluster"].map(dict(enumerate(labels)))
+
+    # Hitung jumlah per cluster
+    cluster_count = df["cluster_label"].value_counts().reset_index()
+    cluster_count.columns = ["Cluster", "Jumlah"]
+
+    # Warna sesuai kategori
+    color_scale = alt.Scale(
+        domain=labels,
+        range=["#2ecc71", "#f1c40f", "#e74c3c"]  # hijau, kuning, merah
+    )
+
+    # Buat bar chart
+    chart = alt.Chart(cluster_count).mark_bar().encode(
+        x=alt.X("Cluster:N", sort=labels),
+        y="Jumlah:Q",
+        color=alt.Color("Cluster:N", scale=color_scale)
+    ).properties(
+        title="Distribusi Cluster Hunian"
+    )
+
+    with span("chart"):
+        st.altair_chart(chart, use_container_width=True)
+
+    # Data rumah per halaman
+    st.write("Data rumah tangga")
+    paged_table(df, "hunian", columns=["nik_kepala_keluarga","nama_kepala_keluarga","kelurahan","cluster_label"],
+                version=versi_skor, labels=("cluster_label",))
@@ -0,0 +1,54 @@
+"""Use case 1: prediksi kemiskinan (risk_score LightGBM)."""
+import streamlit as st
+
+from dtsen.banding import band_scores
+from dtsen.charts import hist_png
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from views.common import paged_table
+
+
+def render():
+    st.header("🏠 Prediksi Kemiskinan")
+    st.write("""
+    **Tujuan:** Mengetahui keluarga dengan risiko kemiskinan tertinggi agar intervensi (BLT, bansos, subsidi pangan) lebih tepat sasaran.  
+    **Data DTSEN:** Pendapatan per bulan, pengeluaran, pendidikan, pekerjaan, kepemilikan rumah/aset.  
+    **Model:** Gradient Boosting (LightGBM) → menghasilkan *risk_score* (0–1).
+    """)
+
+    with span("load"):
+        df = load_dataset("dtsen_with_scores.csv")
+        versi_skor = dataset_version("dtsen_with_scores.csv")
+
+    # Tambahkan status kategori (Rendah < 0.3 ≤ Sedang < 0.6 ≤ Tinggi)
+    with span("banding"):
+        df["status_kemiskinan"] = band_scores(df["risk_score"])
+
+    # Tampilkan keluarga rentan, urut dari risiko tertinggi (query & paging di sisi server)
+    st.subheader("Daftar Keluarga dengan Risiko Kemiskinan Tertinggi")
+    k = st.number_input("Jumlah keluarga per halaman", min_value=5, max_value=100, value=20, step=5, key="k_kemiskinan")
+    paged_table(
+        df, "kemiskinan",
+        columns=[
+            "nik_kepala_keluarga",
+            "nama_kepala_keluarga",
+            "kelurahan",
+            "kecamatan",
+            "risk_score",
+            "status_kemiskinan"
+        ],
+        version=versi_skor, sort="risk_score", ascending=False,
+        labels=("status_kemiskinan",), ranges=("risk_score",), page_size=k,
+    )
+
+    # Distribusi skor
+    st.subheader("Distribusi Risk Score")
+    # Grafik di-cache per versi dataset (histogram & KDE dari hitungan bin)
+    with span("chart"):
+        st.image(hist_png(df["risk_score"], ("risk_score", versi_skor),
+                          title="Distribusi Skor Risiko Kemiskinan", xlabel="risk_score"), width="stretch")
+
+    # Distribusi kategori
+    st.subheader("Distribusi Status Risiko (Kategori)")
+    with span("bar_chart"):
+        st.bar_chart(df["status_kemiskinan"].value_counts())
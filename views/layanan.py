@@ -0,0 +1,109 @@
+"""Use case 7: prediksi permintaan layanan publik."""
+import numpy as np
+import streamlit as st
+
+from dtsen.charts import lines_png
+from dtsen.cube import get_cube
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from dtsen.projection import BANDS, DEFAULT_SCENARIO, engine_version, get_engine, scenario_grid
+from views.common import paged_table
+
+
+def render():
+    st.header("🏥📚 Prediksi Permintaan Layanan Publik")
+    st.write("""
+    **Tujuan:** Mengetahui kebutuhan Puskesmas & Sekolah berdasarkan proyeksi jumlah penduduk & proporsi anak sekolah.  
+    **Data DTSEN:** Jumlah penduduk, jumlah anak sekolah, jumlah keluarga.  
+    **Model:** Time Series Forecast (Prophet) + Rasio kebutuhan layanan.
+    """)
+
+    # --- Ambil data real dari DTSEN (total dari cube agregat) ---
+    with span("cube"):
+        cube = get_cube()
+
+        # Hitung proporsi anak sekolah dari data DTSEN nyata
+        proporsi_anak_sekolah = (
+            cube.total("jumlah_anak_sekolah") /
+            cube.total("jumlah_anggota_keluarga")
+        )
+    st.write(f"Proporsi anak sekolah (real dari DTSEN): {proporsi_anak_sekolah:.2%}")
+
+    # --- Prediksi Agregat Kota ---
+    with span("proyeksi_kota"):
+        fcst_city = load_dataset("forecast_penduduk_kota_5y.csv")
+        fcst_city = fcst_city.rename(columns={"yhat":"population"})
+
+        # Hitung kebutuhan berdasarkan proporsi nyata
+        fcst_city["anak_sekolah_pred"] = (fcst_city["population"] * proporsi_anak_sekolah).round(0)
+        fcst_city["puskesmas_needed"] = (fcst_city["population"] / 10000).round(0)
+        fcst_city["school_needed"] = np.ceil(fcst_city["anak_sekolah_pred"] / 2000)
+
+    st.subheader("Prediksi Agregat Kota")
+    paged_table(fcst_city, "layanan_kota", columns=["period","population","anak_sekolah_pred","puskesmas_needed","school_needed"],
+                filters=(), sort="period")
+
+    versi_fcst = (dataset_version("forecast_penduduk_kota_5y.csv"), dataset_version("forecast_penduduk_prophet_5y.csv"), proporsi_anak_sekolah)
+    with span("chart_kota"):
+        st.image(lines_png(fcst_city, "period", {"Puskesmas": "puskesmas_needed", "Sekolah": "school_needed"},
+                           ("layanan_kota", versi_fcst), title="Prediksi Kebutuhan Layanan Publik (Kota)"), width="stretch")
+
+    # --- Prediksi Per Kelurahan ---
+    with span("proyeksi_kelurahan"):
+        fcst_kel = load_dataset("forecast_penduduk_prophet_5y.csv")
+        fcst_kel = fcst_kel.rename(columns={"ds":"period","yhat":"population"})
+
+        # Proporsi anak sekolah per kelurahan dari DTSEN (bukan proporsi kota)
+        engine = get_engine()
+        proporsi_kel = dict(zip(engine.kelurahan, engine.child_share))
+        fcst_kel["anak_sekolah_pred"] = (fcst_kel["population"] * fcst_kel["kelurahan"].astype(str).map(proporsi_kel)).round(0)
+        fcst_kel["puskesmas_needed"] = np.ceil(fcst_kel["population"] / 10000)
+        fcst_kel["school_needed"] = np.ceil(fcst_kel["anak_sekolah_pred"] / 1000)  # lebih kecil kapasitasnya untuk skala kelurahan
+
+    st.subheader("Prediksi Per Kelurahan")
+    kel = st.selectbox("Pilih Kelurahan", sorted(fcst_kel["kelurahan"].unique().tolist()))
+
+    kel_data = fcst_kel[fcst_kel["kelurahan"]==kel]
+
+    paged_table(fcst_kel, "layanan_kel", columns=["period","population","anak_sekolah_pred","puskesmas_needed","school_needed"],
+                version=engine_version(),
+                filters=(), where={"kelurahan": kel}, sort="period")
+
+    with span("chart_kelurahan"):
+        st.image(lines_png(kel_data, "period", {"Puskesmas": "puskesmas_needed", "Sekolah": "school_needed"},
+                           ("layanan_kel", versi_fcst, kel), title=f"Prediksi Layanan Publik Kelurahan {kel}"), width="stretch")
+
+    # --- Simulasi skenario (grid skenario × kelurahan × bulan sekaligus) ---
+    st.subheader("Simulasi Skenario Kebutuhan Layanan")
+    st.caption("Kekurangan = kebutuhan − fasilitas saat ini (kebutuhan bulan historis terakhir dengan rasio "
+               f"{DEFAULT_SCENARIO['penduduk_per_puskesmas']:,} penduduk/Puskesmas & "
+               f"{DEFAULT_SCENARIO['anak_per_sekolah']:,} anak/sekolah).")
+    c1, c2, c3, c4 = st.columns(4)
+    bands = c1.multiselect("Pita forecast", list(BANDS), default=list(BANDS), key="sk_band")
+    cap_pkm = c2.multiselect("Penduduk per Puskesmas", [100, 200, 500, 1000, 5000, 10000],
+                             default=[200, 500, 10000], key="sk_pkm")
+    cap_sek = c3.multiselect("Anak per sekolah", [50, 100, 150, 250, 500, 1000],
+                             default=[100, 250, 1000], key="sk_sek")
+    skala = c4.multiselect("Skala proporsi anak", [0.8, 0.9, 1.0, 1.1, 1.2], default=[1.0, 1.1], key="sk_skala")
+    layanan = st.radio("Layanan", ["sekolah", "puskesmas"], horizontal=True, key="sk_layanan")
+
+    if not (bands and cap_pkm and cap_sek and skala):
+        st.info("Pilih minimal satu nilai untuk setiap parameter skenario.")
+        return
+    with span("skenario"):
+        grid = scenario_grid(band=[BANDS[b] for b in bands], penduduk_per_puskesmas=sorted(cap_pkm),
+                             anak_per_sekolah=sorted(cap_sek), skala_proporsi_anak=sorted(skala))
+        hasil = engine.run(grid)
+        ringkasan = hasil.scenario_summary()
+        peringkat = hasil.shortfall_table(layanan, only_short=True)
+    n_kel, n_bulan = engine.shape
+    st.write(f"{len(grid)} skenario × {n_kel} kelurahan × {n_bulan} bulan")
+
+    versi_sk = (engine_version(), tuple(map(tuple, grid.to_numpy())))
+    st.write("📊 Total kekurangan per skenario")
+    paged_table(ringkasan.reset_index(), "skenario_ringkasan", version=versi_sk, filters=(),
+                sort=f"kekurangan_{layanan}", ascending=False)
+
+    st.write(f"📍 Peringkat kekurangan {layanan} per kelurahan")
+    paged_table(peringkat, f"skenario_{layanan}", version=versi_sk, sort="peringkat",
+                ranges=("kekurangan_puncak",))
@@ -0,0 +1,108 @@
+"""Use case 8: monitoring dampak program kota (antar tahun snapshot)."""
+import pandas as pd
+import streamlit as st
+
+from dtsen.banding import CHANGE_LABELS, band_change
+from dtsen.charts import hist_png
+from dtsen.impact import SCORE_COLS, get_impact_store, household_names, impact_version, load_registry
+from dtsen.instrument import span
+from views.common import paged_table
+
+
+def render():
+    st.header("📊 Monitoring Dampak Program Kota")
+    st.write("""
+    **Tujuan:** Mengevaluasi dampak program pemerintah (bedah rumah, UMKM, bansos) terhadap skor kemiskinan & stunting.  
+    **Data DTSEN:** Snapshot skor keluarga per tahun (2025, 2026, ...) sebelum & sesudah program.  
+    **Model:** Perbandingan skor risiko (before vs after) + analisis perubahan skor.
+    """)
+
+    # Snapshot skor per tahun disimpan sebagai delta per NIK; semua query di
+    # bawah hanya menyentuh rumah tangga yang skornya berubah (tanpa merge)
+    with span("impact_store"):
+        store = get_impact_store()
+    versi = impact_version(load_registry())
+    if len(store.years) < 2:
+        st.info("ℹ️ Butuh minimal dua snapshot tahunan untuk analisis dampak.")
+        return
+
+    c1, c2 = st.columns(2)
+    tahun_awal = c1.selectbox("Tahun awal", store.years[:-1], index=0, key="mon_awal")
+    tahun_akhir = c2.selectbox("Tahun akhir", [y for y in store.years if y > tahun_awal],
+                               index=len([y for y in store.years if y > tahun_awal]) - 1, key="mon_akhir")
+
+    # --- Ringkasan Dampak ---
+    st.subheader(f"Rata-rata Dampak Program ({tahun_awal} → {tahun_akhir})")
+    with span("distribusi"):
+        dist = {c: store.delta_distribution(c, tahun_awal, tahun_akhir) for c in SCORE_COLS}
+    summary = pd.DataFrame({
+        "Indikator": ["delta_risk", "delta_stunting"],
+        "Perubahan Rata-rata": [dist[c]["mean"] for c in SCORE_COLS],
+        **{label: [dist[c]["status"][label] for c in SCORE_COLS] for label in CHANGE_LABELS},
+    })
+    paged_table(summary, "monitoring_ringkasan", filters=())
+
+    # --- Histogram Perubahan Risk Score ---
+    st.subheader(f"Distribusi Perubahan Risk Score ({tahun_awal} vs {tahun_akhir})")
+    with span("chart"):
+        st.image(hist_png(store.delta_values("risk_score", tahun_awal, tahun_akhir),
+                          ("delta_risk", versi, tahun_awal, tahun_akhir), xlabel="delta_risk"), width="stretch")
+
+    st.subheader("Keluarga dengan Perbaikan Terbesar")
+
+    # Hanya rumah tangga yang skornya berubah; perbaikan terbesar = delta paling negatif → urut naik
+    with span("changes"):
+        perubahan = store.changes("risk_score", tahun_awal, tahun_akhir).rename(columns={"delta": "delta_risk"})
+    sebelum, sesudah = f"risk_score_{tahun_awal}", f"risk_score_{tahun_akhir}"
+
+    # Ambil data (hanya satu halaman)
+    top_improve, _ = paged_table(perubahan, "monitoring", version=(versi, tahun_awal, tahun_akhir),
+                                 sort="delta_risk", ascending=True, ranges=("delta_risk",), render=False)
+    df_tampil = top_improve.copy()
+
+    # Nama kepala keluarga hanya untuk baris di halaman ini (lookup NIK terurut)
+    df_tampil.insert(1, "nama_kepala_keluarga", household_names(df_tampil["nik_kepala_keluarga"].to_numpy()))
+
+    # Tambahkan kolom status
+    with span("band_change"):
+        df_tampil["Status Perubahan"] = band_change(df_tampil["delta_risk"])
+
+    # Ubah nama kolom supaya mudah dipahami
+    df_tampil = df_tampil.rename(columns={
+        "nik_kepala_keluarga": "NIK Kepala Keluarga",
+        "nama_kepala_keluarga": "Nama Kepala Keluarga",
+        "kelurahan": "Kelurahan",
+        sebelum: f"Skor Kemiskinan ({tahun_awal})",
+        sesudah: f"Skor Kemiskinan ({tahun_akhir})",
+        "delta_risk": "Perubahan Skor"
+    })
+
+    with span("serialize"):
+        st.dataframe(df_tampil)
+
+
+    # --- Ringkasan per Kelurahan ---
+    st.subheader("Dampak Program per Kelurahan")
+
+    # rata-rata perubahan & jumlah membaik/tetap/memburuk per kelurahan (dari delta)
+    with span("kelurahan"):
+        risk_kel = store.kelurahan_summary("risk_score", tahun_awal, tahun_akhir)
+        stunting_kel = store.kelurahan_summary("stunting_risk_score", tahun_awal, tahun_akhir)
+        kel_summary = pd.DataFrame({
+            "delta_risk": risk_kel["delta_mean"], "delta_stunting": stunting_kel["delta_mean"],
+        }).reset_index().rename(columns={"kelurahan": "Kelurahan"})
+        kel_status_pivot = risk_kel[list(CHANGE_LABELS)].reset_index().rename(columns={"kelurahan": "Kelurahan"})
+
+    # tampilkan
+    st.write("📊 Rata-rata Perubahan Skor")
+    paged_table(kel_summary, "monitoring_kel", filters=("Kelurahan",), sort="delta_risk")
+
+    st.write("📊 Distribusi Status Perubahan per Kelurahan")
+    paged_table(kel_status_pivot, "monitoring_status", filters=("Kelurahan",))
+
+    # --- Deret tahunan ---
+    if len(store.years) > 2:
+        st.subheader("Tren Rata-rata Skor per Tahun")
+        tren = store.yearly_summary("risk_score").set_index("tahun")[["risk_score_mean"]]
+        tren["stunting_risk_score_mean"] = store.yearly_summary("stunting_risk_score")["stunting_risk_score_mean"].to_numpy()
+        st.line_chart(tren)
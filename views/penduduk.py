@@ -0,0 +1,73 @@
+"""Use case 4: forecast migrasi & pertumbuhan penduduk kota."""
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from dtsen.instrument import span
+from dtsen.loader import load_dataset
+
+
+def render():
+    st.header("📈 Forecast Migrasi & Pertumbuhan Penduduk Kota")
+    st.write("""
+    **Tujuan:** Proyeksi jumlah penduduk 5 tahun ke depan untuk perencanaan sekolah, perumahan, dan transportasi.  
+    **Data DTSEN:** Data migrasi penduduk, usia produktif, tren kelahiran.  
+    **Model:** Time Series Forecasting dengan Prophet.
+    """)
+
+    # Load data kota
+    with span("load_kota"):
+        hist_city = load_dataset("hist_penduduk_kota.csv")
+        fcst_city = load_dataset("forecast_penduduk_kota_5y.csv")
+
+    # Label tipe data
+    hist_city["type"] = "Historical"
+    fcst_city["type"] = "Forecast"
+    fcst_city.rename(columns={"yhat":"population"}, inplace=True)
+
+    # Gabungkan historis + forecast
+    plot_df = pd.concat([hist_city, fcst_city], ignore_index=True)
+
+    color_scale = alt.Scale(
+        domain=["Historical", "Forecast"],
+        range=["#2E86C1", "#E74C3C"]  # biru, merah
+    )
+
+    # Chart agregat kota
+    chart = alt.Chart(plot_df).mark_line().encode(
+        x="period:T",
+        y="population:Q",
+        color=alt.Color("type:N", scale=color_scale, title="Jenis Data")
+    ).properties(
+        title="Penduduk Kota: Historis & 5 Tahun Forecast"
+    )
+    with span("chart_kota"):
+        st.altair_chart(chart, use_container_width=True)
+
+    # chart = alt.Chart(plot_df).mark_line().encode(
+    #     x="period:T", y="population:Q", color="type:N"
+    # ).properties(
+    #     title="Penduduk Kota: Historis & 5 Tahun Forecast"
+    # )
+    # st.altair_chart(chart, use_container_width=True)
+
+    # Load data per kelurahan
+    with span("load_kelurahan"):
+        ts = load_dataset("ts_penduduk_kelurahan_2019_2025.csv")
+        fcst_all = load_dataset("forecast_penduduk_prophet_5y.csv")
+
+    # Forecast per kelurahan
+    st.subheader("Per Kelurahan")
+    kel = st.selectbox("Pilih Kelurahan", sorted(ts["kelurahan"].unique().tolist()))
+
+    hist_k = ts[ts["kelurahan"]==kel][["date","population"]].rename(columns={"date":"period"})
+    fcst_k = fcst_all[fcst_all["kelurahan"]==kel][["ds","yhat"]].rename(columns={"ds":"period","yhat":"population"})
+
+    hist_k["type"] = "Historical"; fcst_k["type"] = "Forecast"
+    plot_k = pd.concat([hist_k, fcst_k], ignore_index=True)
+
+    chart_k = alt.Chart(plot_k).mark_line().encode(
+        x="period:T", y="population:Q", color=alt.Color("type:N", scale=color_scale, title="Jenis Data")
+    ).properties(title=f"Penduduk {kel}: Historis & Forecast")
+    with span("chart_kelurahan"):
+        st.altair_chart(chart_k, use_container_width=True)
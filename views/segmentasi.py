@@ -0,0 +1,57 @@
+"""Use case 5: segmentasi sosial-ekonomi wilayah."""
+import streamlit as st
+
+from dtsen.charts import heatmap_png, stacked_bar_png
+from dtsen.cube import get_cube
+from dtsen.feature_store import feature_store_version
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from views.common import paged_table
+
+
+def render():
+    st.header("👨‍👩‍👧‍👦 Segmentasi Sosial-Ekonomi Wilayah")
+    st.write("""
+    **Tujuan:** Mengelompokkan keluarga menjadi segmen Mampu, Menengah, dan Rentan agar kebijakan lebih tepat.  
+    **Data DTSEN:** Pendapatan, pengeluaran, aset (lahan, kendaraan, tabungan), pendidikan, pekerjaan.  
+    **Model:** K-Means Clustering → label: Mampu, Menengah, Rentan.
+    """)
+
+    # Load dataset khusus segmen
+    with span("load"):
+        df_seg = load_dataset("dtsen_with_segments.csv", columns=[
+            "nik_kepala_keluarga","nama_kepala_keluarga","kelurahan","socio_segment_label"
+        ])
+
+    # Distribusi segmen per kelurahan (dari cube agregat, bukan groupby register)
+    with span("cube"):
+        cube = get_cube()
+        seg_per_kel = cube.summary(["kelurahan","socio_segment_label"])["count"].reset_index(name="jumlah")
+
+    st.subheader("Distribusi Segmen per Kelurahan (Tabel)")
+    paged_table(seg_per_kel, "segmen_kel", labels=("socio_segment_label",))
+
+    # 🔹 Heatmap
+    st.subheader("Heatmap Segmen per Kelurahan")
+    seg_pivot = cube.pivot("kelurahan", "socio_segment_label")
+
+    versi_cube = feature_store_version()
+    with span("heatmap"):
+        st.image(heatmap_png(seg_pivot, ("segmen", versi_cube)), width="stretch")
+
+    # 🔹 Stacked Bar Chart
+    st.subheader("Distribusi Segmen per Kelurahan (Stacked Bar)")
+    seg_bar = seg_pivot[["Mampu","Menengah","Rentan"]]  # urutan warna tetap
+
+    with span("stacked_bar"):
+        st.image(stacked_bar_png(
+            seg_bar, ("segmen", versi_cube),
+            colors=["#2ecc71","#f1c40f","#e74c3c"],  # hijau, kuning, merah
+            title="Distribusi Segmen Sosial-Ekonomi per Kelurahan",
+            xlabel="Kelurahan", ylabel="Jumlah Keluarga",
+        ), width="stretch")
+
+    # 🔹 Contoh data keluarga
+    st.subheader("Data Keluarga per Segmen")
+    paged_table(df_seg, "segmen", columns=["nik_kepala_keluarga","nama_kepala_keluarga","kelurahan","socio_segment_label"],
+                version=dataset_version("dtsen_with_segments.csv"), labels=("socio_segment_label",))
@@ -0,0 +1,53 @@
+"""Use case 2: prediksi stunting (stunting_risk_score LightGBM)."""
+import streamlit as st
+
+from dtsen.banding import band_scores
+from dtsen.charts import hist_png
+from dtsen.instrument import span
+from dtsen.loader import dataset_version, load_dataset
+from views.common import paged_table
+
+
+def render():
+    st.header("🧒 Prediksi Stunting")
+    st.write("""
+    **Tujuan:** Mendeteksi anak/keluarga berisiko stunting untuk prioritas PMT, edukasi gizi, dan akses kesehatan.  
+    **Data DTSEN:** Jumlah anak balita, pendidikan ibu, akses sanitasi, akses puskesmas.  
+    **Model:** Gradient Boosting (LightGBM) → menghasilkan *stunting_risk_score* (0–1).
+    """)
+
+    with span("load"):
+        df = load_dataset("dtsen_with_scores.csv")
+        versi_skor = dataset_version("dtsen_with_scores.csv")
+
+    # Tambahkan status kategori stunting
+    with span("banding"):
+        df["status_stunting"] = band_scores(df["stunting_risk_score"])
+
+    # Tampilkan keluarga rentan stunting, urut dari risiko tertinggi
+    st.subheader("Daftar Keluarga dengan Risiko Stunting Tertinggi")
+    k = st.number_input("Jumlah keluarga per halaman", min_value=5, max_value=100, value=20, step=5, key="k_stunting")
+    paged_table(
+        df, "stunting",
+        columns=[
+            "nik_kepala_keluarga",
+            "nama_kepala_keluarga",
+            "kelurahan",
+            "kecamatan",
+            "stunting_risk_score",
+            "status_stunting"
+        ],
+        version=versi_skor, sort="stunting_risk_score", ascending=False,
+        labels=("status_stunting",), ranges=("stunting_risk_score",), page_size=k,
+    )
+
+    # Distribusi skor
+    st.subheader("Distribusi Risk Score Stunting")
+    with span("chart"):
+        st.image(hist_png(df["stunting_risk_score"], ("stunting_risk_score", versi_skor),
+                          title="Distribusi Skor Risiko Stunting", xlabel="stunting_risk_score"), width="stretch")
+
+    # Distribusi kategori
+    st.subheader("Distribusi Status Risiko Stunting (Kategori)")
+    with span("bar_chart"):
+        st.bar_chart(df["status_stunting"].value_counts())